@@ -6,42 +6,66 @@ A modern web application to analyze resumes against job descriptions using AI
 import streamlit as st
 from streamlit_extras.add_vertical_space import add_vertical_space
 import plotly.graph_objects as go
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from datetime import datetime
 import os
+import queue
 from dotenv import load_dotenv
 
 # Import utility modules
-from utils.pdf_extractor import extract_text_from_pdf, validate_pdf, get_file_info
+from utils.pdf_extractor import (
+    extract_text_from_pdf,
+    validate_pdf,
+    get_file_info,
+    get_cached_text,
+    iter_pdf_pages,
+    parse_pdf,
+)
 from utils.gemini_analyzer import (
+    STREAM_RESTART,
     analyze_resume_with_gemini,
     analyze_resume_with_groq,
     get_match_rating,
 )
 from utils.report_generator import create_analysis_report
+from utils.sandbox import SANDBOX_ENABLED, parse_pdf_isolated, validate_ats_isolated
 from utils.email_sender import (
     send_analysis_email,
     validate_email,
     get_smtp_config_instructions,
 )
 from utils.resume_analyzer import (
-    analyze_resume_length,
-    validate_contact_information,
-    count_bullet_points,
-    analyze_action_verbs,
-    generate_wordcloud,
-    check_quantification,
-    calculate_readability_score,
-    create_keyword_density_map,
     export_analysis_to_dict,
-    detect_resume_sections,
-    check_date_formats,
-    find_duplicate_content,
+    find_cross_resume_duplicates,
     validate_ats_format,
 )
+from utils.analysis_pipeline import RESUME_PIPELINE
 
 # Load environment variables
 load_dotenv()
 
+# Build the expensive analysis tabs (word cloud, keyword chart, export, ATS
+# check) only when they are opened; "false" renders every tab on each run
+LAZY_TABS = os.getenv("LAZY_TABS", "true").lower() in ("1", "true", "yes")
+
+# Resumes extracted and analyzed at once per run
+ANALYSIS_WORKERS = int(os.getenv("ANALYSIS_WORKERS", "4"))
+
+# Stream AI responses and show each result field as it arrives
+STREAM_AI_RESPONSES = os.getenv("STREAM_AI_RESPONSES", "true").lower() in (
+    "1",
+    "true",
+    "yes",
+)
+# How often streamed fields are drawn while analyses run
+STREAM_REFRESH_SECONDS = 0.2
+
+# ATS validation mode: "full", "fast" (sampled pages under a time budget) or
+# "auto", which uses fast mode when several resumes are uploaded at once or a
+# PDF has more than ATS_FAST_PAGE_THRESHOLD pages
+ATS_MODE = os.getenv("ATS_MODE", "auto").lower()
+ATS_FAST_PAGE_THRESHOLD = int(os.getenv("ATS_FAST_PAGE_THRESHOLD", "4"))
+
 # Page configuration
 st.set_page_config(
     page_title="Resume Keyword Matcher",
@@ -917,8 +941,44 @@ def create_gauge_chart(score: float) -> go.Figure:
     return fig
 
 
-def display_results(analysis_result: dict, resume_filename: str, key_suffix: str = ""):
-    """Display analysis results in a beautiful format"""
+def display_local_preview(local_result: dict):
+    """Show the instant local keyword match while the AI analysis runs"""
+    st.markdown("### ⚡ Quick Keyword Match (local)")
+    col1, col2 = st.columns([1, 3])
+    with col1:
+        st.metric("Local Match Score", f"{local_result['match_score']}%")
+    with col2:
+        st.caption(local_result["match_reasoning"])
+        found = local_result["found_keywords"]["technical_skills"]
+        missing = local_result["missing_keywords"]["critical_technical_skills"]
+        keywords_html = "".join(
+            [f'<span class="keyword-pill">{keyword}</span>' for keyword in found]
+            + [
+                f'<span class="keyword-pill missing-keyword-pill">{keyword}</span>'
+                for keyword in missing
+            ]
+        )
+        if keywords_html:
+            st.markdown(keywords_html, unsafe_allow_html=True)
+
+
+def display_results(
+    analysis_result: dict,
+    resume_filename: str,
+    key_suffix: str = "",
+    partial: bool = False,
+):
+    """
+    Display analysis results in a beautiful format.
+
+    With partial=True, analysis_result holds the fields of a streaming
+    analysis received so far; sections are shown in order up to the first
+    one still missing, and the PDF report is left out. Call it again in the
+    same placeholder as more fields arrive, with a new key_suffix each time.
+    """
+    # Streamed fields are raw, so the score may not be usable yet
+    if partial and not isinstance(analysis_result.get("match_score"), (int, float)):
+        return
 
     # Match Score Section
     st.markdown("---")
@@ -946,7 +1006,12 @@ def display_results(analysis_result: dict, resume_filename: str, key_suffix: str
 
     with col2:
         st.markdown("### 💡 Match Reasoning")
-        st.info(analysis_result.get("match_reasoning", "No reasoning provided"))
+        st.info(
+            analysis_result.get(
+                "match_reasoning",
+                "⏳ Analyzing..." if partial else "No reasoning provided",
+            )
+        )
 
         # Strengths
         if "strengths" in analysis_result and analysis_result["strengths"]:
@@ -957,6 +1022,8 @@ def display_results(analysis_result: dict, resume_filename: str, key_suffix: str
     add_vertical_space(2)
 
     # Found Keywords Section
+    if partial and "found_keywords" not in analysis_result:
+        return
     st.markdown("### ✅ Keywords Found in Your Resume")
     found_keywords = analysis_result.get("found_keywords", {})
 
@@ -1013,6 +1080,8 @@ def display_results(analysis_result: dict, resume_filename: str, key_suffix: str
     add_vertical_space(2)
 
     # Missing Keywords Section
+    if partial and "missing_keywords" not in analysis_result:
+        return
     st.markdown("### ⚠️ Missing Keywords & Gaps")
     missing_keywords = analysis_result.get("missing_keywords", {})
 
@@ -1057,6 +1126,8 @@ def display_results(analysis_result: dict, resume_filename: str, key_suffix: str
     add_vertical_space(2)
 
     # Suggestions Section
+    if partial and "suggestions" not in analysis_result:
+        return
     st.markdown("### 🎯 Recommendations for Improvement")
     if "suggestions" in analysis_result and analysis_result["suggestions"]:
         for i, suggestion in enumerate(analysis_result["suggestions"], 1):
@@ -1072,6 +1143,8 @@ def display_results(analysis_result: dict, resume_filename: str, key_suffix: str
     add_vertical_space(2)
 
     # ATS Tips Section
+    if partial and "ats_optimization_tips" not in analysis_result:
+        return
     st.markdown("### 🤖 ATS Optimization Tips")
     if (
         "ats_optimization_tips" in analysis_result
@@ -1083,6 +1156,8 @@ def display_results(analysis_result: dict, resume_filename: str, key_suffix: str
     add_vertical_space(2)
 
     # Download Report
+    if partial:
+        return
     st.markdown("### 📥 Download Full Report")
     try:
         pdf_buffer = create_analysis_report(analysis_result, resume_filename)
@@ -1097,17 +1172,35 @@ def display_results(analysis_result: dict, resume_filename: str, key_suffix: str
         st.error(f"Error generating PDF report: {str(e)}")
 
 
+@st.fragment
 def display_additional_features(
     resume_text: str,
     analysis_result: dict = None,
-    pdf_path: str = None,
+    uploaded_file=None,
     key_suffix: str = "",
+    job_description: str = "",
+    batch_size: int = 1,
 ):
-    """Display additional resume analysis features"""
+    """
+    Display additional resume analysis features.
+
+    Runs as a fragment: switching tabs or clicking a button in here reruns
+    only this resume's tabs, not the whole analysis. With LAZY_TABS the word
+    cloud, keyword chart, export and ATS tabs are built when first opened.
+    batch_size is the number of resumes uploaded together, which picks the
+    ATS validation mode (see ATS_MODE).
+    """
     st.markdown("---")
     st.markdown("## 🔍 Additional Analysis")
     add_vertical_space(1)
 
+    # Every metric below is computed at most once per resume text and cached
+    # across tabs, exports and reruns
+    analysis = RESUME_PIPELINE.analyze(resume_text, job_description)
+    resume_doc = analysis["document"]
+
+    has_experience_section = bool(analysis["experience_document"].text)
+
     # Create tabs for different features
     (
         tab1,
@@ -1140,12 +1233,18 @@ def display_additional_features(
             "🔄 Duplicates",
             "🤖 ATS Check",
             "📧 Email Results",
-        ]
+        ],
+        # Rerun on tab switches so closed tabs can skip their content
+        **(
+            {"key": f"analysis_tabs{key_suffix}", "on_change": "rerun"}
+            if LAZY_TABS
+            else {}
+        ),
     )
 
     with tab1:
         st.markdown("### 📏 Resume Length Analysis")
-        length_analysis = analyze_resume_length(resume_text)
+        length_analysis = analysis["length"]
 
         col1, col2, col3 = st.columns(3)
         with col1:
@@ -1162,7 +1261,7 @@ def display_additional_features(
 
     with tab2:
         st.markdown("### 📧 Contact Information Validator")
-        contact_analysis = validate_contact_information(resume_text)
+        contact_analysis = analysis["contact"]
 
         # Score display
         score = contact_analysis["score"]
@@ -1194,7 +1293,7 @@ def display_additional_features(
 
     with tab3:
         st.markdown("### 📋 Bullet Point Analysis")
-        bullet_analysis = count_bullet_points(resume_text)
+        bullet_analysis = analysis["bullets"]
 
         st.metric("Total Bullet Points", bullet_analysis["total_count"])
 
@@ -1210,7 +1309,14 @@ def display_additional_features(
 
     with tab4:
         st.markdown("### 💪 Action Verb Analysis")
-        verb_analysis = analyze_action_verbs(resume_text)
+        verb_analysis = analysis["verbs"]
+        if has_experience_section:
+            experience_verbs = analysis["experience_verbs"]
+            st.caption(
+                f"Experience section alone: {experience_verbs['strong_verbs_count']} "
+                f"strong, {experience_verbs['weak_verbs_count']} weak, "
+                f"score {experience_verbs['score']}%"
+            )
 
         col1, col2, col3 = st.columns(3)
         with col1:
@@ -1245,18 +1351,25 @@ def display_additional_features(
                     )
 
     with tab5:
-        st.markdown("### ☁️ Resume Word Cloud")
-        st.info("Visual representation of the most frequent words in your resume")
+        if tab5.open is not False:
+            st.markdown("### ☁️ Resume Word Cloud")
+            st.info("Visual representation of the most frequent words in your resume")
 
-        try:
-            wordcloud_img = generate_wordcloud(resume_text)
-            st.image(wordcloud_img, width="stretch")
-        except Exception as e:
-            st.error(f"Error generating word cloud: {str(e)}")
+            try:
+                wordcloud_img = analysis["wordcloud"]
+                st.image(wordcloud_img, width="stretch")
+            except Exception as e:
+                st.error(f"Error generating word cloud: {str(e)}")
 
     with tab6:
         st.markdown("### 📊 Quantification Analysis")
-        quant_analysis = check_quantification(resume_text)
+        quant_analysis = analysis["quantification"]
+        if has_experience_section:
+            experience_quant = analysis["experience_quantification"]
+            st.caption(
+                f"Experience section alone: {experience_quant['metrics_count']} "
+                f"metrics, {experience_quant['quantified_percentage']}% quantified"
+            )
 
         col1, col2 = st.columns(2)
         with col1:
@@ -1276,7 +1389,7 @@ def display_additional_features(
 
     with tab7:
         st.markdown("### 📖 Readability Score")
-        readability = calculate_readability_score(resume_text)
+        readability = analysis["readability"]
 
         col1, col2, col3 = st.columns(3)
         with col1:
@@ -1297,7 +1410,7 @@ def display_additional_features(
 
     with tab8:
         st.markdown("### 🔥 Keyword Density Analysis")
-        keyword_data = create_keyword_density_map(resume_text)
+        keyword_data = analysis["keyword_density"]
 
         col1, col2 = st.columns(2)
         with col1:
@@ -1305,129 +1418,161 @@ def display_additional_features(
         with col2:
             st.metric("Unique Words", f"{keyword_data['unique_words']:,}")
 
-        st.markdown("**Top 20 Keywords:**")
+        if job_description:
+            try:
+                relevance = analysis["relevance"]
+            except Exception as e:
+                relevance = None
+                st.warning(f"⚠️ Could not compute keyword relevance: {str(e)}")
+
+            if relevance:
+                st.markdown("**Job Description Relevance (BM25):**")
+                col1, col2, col3 = st.columns(3)
+                with col1:
+                    st.metric("Relevance", f"{relevance['relevance_score']}%")
+                with col2:
+                    st.metric("BM25 Score", relevance["bm25_score"])
+                with col3:
+                    st.metric("JDs in Corpus", relevance["corpus_documents"])
+
+                col1, col2 = st.columns(2)
+                with col1:
+                    st.markdown("**✅ Top Matched Terms:**")
+                    for term, weight, count in relevance["matched_terms"][:10]:
+                        st.markdown(f"- {term} (weight {weight}, {count}×)")
+                with col2:
+                    st.markdown("**❌ Top Missing Terms:**")
+                    for term, weight in relevance["missing_terms"][:10]:
+                        st.markdown(f"- {term} (weight {weight})")
+
+                st.caption(
+                    "Terms are weighted by how specific they are across every job "
+                    "description analyzed so far; common words count for little."
+                )
 
-        # Create a simple bar chart
-        import plotly.graph_objects as go
+        # The chart is only built while this tab is open
+        if tab8.open is not False:
+            st.markdown("**Top 20 Keywords:**")
 
-        keywords = [kw[0] for kw in keyword_data["top_keywords"]]
-        counts = [kw[1] for kw in keyword_data["top_keywords"]]
+            # Create a simple bar chart
+            import plotly.graph_objects as go
 
-        fig = go.Figure(
-            data=[
-                go.Bar(
-                    x=counts, y=keywords, orientation="h", marker=dict(color="#0ea5e9")
-                )
-            ]
-        )
+            keywords = [kw[0] for kw in keyword_data["top_keywords"]]
+            counts = [kw[1] for kw in keyword_data["top_keywords"]]
 
-        fig.update_layout(
-            title="Keyword Frequency",
-            xaxis_title="Count",
-            yaxis_title="Keyword",
-            height=500,
-            yaxis={"categoryorder": "total ascending"},
-        )
+            fig = go.Figure(
+                data=[
+                    go.Bar(
+                        x=counts,
+                        y=keywords,
+                        orientation="h",
+                        marker=dict(color="#0ea5e9"),
+                    )
+                ]
+            )
 
-        st.plotly_chart(fig, width="stretch")
+            fig.update_layout(
+                title="Keyword Frequency",
+                xaxis_title="Count",
+                yaxis_title="Keyword",
+                height=500,
+                yaxis={"categoryorder": "total ascending"},
+            )
+
+            st.plotly_chart(fig, width="stretch")
 
     with tab9:
-        st.markdown("### 💾 Export Analysis Data")
-        st.info("Export your resume analysis to CSV format for tracking over time")
+        if tab9.open is not False:
+            st.markdown("### 💾 Export Analysis Data")
+            st.info("Export your resume analysis to CSV format for tracking over time")
 
-        if analysis_result:
-            # Gather all additional analysis data
-            additional_data = {
-                "length": analyze_resume_length(resume_text),
-                "contact": validate_contact_information(resume_text),
-                "bullets": count_bullet_points(resume_text),
-                "verbs": analyze_action_verbs(resume_text),
-                "quantification": check_quantification(resume_text),
-            }
+            if analysis_result:
+                # Gather all additional analysis data
+                additional_data = analysis["export_data"]
 
-            # Prepare export data
-            export_data = export_analysis_to_dict(analysis_result, additional_data)
+                # Prepare export data
+                export_data = export_analysis_to_dict(analysis_result, additional_data)
 
-            # Convert to CSV format
-            import pandas as pd
-            import io
+                # Convert to CSV format
+                import pandas as pd
+                import io
 
-            df = pd.DataFrame([export_data])
+                df = pd.DataFrame([export_data])
 
-            # Create CSV buffer
-            csv_buffer = io.StringIO()
-            df.to_csv(csv_buffer, index=False)
-            csv_data = csv_buffer.getvalue()
+                # Create CSV buffer
+                csv_buffer = io.StringIO()
+                df.to_csv(csv_buffer, index=False)
+                csv_data = csv_buffer.getvalue()
 
-            # Display preview with HTML table for better styling
-            st.markdown("**Preview:**")
+                # Display preview with HTML table for better styling
+                st.markdown("**Preview:**")
             
-            # Create HTML table with explicit styling
-            html_table = df.to_html(index=False, escape=False, border=0)
-            styled_html = f"""
-            <div style="overflow-x: auto; background: white; padding: 1rem; border-radius: 8px; border: 1px solid #e5e7eb;">
-                <style>
-                    .preview-table {{
-                        width: 100%;
-                        border-collapse: collapse;
-                        background: #ffffff !important;
-                    }}
-                    .preview-table thead tr {{
-                        background: #f1f5f9 !important;
-                        border-bottom: 2px solid #cbd5e1;
-                    }}
-                    .preview-table th {{
-                        padding: 12px;
-                        text-align: left;
-                        font-weight: 600;
-                        color: #1e293b !important;
-                        background: #f1f5f9 !important;
-                        border-bottom: 2px solid #cbd5e1;
-                    }}
-                    .preview-table td {{
-                        padding: 12px;
-                        color: #1e293b !important;
-                        background: #ffffff !important;
-                        border-bottom: 1px solid #e5e7eb;
-                    }}
-                    .preview-table tbody tr:hover {{
-                        background: #f9fafb !important;
-                    }}
-                </style>
-                {html_table.replace('<table', '<table class="preview-table"')}
-            </div>
-            """
-            st.markdown(styled_html, unsafe_allow_html=True)
-
-            # Download button
-            st.download_button(
-                label="📥 Download CSV",
-                data=csv_data,
-                file_name=f"resume_analysis_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
-                mime="text/csv",
-                key=f"download_csv{key_suffix}",
-            )
+                # Create HTML table with explicit styling
+                html_table = df.to_html(index=False, escape=False, border=0)
+                styled_html = f"""
+                <div style="overflow-x: auto; background: white; padding: 1rem; border-radius: 8px; border: 1px solid #e5e7eb;">
+                    <style>
+                        .preview-table {{
+                            width: 100%;
+                            border-collapse: collapse;
+                            background: #ffffff !important;
+                        }}
+                        .preview-table thead tr {{
+                            background: #f1f5f9 !important;
+                            border-bottom: 2px solid #cbd5e1;
+                        }}
+                        .preview-table th {{
+                            padding: 12px;
+                            text-align: left;
+                            font-weight: 600;
+                            color: #1e293b !important;
+                            background: #f1f5f9 !important;
+                            border-bottom: 2px solid #cbd5e1;
+                        }}
+                        .preview-table td {{
+                            padding: 12px;
+                            color: #1e293b !important;
+                            background: #ffffff !important;
+                            border-bottom: 1px solid #e5e7eb;
+                        }}
+                        .preview-table tbody tr:hover {{
+                            background: #f9fafb !important;
+                        }}
+                    </style>
+                    {html_table.replace('<table', '<table class="preview-table"')}
+                </div>
+                """
+                st.markdown(styled_html, unsafe_allow_html=True)
+
+                # Download button
+                st.download_button(
+                    label="📥 Download CSV",
+                    data=csv_data,
+                    file_name=f"resume_analysis_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
+                    mime="text/csv",
+                    key=f"download_csv{key_suffix}",
+                )
 
-            # Excel export
-            excel_buffer = io.BytesIO()
-            df.to_excel(excel_buffer, index=False, engine="openpyxl")
-            excel_data = excel_buffer.getvalue()
-
-            st.download_button(
-                label="📥 Download Excel",
-                data=excel_data,
-                file_name=f"resume_analysis_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx",
-                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                key=f"download_excel{key_suffix}",
-            )
-        else:
-            st.warning(
-                "Analysis data not available. Please complete the resume analysis first."
-            )
+                # Excel export
+                excel_buffer = io.BytesIO()
+                df.to_excel(excel_buffer, index=False, engine="openpyxl")
+                excel_data = excel_buffer.getvalue()
+
+                st.download_button(
+                    label="📥 Download Excel",
+                    data=excel_data,
+                    file_name=f"resume_analysis_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx",
+                    mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                    key=f"download_excel{key_suffix}",
+                )
+            else:
+                st.warning(
+                    "Analysis data not available. Please complete the resume analysis first."
+                )
 
     with tab10:
         st.markdown("### 📑 Resume Section Detector")
-        section_analysis = detect_resume_sections(resume_text)
+        section_analysis = analysis["sections"]
 
         st.markdown("**Sections Found:**")
         col1, col2 = st.columns(2)
@@ -1469,9 +1614,31 @@ def display_additional_features(
         else:
             st.warning(f"⚠️ {section_analysis['recommendation']}")
 
+        if section_analysis["sections"]:
+            import pandas as pd
+
+            with st.expander("🗂️ Section Layout"):
+                st.dataframe(
+                    pd.DataFrame(
+                        [
+                            {
+                                "Section": span.name.title(),
+                                "Heading": span.heading,
+                                "Words": len(
+                                    resume_doc.text[span.body_start : span.end].split()
+                                ),
+                                "Confidence": f"{span.confidence:.0%}",
+                            }
+                            for span in section_analysis["sections"]
+                        ]
+                    ),
+                    hide_index=True,
+                    width="stretch",
+                )
+
     with tab11:
         st.markdown("### 📅 Date Format Checker")
-        date_analysis = check_date_formats(resume_text)
+        date_analysis = analysis["dates"]
 
         if date_analysis["formats_found"]:
             st.markdown("**Date Formats Detected:**")
@@ -1499,13 +1666,17 @@ def display_additional_features(
 
     with tab12:
         st.markdown("### 🔄 Duplicate Content Finder")
-        duplicate_analysis = find_duplicate_content(resume_text)
+        duplicate_analysis = analysis["duplicates"]
 
-        col1, col2 = st.columns(2)
+        col1, col2, col3 = st.columns(3)
         with col1:
             st.metric("Duplicate Sentences", duplicate_analysis["duplicate_sentences"])
         with col2:
             st.metric("Repeated Phrases", duplicate_analysis["repeated_phrases"])
+        with col3:
+            st.metric(
+                "Near-Duplicate Pairs", duplicate_analysis["near_duplicate_sentences"]
+            )
 
         if duplicate_analysis["status"] == "success":
             st.success(f"✅ {duplicate_analysis['recommendation']}")
@@ -1522,89 +1693,113 @@ def display_additional_features(
                 for phrase, count in duplicate_analysis["phrases"]:
                     st.info(f"**{count}x:** {phrase}")
 
+        if duplicate_analysis["near_duplicates"]:
+            with st.expander("🔍 Near-Duplicate Sentences Found"):
+                for first, second, similarity in duplicate_analysis["near_duplicates"]:
+                    st.info(
+                        f"**{similarity:.0%} similar:**\n\n- {first[:100]}\n- {second[:100]}"
+                    )
+
     with tab13:
-        st.markdown("### 🤖 ATS Format Validator")
-
-        if pdf_path:
-            ats_analysis = validate_ats_format(pdf_path)
-
-            # ATS Score
-            score = ats_analysis["ats_score"]
-            col1, col2, col3 = st.columns([2, 1, 1])
-            with col1:
-                if score >= 80:
-                    st.success(f"### ✅ ATS Score: {score}/100")
-                elif score >= 60:
-                    st.warning(f"### ⚠️ ATS Score: {score}/100")
-                else:
-                    st.error(f"### ❌ ATS Score: {score}/100")
-                st.markdown(f"**{ats_analysis['overall']}**")
-
-            with col2:
-                st.metric("Font Count", ats_analysis["font_count"])
-            with col3:
-                st.metric("Issues Found", len(ats_analysis["issues"]))
-
-            # Metadata
-            if ats_analysis["metadata"]:
-                with st.expander("📄 PDF Metadata"):
-                    for key, value in ats_analysis["metadata"].items():
-                        st.markdown(f"**{key.title()}:** {value}")
-
-            # Issues
-            if ats_analysis["issues"]:
-                st.markdown("**❌ Critical Issues:**")
-                for issue in ats_analysis["issues"]:
-                    st.error(f"• {issue}")
-            else:
-                st.success("✅ No critical issues found")
-
-            # Warnings
-            if ats_analysis["warnings"]:
-                with st.expander(f"⚠️ Warnings ({len(ats_analysis['warnings'])})"):
-                    for warning in ats_analysis["warnings"]:
-                        st.warning(f"• {warning}")
-
-            # Format checks
-            st.markdown("**Format Checklist:**")
-            col1, col2 = st.columns(2)
-            with col1:
-                if not ats_analysis["has_tables"]:
-                    st.success("✅ No tables")
-                else:
-                    st.error("❌ Contains tables")
+        if tab13.open is not False:
+            st.markdown("### 🤖 ATS Format Validator")
 
-                if not ats_analysis["has_headers_footers"]:
-                    st.success("✅ No headers/footers")
-                else:
-                    st.error("❌ Has headers/footers")
+            ats_analysis = (
+                get_ats_analysis(uploaded_file, batch_size) if uploaded_file else None
+            )
+            if ats_analysis:
+                # ATS Score
+                score = ats_analysis["ats_score"]
+                col1, col2, col3 = st.columns([2, 1, 1])
+                with col1:
+                    if score >= 80:
+                        st.success(f"### ✅ ATS Score: {score}/100")
+                    elif score >= 60:
+                        st.warning(f"### ⚠️ ATS Score: {score}/100")
+                    else:
+                        st.error(f"### ❌ ATS Score: {score}/100")
+                    st.markdown(f"**{ats_analysis['overall']}**")
+                    if ats_analysis.get("mode") == "fast":
+                        st.caption(
+                            "Fast check: sampled pages under a time budget "
+                            "(see Skipped Checks)"
+                        )
 
-            with col2:
-                if not ats_analysis["has_images"]:
-                    st.success("✅ No images")
+                with col2:
+                    st.metric("Font Count", ats_analysis["font_count"])
+                with col3:
+                    st.metric("Issues Found", len(ats_analysis["issues"]))
+
+                # Metadata
+                if ats_analysis["metadata"]:
+                    with st.expander("📄 PDF Metadata"):
+                        for key, value in ats_analysis["metadata"].items():
+                            st.markdown(f"**{key.title()}:** {value}")
+
+                # Issues
+                if ats_analysis["issues"]:
+                    st.markdown("**❌ Critical Issues:**")
+                    for issue in ats_analysis["issues"]:
+                        st.error(f"• {issue}")
                 else:
-                    st.warning("⚠️ Contains images")
+                    st.success("✅ No critical issues found")
+
+                # Warnings
+                if ats_analysis["warnings"]:
+                    with st.expander(f"⚠️ Warnings ({len(ats_analysis['warnings'])})"):
+                        for warning in ats_analysis["warnings"]:
+                            st.warning(f"• {warning}")
+
+                # Checks left out by sampling or the time budget
+                if ats_analysis.get("skipped_checks"):
+                    with st.expander(
+                        f"⏭️ Skipped Checks ({len(ats_analysis['skipped_checks'])})"
+                    ):
+                        for skipped in ats_analysis["skipped_checks"]:
+                            st.info(f"• {skipped}")
+
+                # Format checks
+                st.markdown("**Format Checklist:**")
+                col1, col2 = st.columns(2)
+                with col1:
+                    if not ats_analysis["has_tables"]:
+                        st.success("✅ No tables")
+                    else:
+                        st.error("❌ Contains tables")
 
-                if ats_analysis["font_count"] <= 2:
-                    st.success(f"✅ {ats_analysis['font_count']} font(s)")
-                else:
-                    st.warning(f"⚠️ {ats_analysis['font_count']} fonts (recommend ≤2)")
-
-            # Best practices
-            with st.expander("📚 ATS Best Practices"):
-                st.markdown("""
-                **For best ATS compatibility:**
-                - ✅ Use simple, single-column layout
-                - ✅ Stick to standard fonts (Arial, Calibri, Times New Roman)
-                - ✅ Avoid tables, text boxes, and headers/footers
-                - ✅ Save as text-based PDF (not scanned)
-                - ✅ Use standard section headings
-                - ✅ Keep formatting simple and clean
-                """)
-        else:
-            st.info(
-                "ATS validation requires PDF file. Upload and analyze to see results."
-            )
+                    if not ats_analysis["has_headers_footers"]:
+                        st.success("✅ No headers/footers")
+                    else:
+                        st.error("❌ Has headers/footers")
+
+                with col2:
+                    if not ats_analysis["has_images"]:
+                        st.success("✅ No images")
+                    else:
+                        st.warning("⚠️ Contains images")
+
+                    if ats_analysis["font_count"] <= 2:
+                        st.success(f"✅ {ats_analysis['font_count']} font(s)")
+                    else:
+                        st.warning(
+                            f"⚠️ {ats_analysis['font_count']} fonts (recommend ≤2)"
+                        )
+
+                # Best practices
+                with st.expander("📚 ATS Best Practices"):
+                    st.markdown("""
+                    **For best ATS compatibility:**
+                    - ✅ Use simple, single-column layout
+                    - ✅ Stick to standard fonts (Arial, Calibri, Times New Roman)
+                    - ✅ Avoid tables, text boxes, and headers/footers
+                    - ✅ Save as text-based PDF (not scanned)
+                    - ✅ Use standard section headings
+                    - ✅ Keep formatting simple and clean
+                    """)
+            else:
+                st.info(
+                    "ATS validation requires PDF file. Upload and analyze to see results."
+                )
 
     with tab14:
         st.markdown("### 📧 Email Analysis Results")
@@ -1798,6 +1993,212 @@ def sidebar_content():
         )
 
 
+def parse_upload(uploaded_file):
+    """
+    Parse an uploaded resume without touching the session.
+
+    Returns:
+        (ParsedPDF or None, reason the sandbox rejected the file or None)
+    """
+    if SANDBOX_ENABLED:
+        # Bounded time and memory per document
+        outcome = parse_pdf_isolated(uploaded_file)
+        failure = outcome["reason"] if outcome["status"] != "ok" else None
+        return outcome["result"], failure
+    return parse_pdf(uploaded_file), None
+
+
+def get_parsed_resume(uploaded_file):
+    """Parse an uploaded resume once per session and reuse it across reruns"""
+    parsed_resumes = st.session_state.setdefault("parsed_resumes", {})
+    if uploaded_file.file_id not in parsed_resumes:
+        parsed_pdf, failure = parse_upload(uploaded_file)
+        if failure:
+            st.warning(f"⚠️ {uploaded_file.name}: {failure}")
+        # Failures stay cached so a pathological file isn't retried on every rerun
+        parsed_resumes[uploaded_file.file_id] = parsed_pdf
+    return parsed_resumes[uploaded_file.file_id]
+
+
+def get_ats_mode(parsed_pdf, batch_size: int) -> str:
+    """ATS validation mode for a resume, following ATS_MODE"""
+    if ATS_MODE in ("full", "fast"):
+        return ATS_MODE
+    if batch_size > 1 or len(parsed_pdf.pages) > ATS_FAST_PAGE_THRESHOLD:
+        return "fast"
+    return "full"
+
+
+def get_ats_analysis(uploaded_file, batch_size: int = 1):
+    """ATS validation of an uploaded resume, run once per session and mode"""
+    ats_results = st.session_state.setdefault("ats_results", {})
+    parsed_pdf = get_parsed_resume(uploaded_file)
+    if not parsed_pdf:
+        return None
+    mode = get_ats_mode(parsed_pdf, batch_size)
+    key = (uploaded_file.file_id, mode)
+    if key not in ats_results:
+        validate = validate_ats_isolated if SANDBOX_ENABLED else validate_ats_format
+        ats_results[key] = validate(parsed_pdf, mode=mode)
+    return ats_results[key]
+
+
+def extract_resume_text(uploaded_file, parsed_resumes: dict) -> dict:
+    """
+    Resume text from the extraction cache, parsing the upload only on a miss.
+
+    Makes no Streamlit calls, so several uploads can be extracted at once in
+    worker threads; the caller stores new parses in the session.
+
+    Args:
+        uploaded_file: Uploaded PDF
+        parsed_resumes: The session's parses (file id -> ParsedPDF or None),
+            only read here
+
+    Returns:
+        Dictionary with text (None if there is none), parsed (the ParsedPDF
+        if the upload was parsed here) and failure (sandbox rejection reason)
+    """
+    outcome = {"text": get_cached_text(uploaded_file), "parsed": None, "failure": None}
+    if outcome["text"] is None:
+        if uploaded_file.file_id in parsed_resumes:
+            parsed_pdf = parsed_resumes[uploaded_file.file_id]
+        else:
+            parsed_pdf, outcome["failure"] = parse_upload(uploaded_file)
+            outcome["parsed"] = parsed_pdf
+        outcome["text"] = extract_text_from_pdf(parsed_pdf) if parsed_pdf else None
+    outcome["text"] = outcome["text"] or None
+    return outcome
+
+
+def run_ai_analysis(
+    resume_text: str,
+    job_description: str,
+    api_key: str,
+    provider: str,
+    on_field=None,
+):
+    """AI analysis with the chosen provider; None if it failed"""
+    if provider == "groq":
+        return analyze_resume_with_groq(
+            resume_text, job_description, api_key, on_field=on_field
+        )
+    return analyze_resume_with_gemini(
+        resume_text, job_description, api_key, on_field=on_field
+    )
+
+
+def finish_extraction(uploaded_file, future, parsed_resumes: dict):
+    """
+    Store a finished extraction's parse and report problems.
+
+    Returns:
+        The resume text, or None if there is none
+    """
+    try:
+        outcome = future.result()
+    except Exception as e:
+        print(f"Error extracting {uploaded_file.name}: {e}")
+        outcome = {"text": None, "parsed": None, "failure": None}
+
+    if outcome["parsed"] is not None or outcome["failure"]:
+        parsed_resumes[uploaded_file.file_id] = outcome["parsed"]
+    if outcome["failure"]:
+        st.warning(f"⚠️ {uploaded_file.name}: {outcome['failure']}")
+    if not outcome["text"]:
+        st.error(
+            f"❌ Could not extract text from {uploaded_file.name}. Please ensure it's a text-based PDF."
+        )
+    return outcome["text"]
+
+
+def finish_ai_analysis(uploaded_file, future):
+    """A finished AI analysis, or None (with a warning) if it failed"""
+    try:
+        analysis_result = future.result()
+    except Exception as e:
+        print(f"Error analyzing {uploaded_file.name}: {e}")
+        analysis_result = None
+    if not analysis_result:
+        st.warning(
+            f"⚠️ AI analysis failed for {uploaded_file.name} - showing the "
+            "local keyword match instead. Please check your API key."
+        )
+    return analysis_result
+
+
+def display_resume_analysis(
+    idx: int,
+    uploaded_file,
+    resume_text: str,
+    analysis_result: dict,
+    job_description: str,
+    batch_size: int = 1,
+) -> dict:
+    """
+    Show one resume's results and add them to the history.
+
+    Without an AI result (no API key, or the call failed) the local keyword
+    match is shown instead. batch_size is the number of resumes analyzed
+    together.
+
+    Returns:
+        The resume's entry for the comparison: index, filename, analysis, text
+    """
+    if not analysis_result:
+        analysis_result = RESUME_PIPELINE.analyze(resume_text, job_description)[
+            "local_score"
+        ]
+
+    # Save to history
+    st.session_state.analysis_history.append(
+        {
+            "filename": uploaded_file.name,
+            "score": analysis_result.get("match_score", 0),
+            "date": datetime.now().strftime("%Y-%m-%d %H:%M"),
+            "result": analysis_result,
+        }
+    )
+
+    # Display results
+    display_results(analysis_result, uploaded_file.name, key_suffix=f"_{idx}")
+
+    # Display additional features (including ATS validation)
+    display_additional_features(
+        resume_text,
+        analysis_result,
+        uploaded_file,
+        key_suffix=f"_{idx}",
+        job_description=job_description,
+        batch_size=batch_size,
+    )
+
+    return {
+        "index": idx,
+        "filename": uploaded_file.name,
+        "analysis": analysis_result,
+        "text": resume_text,
+    }
+
+
+def get_resume_preview(uploaded_file, max_chars: int = 500):
+    """Start of the resume text, parsing only as many pages as the preview shows"""
+    resume_text = get_cached_text(uploaded_file)
+    if resume_text is None:
+        try:
+            # The preview doesn't need pdfplumber's layout analysis
+            resume_text = "\n".join(
+                text
+                for _, text in iter_pdf_pages(
+                    uploaded_file, max_chars=max_chars, engine="pdfium"
+                )
+            )
+        except Exception as e:
+            print(f"Error extracting preview text: {e}")
+            return None
+    return resume_text.strip()[:max_chars] or None
+
+
 def main():
     """Main application function"""
 
@@ -1852,6 +2253,13 @@ def main():
                     "⚠️ Maximum 3 resumes allowed. Only first 3 will be analyzed."
                 )
 
+        # Drop parsed documents for files that are no longer uploaded
+        active_ids = {f.file_id for f in uploaded_files}
+        parsed_resumes = st.session_state.setdefault("parsed_resumes", {})
+        for file_id in list(parsed_resumes):
+            if file_id not in active_ids:
+                del parsed_resumes[file_id]
+
         # Display uploaded files
         if uploaded_files:
             for idx, uploaded_file in enumerate(uploaded_files, 1):
@@ -1868,11 +2276,11 @@ def main():
 
                     # Extract text preview
                     with st.expander(f"👁️ Preview Resume {idx}"):
-                        resume_text = extract_text_from_pdf(uploaded_file)
-                        if resume_text:
+                        resume_preview = get_resume_preview(uploaded_file)
+                        if resume_preview:
                             st.text_area(
                                 f"Resume {idx} Content",
-                                resume_text[:500] + "...",
+                                resume_preview + "...",
                                 height=200,
                                 disabled=True,
                                 key=f"preview_{idx}",
@@ -1913,95 +2321,146 @@ def main():
             )
             return
 
-        if "api_key" not in st.session_state or not st.session_state.api_key:
-            st.error("❌ Please enter your Gemini API key in the sidebar")
-            return
+        api_key = st.session_state.get("api_key")
+        if not api_key:
+            st.warning(
+                "⚠️ No API key entered - showing the local keyword match only. "
+                "Add your API key in the sidebar for the full AI analysis."
+            )
 
-        # Process each resume
-        all_results = []
+        ai_provider = st.session_state.get(
+            "ai_provider", os.getenv("AI_PROVIDER", "gemini")
+        )
+        parsed_resumes = st.session_state.setdefault("parsed_resumes", {})
 
+        # One section per resume in upload order, filled in as its extraction
+        # and AI analysis finish
+        slots = {}
         for idx, uploaded_file in enumerate(uploaded_files, 1):
             st.markdown("---")
             st.markdown(f"## 📊 Analysis Results - Resume {idx}: {uploaded_file.name}")
 
-            # Extract resume text
-            with st.spinner(f"📄 Extracting text from resume {idx}..."):
-                resume_text = extract_text_from_pdf(uploaded_file)
-
-            if not resume_text:
-                st.error(
-                    f"❌ Could not extract text from {uploaded_file.name}. Please ensure it's a text-based PDF."
-                )
+            # Skip files that fail pre-flight checks before parsing or calling the API
+            is_valid, error_msg = validate_pdf(uploaded_file)
+            if not is_valid:
+                st.error(f"❌ Skipping {uploaded_file.name}: {error_msg}")
                 continue
+            slots[idx] = st.container()
+
+        # Extraction and AI calls for every resume run at once; AI calls are
+        # further limited per provider (AI_MAX_CONCURRENCY)
+        all_results = []
+        with ThreadPoolExecutor(max_workers=ANALYSIS_WORKERS) as executor:
+            pending = {
+                executor.submit(
+                    extract_resume_text, uploaded_files[idx - 1], parsed_resumes
+                ): ("extract", idx)
+                for idx in slots
+            }
+            resume_texts = {}
+            previews = {}
+            # Fields of streaming analyses, sent by the worker threads
+            streamed = queue.Queue()
+            partial_results = {}
+            # Each partial render is a new chart in the same run, so needs a
+            # key of its own
+            partial_renders = 0
+
+            def stream_to(idx):
+                return lambda key, value: streamed.put((idx, key, value))
 
-            # Perform analysis
             with st.spinner(
-                f"🤖 Analyzing resume {idx} with AI... This may take 10-30 seconds..."
+                f"🤖 Analyzing {len(slots)} resume(s)... This may take 10-30 seconds..."
             ):
-                # Get AI provider from session state or env
-                ai_provider = st.session_state.get(
-                    "ai_provider", os.getenv("AI_PROVIDER", "gemini")
-                )
-
-                if ai_provider == "groq":
-                    analysis_result = analyze_resume_with_groq(
-                        resume_text, job_description, st.session_state.api_key
+                while pending:
+                    done, _ = wait(
+                        pending,
+                        timeout=STREAM_REFRESH_SECONDS if STREAM_AI_RESPONSES else None,
+                        return_when=FIRST_COMPLETED,
                     )
-                else:
-                    analysis_result = analyze_resume_with_gemini(
-                        resume_text, job_description, st.session_state.api_key
-                    )
-
-            if analysis_result:
-                # Store uploaded file path temporarily for ATS validation
-                import tempfile
-
-                with tempfile.NamedTemporaryFile(
-                    delete=False, suffix=".pdf"
-                ) as tmp_file:
-                    tmp_file.write(uploaded_file.getvalue())
-                    tmp_path = tmp_file.name
-
-                # Save to results
-                all_results.append(
-                    {
-                        "filename": uploaded_file.name,
-                        "analysis": analysis_result,
-                        "text": resume_text,
-                        "temp_path": tmp_path,
-                    }
-                )
-
-                # Save to history
-                st.session_state.analysis_history.append(
-                    {
-                        "filename": uploaded_file.name,
-                        "score": analysis_result.get("match_score", 0),
-                        "date": datetime.now().strftime("%Y-%m-%d %H:%M"),
-                        "result": analysis_result,
-                    }
-                )
-
-                # Display results
-                display_results(
-                    analysis_result, uploaded_file.name, key_suffix=f"_{idx}"
-                )
-
-                # Display additional features (including ATS validation)
-                display_additional_features(
-                    resume_text, analysis_result, tmp_path, key_suffix=f"_{idx}"
-                )
+                    for future in done:
+                        stage, idx = pending.pop(future)
+                        uploaded_file = uploaded_files[idx - 1]
+
+                        with slots[idx]:
+                            if stage == "extract":
+                                resume_text = finish_extraction(
+                                    uploaded_file, future, parsed_resumes
+                                )
+                                if not resume_text:
+                                    continue
+                                resume_texts[idx] = resume_text
+
+                                if api_key:
+                                    # Local keyword match, shown until the AI
+                                    # analysis arrives
+                                    previews[idx] = st.empty()
+                                    with previews[idx].container():
+                                        display_local_preview(
+                                            RESUME_PIPELINE.analyze(
+                                                resume_text, job_description
+                                            )["local_score"]
+                                        )
+                                    analysis = executor.submit(
+                                        run_ai_analysis,
+                                        resume_text,
+                                        job_description,
+                                        api_key,
+                                        ai_provider,
+                                        stream_to(idx) if STREAM_AI_RESPONSES else None,
+                                    )
+                                    pending[analysis] = ("analyze", idx)
+                                    continue
+                                analysis_result = None
+                            else:
+                                previews.pop(idx).empty()
+                                analysis_result = finish_ai_analysis(
+                                    uploaded_file, future
+                                )
+
+                            all_results.append(
+                                display_resume_analysis(
+                                    idx,
+                                    uploaded_file,
+                                    resume_texts[idx],
+                                    analysis_result,
+                                    job_description,
+                                    batch_size=len(slots),
+                                )
+                            )
 
-                # Clean up temp file
-                try:
-                    os.unlink(tmp_path)
-                except Exception:
-                    pass
-
-            else:
-                st.error(
-                    f"❌ Analysis failed for {uploaded_file.name}. Please check your API key."
-                )
+                    # Draw the fields streamed so far by analyses still running
+                    updated = set()
+                    restarted = set()
+                    while not streamed.empty():
+                        idx, key, value = streamed.get_nowait()
+                        if key == STREAM_RESTART:
+                            # A retry: drop the failed attempt's fields
+                            partial_results[idx] = {}
+                            restarted.add(idx)
+                            continue
+                        partial_results.setdefault(idx, {})[key] = value
+                        updated.add(idx)
+                    for idx in (updated | restarted) & previews.keys():
+                        if "match_score" in partial_results[idx]:
+                            partial_renders += 1
+                            with previews[idx].container():
+                                display_results(
+                                    partial_results[idx],
+                                    uploaded_files[idx - 1].name,
+                                    key_suffix=f"_{idx}_partial{partial_renders}",
+                                    partial=True,
+                                )
+                        elif idx in restarted:
+                            with previews[idx].container():
+                                display_local_preview(
+                                    RESUME_PIPELINE.analyze(
+                                        resume_texts[idx], job_description
+                                    )["local_score"]
+                                )
+
+        # Comparison in upload order, whatever order the analyses finished in
+        all_results.sort(key=lambda result: result["index"])
 
         # Comparison section for multiple resumes
         if len(all_results) > 1:
@@ -2039,6 +2498,25 @@ def main():
 
             st.dataframe(df_comparison, width="stretch")
 
+            # Template-generated applications share lightly reworded bullets;
+            # keyed by upload position too, as two uploads can share a name
+            shared_content = find_cross_resume_duplicates(
+                {
+                    f"Resume {result['index']}: {result['filename']}": result["text"]
+                    for result in all_results
+                }
+            )
+            if shared_content:
+                with st.expander(
+                    f"🔄 {len(shared_content)} near-identical sentences shared between resumes"
+                ):
+                    for item in shared_content[:10]:
+                        st.info(
+                            f"**{item['resume_a']}** / **{item['resume_b']}** "
+                            f"({item['similarity']:.0%} similar):\n\n"
+                            f"- {item['sentence_a'][:100]}\n- {item['sentence_b'][:100]}"
+                        )
+
             # Best resume highlight - Smart selection based on multiple criteria
             def get_resume_score(idx):
                 """Calculate composite score for resume selection"""
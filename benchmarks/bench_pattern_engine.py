@@ -0,0 +1,169 @@
+"""
+Benchmark the shared pattern engine against per-function regex scans
+
+Times the regex work of validate_contact_information, check_quantification,
+check_date_formats and count_bullet_points done the old way (uncompiled re calls per pattern, bullets matched line by line) and
+with one RESUME_PATTERNS scan. Match counts are compared so a speedup never
+hides a behaviour change.
+
+Usage:
+    python benchmarks/bench_pattern_engine.py --sizes 1 10 100 --repeat 5
+    python benchmarks/bench_pattern_engine.py --text resume.txt
+"""
+
+import argparse
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.resume_analyzer import (  # noqa: E402
+    DATE_PATTERNS,
+    QUANTIFICATION_PATTERNS,
+    RESUME_PATTERNS,
+)
+
+SAMPLE_RESUME = """Jane Doe
+jane.doe@example.com | (555) 123-4567 | linkedin.com/in/janedoe | github.com/janedoe
+
+Professional Summary
+Backend engineer with 8 years of experience building data platforms.
+
+Work Experience
+Senior Engineer, Example Corp, Jan 2020 - Present
+• Led migration of 12 services to Kubernetes, reduced latency by 35%
+• Increased throughput by 40 and saved $1.2M in annual infrastructure costs
+• Mentored a team of 6 engineers across 3 time zones
+- Built ingestion pipelines serving 50,000 users within 9 months
+* Automated reporting, saving 20 hours per week
+
+Engineer, Sample Inc, 06/2016 - 12/2019
+• Developed Python APIs and managed releases for 4 projects
+> Improved test coverage from 40% to 85% in 2018-03
+
+Education
+BSc Computer Science, State University, May, 2016
+
+Technical Skills
+Python, Go, SQL, Kafka, Docker, Kubernetes, AWS
+
+Projects
+Open-source contributor; portfolio at github.com/janedoe
+
+Certifications
+AWS Certified Solutions Architect, March 2021
+"""
+
+
+def legacy_scan(text: str) -> dict:
+    """The pre-engine approach: every pattern scans the full text separately"""
+    counts = {
+        "email": len(
+            re.findall(r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b", text)
+        ),
+        "phone": len(
+            re.findall(r"(\+?\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}", text)
+        ),
+    }
+    for pattern in [r"linkedin\.com/in/[\w-]+", r"LinkedIn:?\s*[\w-]+", r"linkedin"]:
+        if re.search(pattern, text, re.IGNORECASE):
+            break
+    for pattern in [r"github\.com/[\w-]+", r"GitHub:?\s*[\w-]+"]:
+        if re.search(pattern, text, re.IGNORECASE):
+            break
+
+    metrics = 0
+    for pattern in [
+        r"\d+%",
+        r"\$\d+[\d,]*[KMB]?",
+        r"\d+[\d,]*\+?\s*(?:users|customers|clients|projects|people|team|members)",
+        r"\d+[\d,]*\s*(?:hours|days|weeks|months|years)",
+        r"(?:increased|decreased|improved|reduced|grew|saved)\s+(?:by\s+)?\d+",
+    ]:
+        metrics += len(re.findall(pattern, text, re.IGNORECASE))
+    counts["metrics"] = metrics
+    counts["bullet_symbol"] = len(re.findall(r"[•●○■□▪▫–-]\s+", text))
+
+    bullet_patterns = [r"^\s*[•●○■□▪▫–-]\s+", r"^\s*\*\s+", r"^\s*>\s+"]
+    bullet_lines = 0
+    for line in text.split("\n"):
+        for pattern in bullet_patterns:
+            if re.match(pattern, line):
+                bullet_lines += 1
+                break
+    counts["bullet_line"] = bullet_lines
+
+    dates = 0
+    for pattern in [
+        r"\b\d{2}/\d{4}\b",
+        r"\b(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]* \d{4}\b",
+        r"\b\d{4}-\d{2}\b",
+        r"\b(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*, \d{4}\b",
+    ]:
+        dates += len(re.findall(pattern, text, re.IGNORECASE))
+    counts["dates"] = dates
+    return counts
+
+
+def engine_scan(text: str) -> dict:
+    """The same counts from one RESUME_PATTERNS scan"""
+    matches = RESUME_PATTERNS.scan(text)
+    return {
+        "email": len(matches["email"]),
+        "phone": len(matches["phone"]),
+        "metrics": sum(len(matches[name]) for name in QUANTIFICATION_PATTERNS),
+        "bullet_symbol": len(matches["bullet_symbol"]),
+        "bullet_line": len(matches["bullet_line"]),
+        "dates": sum(len(matches[f"date_{i}"]) for i in range(len(DATE_PATTERNS))),
+    }
+
+
+def best_time(func, text: str, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(text)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--text", help="Resume text file (default: built-in sample)")
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[1, 10, 100, 1000],
+        help="Number of copies of the resume to scan",
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per size")
+    args = parser.parse_args()
+
+    base_text = SAMPLE_RESUME
+    if args.text:
+        with open(args.text, encoding="utf-8") as f:
+            base_text = f.read()
+
+    print(
+        f"{'copies':>7} {'chars':>10} {'legacy ms':>10} {'engine ms':>10} {'speedup':>8}"
+    )
+    for size in args.sizes:
+        text = "\n".join([base_text] * size)
+        legacy, engine = legacy_scan(text), engine_scan(text)
+        for name, count in engine.items():
+            if legacy[name] != count:
+                sys.exit(f"Mismatch for {name}: legacy {legacy[name]}, engine {count}")
+
+        legacy_seconds = best_time(legacy_scan, text, args.repeat)
+        engine_seconds = best_time(engine_scan, text, args.repeat)
+        print(
+            f"{size:>7} {len(text):>10} {legacy_seconds * 1000:>10.2f} "
+            f"{engine_seconds * 1000:>10.2f} {legacy_seconds / engine_seconds:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Benchmark PDF text extraction engines
+
+Compares throughput and text fidelity of every engine in
+utils.pdf_engines.TEXT_ENGINES. Fidelity is measured against pdfplumber's
+output as word-sequence similarity (difflib ratio) and word recall.
+
+Usage:
+    python benchmarks/bench_pdf_engines.py resume1.pdf resume2.pdf --repeat 3
+"""
+
+import argparse
+import difflib
+import os
+import sys
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.pdf_engines import TEXT_ENGINES  # noqa: E402
+from utils.pdf_extractor import extract_text_from_pdf, iter_pdf_pages  # noqa: E402
+
+REFERENCE_ENGINE = "pdfplumber"
+
+
+def time_engine(pdf_bytes: bytes, engine: str, repeat: int) -> tuple[float, str]:
+    """Best-of-N wall time for a full, uncached, serial extraction"""
+    best = float("inf")
+    text = ""
+    for _ in range(repeat):
+        start = time.perf_counter()
+        text = (
+            extract_text_from_pdf(
+                pdf_bytes, use_cache=False, parallel=False, engine=engine
+            )
+            or ""
+        )
+        best = min(best, time.perf_counter() - start)
+    return best, text
+
+
+def fidelity(reference: str, text: str) -> tuple[float, float]:
+    """
+    Compare extracted text with the reference extraction.
+
+    Returns:
+        Tuple of (sequence similarity, word recall), both 0-1
+    """
+    ref_words = reference.split()
+    words = text.split()
+    if not ref_words:
+        return (1.0, 1.0) if not words else (0.0, 0.0)
+
+    similarity = difflib.SequenceMatcher(None, ref_words, words, autojunk=False).ratio()
+    found = Counter(words)
+    recalled = sum(
+        min(count, found[word]) for word, count in Counter(ref_words).items()
+    )
+    return similarity, recalled / len(ref_words)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("pdfs", nargs="+", help="PDF files to extract")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per engine")
+    args = parser.parse_args()
+
+    print(
+        f"{'file':<28} {'engine':<12} {'pages':>5} {'ms':>9} {'pages/s':>9} "
+        f"{'speedup':>8} {'similar':>8} {'recall':>7}"
+    )
+    for path in args.pdfs:
+        with open(path, "rb") as f:
+            pdf_bytes = f.read()
+        page_count = sum(1 for _ in iter_pdf_pages(pdf_bytes, engine="pdfium"))
+
+        results = {
+            engine: time_engine(pdf_bytes, engine, args.repeat)
+            for engine in TEXT_ENGINES
+        }
+        reference_seconds, reference_text = results[REFERENCE_ENGINE]
+
+        for engine, (seconds, text) in results.items():
+            similarity, recall = fidelity(reference_text, text)
+            print(
+                f"{os.path.basename(path)[:28]:<28} {engine:<12} {page_count:>5} "
+                f"{seconds * 1000:>9.1f} {page_count / seconds:>9.1f} "
+                f"{reference_seconds / seconds:>7.1f}x "
+                f"{similarity:>8.3f} {recall:>7.3f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""Tests for utils/analysis_pipeline.py"""
+
+from collections import Counter
+
+import pytest
+
+from utils.analysis_pipeline import (
+    JOB_DESCRIPTIONS_PER_ENTRY,
+    RESUME_PIPELINE,
+    AnalysisPipeline,
+)
+
+
+def _counting_pipeline(max_entries=32):
+    """Pipeline of word counts, recording how often each analyzer runs"""
+    calls = Counter()
+
+    def track(name, func):
+        def analyzer(*args):
+            calls[name] += 1
+            return func(*args)
+
+        return analyzer
+
+    pipeline = AnalysisPipeline(max_entries=max_entries)
+    pipeline.register("words", track("words", str.split), ("text",))
+    pipeline.register("count", track("count", len), ("words",))
+    pipeline.register(
+        "shared",
+        track("shared", lambda words, jd: sorted(set(words) & set(jd.split()))),
+        ("words", "job_description"),
+    )
+    return pipeline, calls
+
+
+def test_each_result_is_computed_once():
+    pipeline, calls = _counting_pipeline()
+
+    assert pipeline.analyze("python and kafka")["count"] == 3
+    assert pipeline.analyze("python and kafka")["count"] == 3
+    assert pipeline.analyze("python and kafka").get_many(["words", "count"]) == {
+        "words": ["python", "and", "kafka"],
+        "count": 3,
+    }
+
+    assert calls == {"words": 1, "count": 1}
+
+
+def test_results_are_computed_lazily():
+    pipeline, calls = _counting_pipeline()
+    analysis = pipeline.analyze("python")
+
+    assert not analysis.is_computed("count")
+    analysis["words"]
+
+    assert calls == {"words": 1}
+    assert analysis.is_computed("words")
+    assert not analysis.is_computed("count")
+
+
+def test_job_description_results_are_kept_per_job_description():
+    pipeline, calls = _counting_pipeline()
+    resume = "python kafka react"
+
+    assert pipeline.analyze(resume, "python go")["shared"] == ["python"]
+    assert pipeline.analyze(resume, "react")["shared"] == ["react"]
+    assert pipeline.analyze(resume, "python go")["shared"] == ["python"]
+    # Results that don't use the job description are shared between them
+    pipeline.analyze(resume, "react")["count"]
+    pipeline.analyze(resume)["count"]
+
+    assert calls == {"words": 1, "shared": 2, "count": 1}
+
+
+def test_least_recently_used_job_description_is_dropped():
+    pipeline, calls = _counting_pipeline()
+    resume = "python kafka"
+    job_descriptions = [f"jd {index}" for index in range(JOB_DESCRIPTIONS_PER_ENTRY)]
+    for job_description in job_descriptions:
+        pipeline.analyze(resume, job_description)["shared"]
+    # Use the first again, then push one more out
+    pipeline.analyze(resume, job_descriptions[0])["shared"]
+    pipeline.analyze(resume, "one more")["shared"]
+    assert calls["shared"] == JOB_DESCRIPTIONS_PER_ENTRY + 1
+
+    assert pipeline.analyze(resume, job_descriptions[0]).is_computed("shared")
+    assert not pipeline.analyze(resume, job_descriptions[1]).is_computed("shared")
+
+
+def test_least_recently_used_text_is_evicted():
+    pipeline, calls = _counting_pipeline(max_entries=2)
+    pipeline.analyze("first")["words"]
+    pipeline.analyze("second")["words"]
+    pipeline.analyze("first")["words"]
+
+    pipeline.analyze("third")["words"]
+
+    assert calls["words"] == 3
+    assert pipeline.analyze("first").is_computed("words")
+    assert pipeline.analyze("third").is_computed("words")
+    assert not pipeline.analyze("second").is_computed("words")
+
+
+def test_register_rejects_unknown_and_duplicate_names():
+    pipeline, _ = _counting_pipeline()
+
+    with pytest.raises(ValueError):
+        pipeline.register("total", len, ("missing",))
+    with pytest.raises(ValueError):
+        pipeline.register("count", len, ("words",))
+    with pytest.raises(KeyError):
+        pipeline.analyze("python")["missing"]
+
+
+def test_resume_pipeline_measures_verbs_on_whole_resume_and_experience():
+    text = "Summary\nLed a team of 5 engineers.\nExperience\nBuilt payment APIs."
+
+    analysis = RESUME_PIPELINE.analyze(text)
+
+    assert analysis["experience_document"].text == "Built payment APIs."
+    assert analysis["verbs"]["strong_verbs_used"] == ["led", "built"]
+    assert analysis["experience_verbs"]["strong_verbs_used"] == ["built"]
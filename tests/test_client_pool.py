@@ -0,0 +1,92 @@
+"""Tests for utils/client_pool.py"""
+
+import pytest
+
+from utils.client_pool import ClientPool
+
+
+class FakeClient:
+    def __init__(self, api_key):
+        self.api_key = api_key
+        self.healthy = True
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+def _pool(idle_seconds=600):
+    pool = ClientPool(idle_seconds=idle_seconds)
+    pool.register("fake", FakeClient, is_healthy=lambda client: client.healthy)
+    return pool
+
+
+def test_client_is_reused_per_provider_and_key():
+    pool = _pool()
+
+    with pool.lease("fake", "key") as first:
+        pass
+    with pool.lease("fake", "key") as again, pool.lease("fake", "other") as other:
+        pass
+
+    assert again is first
+    assert other is not first
+    assert pool.stats() == {"fake": 2}
+
+
+def test_unhealthy_idle_client_is_replaced_and_closed():
+    pool = _pool()
+    with pool.lease("fake", "key") as first:
+        pass
+    first.healthy = False
+
+    with pool.lease("fake", "key") as second:
+        assert second is not first
+        assert first.closed
+
+
+def test_retired_client_is_closed_after_its_last_lease():
+    pool = _pool()
+
+    with pool.lease("fake", "key") as first:
+        with pool.lease("fake", "key") as shared:
+            assert shared is first
+            first.healthy = False
+            # Replaced for new leases, but two leases still use it
+            with pool.lease("fake", "key") as replacement:
+                assert replacement is not first
+            assert not first.closed
+        assert not first.closed
+    assert first.closed
+    assert not replacement.closed
+
+    with pool.lease("fake", "key") as current:
+        assert current is replacement
+
+
+def test_idle_clients_are_closed_on_the_next_lease():
+    pool = _pool(idle_seconds=0)
+    with pool.lease("fake", "old") as old:
+        pass
+
+    with pool.lease("fake", "new"):
+        assert old.closed
+    assert pool.stats() == {"fake": 1}
+
+
+def test_close_spares_leased_clients():
+    pool = _pool()
+    with pool.lease("fake", "idle") as idle:
+        pass
+
+    with pool.lease("fake", "busy") as busy:
+        pool.close()
+        assert idle.closed
+        assert not busy.closed
+    assert pool.stats() == {"fake": 1}
+
+
+def test_unknown_provider_is_rejected():
+    with pytest.raises(KeyError):
+        with _pool().lease("missing", "key"):
+            pass
@@ -0,0 +1,122 @@
+"""Tests for utils/disk_cache.py"""
+
+import pytest
+
+from utils import disk_cache
+from utils.disk_cache import ACCESS_REFRESH_SECONDS, DiskCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(disk_cache.time, "time", fake)
+    return fake
+
+
+def _cache(tmp_path, **kwargs):
+    return DiskCache(str(tmp_path / "cache.sqlite3"), **kwargs)
+
+
+def test_least_recently_used_entry_is_evicted(tmp_path, clock):
+    cache = _cache(tmp_path, max_bytes=30)
+    cache.set("a", b"x" * 10)
+    clock.now += 1
+    cache.set("b", b"x" * 10)
+    clock.now += 1
+    cache.set("c", b"x" * 10)
+
+    # Reading "a" long enough after it was stored records the access
+    clock.now += ACCESS_REFRESH_SECONDS + 1
+    assert cache.get("a") == b"x" * 10
+    cache.set("d", b"x" * 10)
+
+    assert cache.get("a") is not None
+    assert cache.get("b") is None
+    assert cache.get("c") is not None
+    assert cache.get("d") is not None
+
+
+def test_recent_reads_do_not_write(tmp_path, clock, monkeypatch):
+    cache = _cache(tmp_path)
+    cache.set("a", b"1")
+    clock.now += ACCESS_REFRESH_SECONDS / 2
+
+    statements = []
+    connect = disk_cache.sqlite3.connect
+
+    def traced_connect(*args, **kwargs):
+        conn = connect(*args, **kwargs)
+        conn.set_trace_callback(statements.append)
+        return conn
+
+    monkeypatch.setattr(disk_cache.sqlite3, "connect", traced_connect)
+    assert cache.get("a") == b"1"
+    assert cache.get("missing") is None
+
+    assert statements
+    assert all(statement.startswith("SELECT") for statement in statements)
+
+
+def test_entries_expire_after_ttl(tmp_path, clock):
+    cache = _cache(tmp_path, ttl=60)
+    cache.set("default", b"1")
+    cache.set("short", b"2", ttl=10)
+    cache.set("long", b"3", ttl=600)
+
+    clock.now += 30
+    assert cache.get("short") is None
+    assert cache.get("default") == b"1"
+
+    clock.now += 60
+    assert cache.get("default") is None
+    assert cache.get("long") == b"3"
+
+    # Expired entries are deleted by the next write
+    cache.set("other", b"4")
+    assert cache.stats()["entries"] == 2
+
+
+def test_stats_count_hits_misses_and_size(tmp_path, clock):
+    cache = _cache(tmp_path)
+    cache.set("a", b"12345")
+    cache.set("b", b"123")
+    cache.get("a")
+    cache.get("a")
+    cache.get("b")
+    cache.get("missing")
+
+    assert cache.stats() == {"hits": 3, "misses": 1, "entries": 2, "bytes": 8}
+
+    cache.clear()
+    assert cache.stats() == {"hits": 0, "misses": 0, "entries": 0, "bytes": 0}
+
+
+def test_stats_are_shared_between_instances(tmp_path, clock):
+    first = _cache(tmp_path)
+    second = _cache(tmp_path)
+    first.set("a", b"1")
+
+    assert second.get("a") == b"1"
+    second.get("missing")
+
+    assert first.stats()["entries"] == 1
+    assert second.stats()["hits"] == 1
+    expected = {"hits": 1, "misses": 1, "entries": 1, "bytes": 1}
+    assert first.stats() == expected
+    assert second.stats() == expected
+
+
+def test_oversized_values_are_not_stored(tmp_path, clock):
+    cache = _cache(tmp_path, max_bytes=4)
+    cache.set("big", b"12345")
+
+    assert cache.get("big") is None
+    assert cache.stats()["entries"] == 0
@@ -0,0 +1,51 @@
+"""Tests for utils/lexicon.py"""
+
+from utils.lexicon import LexiconMatcher
+from utils.resume_document import ResumeDocument
+
+
+def _terms(hits):
+    return [hit.term for hit in hits]
+
+
+def test_overlapping_and_multi_token_matches():
+    matcher = LexiconMatcher()
+    matcher.add_lexicon("skills", ["machine learning", "learning", "deep learning"])
+    matcher.add_lexicon("phrases", ["machine learning engineer", "engineer"])
+    doc = ResumeDocument.from_text("Deep Learning and Machine-Learning Engineer")
+
+    hits = matcher.scan_document(doc)
+
+    assert _terms(hits["skills"]) == [
+        "deep learning",
+        "learning",
+        "machine learning",
+        "learning",
+    ]
+    assert sorted(_terms(hits["phrases"])) == ["engineer", "machine learning engineer"]
+    phrase = next(h for h in hits["phrases"] if h.term == "machine learning engineer")
+    assert doc.text[phrase.start : phrase.end] == "Machine-Learning Engineer"
+
+
+def test_term_in_several_lexicons_is_reported_in_each():
+    matcher = LexiconMatcher()
+    matcher.add_lexicon("strong", ["led"])
+    matcher.add_lexicon("leadership", ["led", "mentored"])
+
+    hits = matcher.scan(["led", "and", "mentored"])
+
+    assert hits["strong"][0] == ("led", 0, 1)
+    assert _terms(hits["leadership"]) == ["led", "mentored"]
+
+
+def test_add_lexicon_bumps_version_and_refreshes_cached_scans():
+    matcher = LexiconMatcher()
+    matcher.add_lexicon("skills", ["python"])
+    doc = ResumeDocument.from_text("Python and Kafka")
+    assert _terms(doc.matches(matcher)["skills"]) == ["python"]
+    version = matcher.version
+
+    matcher.add_lexicon("skills", ["kafka"])
+
+    assert matcher.version == version + 1
+    assert _terms(doc.matches(matcher)["skills"]) == ["python", "kafka"]
@@ -0,0 +1,97 @@
+"""Tests for utils/near_duplicates.py"""
+
+import random
+
+from utils.near_duplicates import NearDuplicateIndex, repeated_phrases
+from utils.resume_analyzer import (
+    CROSS_RESUME_DUPLICATE_THRESHOLD,
+    NEAR_DUPLICATE_THRESHOLD,
+)
+
+VOCABULARY = [f"word{index}" for index in range(500)]
+
+
+def _jaccard(first, second, size=3):
+    shingles = [
+        {tuple(tokens[i : i + size]) for i in range(len(tokens) - size + 1)}
+        for tokens in (first, second)
+    ]
+    return len(shingles[0] & shingles[1]) / len(shingles[0] | shingles[1])
+
+
+def _pairs(count, length, edits, seed=7):
+    """Random sentences, each paired with a copy that has `edits` words replaced"""
+    rng = random.Random(seed)
+    pairs = []
+    for _ in range(count):
+        tokens = rng.sample(VOCABULARY, length)
+        edited = list(tokens)
+        for position in rng.sample(range(length), edits):
+            edited[position] = f"edit{rng.randrange(10**6)}"
+        pairs.append((tokens, edited))
+    return pairs
+
+
+def _recall(threshold, pairs):
+    index = NearDuplicateIndex(threshold=threshold)
+    for number, (tokens, edited) in enumerate(pairs):
+        index.add((number, "original"), tokens)
+        index.add((number, "edited"), edited)
+    found = {
+        (pair.first[0], pair.second[0])
+        for pair in index.near_duplicates()
+        if pair.first[0] == pair.second[0]
+    }
+    false_pairs = [
+        pair for pair in index.near_duplicates() if pair.first[0] != pair.second[0]
+    ]
+    return len(found) / len(pairs), false_pairs
+
+
+def test_recall_at_sentence_threshold():
+    # One word changed in 30: shingle Jaccard of 0.75-0.93
+    pairs = _pairs(50, 30, 1)
+    assert min(_jaccard(*pair) for pair in pairs) >= 0.75
+
+    recall, false_pairs = _recall(NEAR_DUPLICATE_THRESHOLD, pairs)
+
+    assert recall >= 0.95
+    assert false_pairs == []
+
+
+def test_recall_at_cross_resume_threshold():
+    # The last word changed in 40: shingle Jaccard of 0.95
+    rng = random.Random(3)
+    pairs = []
+    for _ in range(50):
+        tokens = rng.sample(VOCABULARY, 40)
+        pairs.append((tokens, tokens[:-1] + ["changed"]))
+    assert min(_jaccard(*pair) for pair in pairs) >= 0.9
+
+    recall, false_pairs = _recall(CROSS_RESUME_DUPLICATE_THRESHOLD, pairs)
+
+    assert recall >= 0.95
+    assert false_pairs == []
+
+
+def test_dissimilar_units_are_not_reported():
+    # Half the words changed: far below either threshold
+    pairs = _pairs(50, 30, 15)
+
+    recall, false_pairs = _recall(NEAR_DUPLICATE_THRESHOLD, pairs)
+
+    assert recall == 0
+    assert false_pairs == []
+
+
+def test_repeated_phrases_counts_windows_across_sentences():
+    sentences = [
+        "Responsible for managing the deployment pipeline daily",
+        "Also responsible for managing the deployment pipeline",
+        "Wrote unit tests",
+    ]
+
+    assert repeated_phrases(sentences) == [
+        ("responsible for managing the deployment", 2),
+        ("for managing the deployment pipeline", 2),
+    ]
@@ -0,0 +1,50 @@
+"""Tests for utils/prompt_compaction.py"""
+
+from utils.prompt_compaction import compact_prompt_inputs, compact_text
+
+RESUME = """Jane Doe | Resume
+EXPERIENCE
+Software Engineer
+Acme Corp
+2016 - 2019
+• Built payment APIs in Python
+Software Engineer
+Globex
+2012 - 2016
+• Migrated services to Kubernetes
+Page 1 of 2
+Jane Doe | Resume
+Software Engineer
+Initech
+2019 - 2016
+• Led a team of 4 engineers
+EDUCATION
+BSc Computer Science
+2016
+Page 2 of 2"""
+
+
+def test_repeated_titles_and_dates_survive():
+    lines = compact_text(RESUME).split("\n")
+    assert lines.count("Software Engineer") == 3
+    assert "2016 - 2019" in lines
+    assert "2012 - 2016" in lines
+    assert "2016" in lines
+
+
+def test_running_header_and_page_numbers_are_dropped():
+    lines = compact_text(RESUME).split("\n")
+    assert lines.count("Jane Doe | Resume") == 1
+    assert not any(line.startswith("Page ") for line in lines)
+
+
+def test_inputs_under_budget_are_unchanged():
+    job_description = "Requirements\n\n\n- Python   and Kafka"
+    assert compact_prompt_inputs(RESUME, job_description, budget=6000) == (
+        RESUME,
+        job_description,
+    )
+    assert compact_prompt_inputs(RESUME, job_description, budget=0) == (
+        RESUME,
+        job_description,
+    )
@@ -0,0 +1,68 @@
+"""Tests for utils/relevance.py"""
+
+from utils.relevance import JDCorpus, extract_terms, score_relevance
+
+BACKEND_JD = "Backend engineer: Python, Kafka and PostgreSQL.\nMachine learning a plus."
+FRONTEND_JD = "Frontend engineer: TypeScript and React."
+
+
+def test_extract_terms_counts_unigrams_and_bigrams_within_phrases():
+    terms = extract_terms("Machine learning, full-stack.\nLearning Python")
+
+    assert terms["learning"] == 2
+    assert terms["machine learning"] == 1
+    assert terms["full stack"] == 1
+    # Bigrams never span punctuation or line breaks
+    assert "learning full" not in terms
+    assert "stack learning" not in terms
+
+
+def test_same_job_description_is_counted_once(tmp_path):
+    corpus = JDCorpus(str(tmp_path / "corpus.sqlite3"))
+
+    assert corpus.add(BACKEND_JD)
+    # Same text up to case and surrounding whitespace
+    assert not corpus.add("  " + BACKEND_JD.upper() + "\n")
+
+    assert corpus.stats()["documents"] == 1
+    assert corpus.document_frequencies(["kafka"]) == {"kafka": 1}
+
+
+def test_document_frequencies_update_incrementally(tmp_path):
+    corpus = JDCorpus(str(tmp_path / "corpus.sqlite3"))
+    corpus.add(BACKEND_JD)
+    corpus.add(FRONTEND_JD)
+
+    assert corpus.document_frequencies(["engineer", "kafka", "react", "rust"]) == {
+        "engineer": 2,
+        "kafka": 1,
+        "react": 1,
+        "rust": 0,
+    }
+    stats = corpus.stats()
+    assert stats["documents"] == 2
+    # Unigrams only: 8 in the backend posting, 4 in the frontend one
+    assert stats["avg_length"] == 6
+
+
+def test_statistics_persist_across_instances(tmp_path):
+    path = str(tmp_path / "corpus.sqlite3")
+    JDCorpus(path).add(BACKEND_JD)
+
+    reopened = JDCorpus(path)
+
+    assert reopened.stats()["documents"] == 1
+    assert reopened.document_frequencies(["postgresql"]) == {"postgresql": 1}
+    assert not reopened.add(BACKEND_JD)
+
+
+def test_rare_terms_outweigh_common_ones(tmp_path):
+    corpus = JDCorpus(str(tmp_path / "corpus.sqlite3"))
+    corpus.add(FRONTEND_JD)
+    corpus.add("Data engineer: Spark and Airflow.")
+
+    result = score_relevance("Python developer", BACKEND_JD, corpus=corpus)
+
+    weights = dict(result["missing_terms"])
+    assert weights["kafka"] > weights["engineer"]
+    assert result["corpus_documents"] == 3
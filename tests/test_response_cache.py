@@ -0,0 +1,79 @@
+"""Tests for utils/response_cache.py"""
+
+import pytest
+
+from utils import response_cache
+from utils.disk_cache import DiskCache
+from utils.response_cache import cached_response, response_cache_key
+
+RESUME = "Backend engineer, Python and Kafka"
+JOB_DESCRIPTION = "Python engineer wanted"
+
+
+def _key(**overrides):
+    arguments = {
+        "provider": "groq",
+        "model_id": "llama-3.3-70b-versatile",
+        "prompt_version": 2,
+        "resume_text": RESUME,
+        "job_description": JOB_DESCRIPTION,
+        "token_budget": 6000,
+    }
+    arguments.update(overrides)
+    return response_cache_key(**arguments)
+
+
+def test_key_is_stable_for_the_same_inputs():
+    assert _key() == _key()
+
+
+@pytest.mark.parametrize(
+    "override",
+    [
+        {"provider": "gemini"},
+        {"model_id": "llama-3.1-8b-instant"},
+        {"prompt_version": 3},
+        {"token_budget": 4000},
+        {"token_budget": 0},
+        {"resume_text": RESUME + "."},
+        {"job_description": JOB_DESCRIPTION + "."},
+    ],
+)
+def test_key_changes_with_every_input(override):
+    assert _key(**override) != _key()
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    disk = DiskCache(str(tmp_path / "responses.sqlite3"), ttl=3600)
+    monkeypatch.setattr(response_cache, "_response_cache", disk)
+    return disk
+
+
+def test_results_are_reused_and_failures_retried(cache):
+    calls = []
+
+    @cached_response("groq", "model", 1, token_budget=6000)
+    def analyze(resume_text, job_description, api_key):
+        calls.append(api_key)
+        return {"match_score": 80} if api_key else None
+
+    assert analyze(RESUME, JOB_DESCRIPTION, "") is None
+    assert analyze(RESUME, JOB_DESCRIPTION, "key") == {"match_score": 80}
+    assert analyze(RESUME, JOB_DESCRIPTION, "other key") == {"match_score": 80}
+
+    assert calls == ["", "key"]
+    assert cache.get(
+        response_cache_key("groq", "model", 1, RESUME, JOB_DESCRIPTION, 6000)
+    )
+
+
+def test_cached_results_are_restored(cache):
+    @cached_response(
+        "groq", "model", 1, restore=lambda result: result.update(restored=True)
+    )
+    def analyze(resume_text, job_description):
+        return {"match_score": 80}
+
+    assert analyze(RESUME, JOB_DESCRIPTION) == {"match_score": 80}
+    assert analyze(RESUME, JOB_DESCRIPTION) == {"match_score": 80, "restored": True}
@@ -0,0 +1,84 @@
+"""Tests for utils/section_segmenter.py"""
+
+from utils.section_segmenter import (
+    HEADER_SECTION,
+    section_document,
+    segment_sections,
+)
+
+RESUME = """Jane Doe
+jane@example.com
+
+PROFESSIONAL EXPERIENCE
+Software Engineer, Acme Corp
+• Built payment APIs in Python
+
+Skills: Python, Kafka, Kubernetes
+Education & Training:
+BSc Computer Science"""
+
+
+def _bodies(text):
+    return {
+        span.name: text[span.body_start : span.end].strip()
+        for span in segment_sections(text)
+    }
+
+
+def test_spans_cover_the_text_in_order():
+    spans = segment_sections(RESUME)
+
+    assert [span.name for span in spans] == [
+        HEADER_SECTION,
+        "experience",
+        "skills",
+        "education",
+    ]
+    assert spans[0].start == 0
+    assert spans[-1].end == len(RESUME)
+    for previous, span in zip(spans, spans[1:]):
+        assert previous.end == span.start
+    for span in spans:
+        assert span.start <= span.body_start <= span.end
+
+
+def test_body_offsets_slice_the_section_text():
+    bodies = _bodies(RESUME)
+
+    assert bodies[HEADER_SECTION] == "Jane Doe\njane@example.com"
+    assert bodies["experience"] == (
+        "Software Engineer, Acme Corp\n• Built payment APIs in Python"
+    )
+    # Inline heading: the body starts after the colon on the same line
+    assert bodies["skills"] == "Python, Kafka, Kubernetes"
+    assert bodies["education"] == "BSc Computer Science"
+
+
+def test_headings_are_kept_as_written():
+    headings = {span.name: span.heading for span in segment_sections(RESUME)}
+
+    assert headings["experience"] == "PROFESSIONAL EXPERIENCE"
+    assert headings["skills"] == "Skills"
+    assert headings["education"] == "Education & Training"
+
+
+def test_heading_on_last_line_has_empty_body():
+    text = "Summary\nBackend engineer\nExperience"
+
+    span = segment_sections(text)[-1]
+
+    assert span.name == "experience"
+    assert span.body_start == span.end == len(text)
+
+
+def test_body_lines_are_not_headings():
+    text = "Experience\n• Skills in Python and Go\nLed the education team."
+
+    assert [span.name for span in segment_sections(text)] == ["experience"]
+
+
+def test_section_document_joins_matching_bodies():
+    text = "Experience\nAcme\nSkills\nPython\nWork History\nGlobex"
+
+    assert section_document(text, "experience").text == "Acme\nGlobex"
+    assert section_document(text, "projects").text == ""
@@ -0,0 +1,80 @@
+"""Tests for utils/skill_taxonomy.py"""
+
+from utils.skill_taxonomy import (
+    Skill,
+    SkillTaxonomy,
+    build_index,
+    get_skill_taxonomy,
+    load_taxonomy,
+    parse_taxonomy,
+)
+
+SOURCE = """# Test taxonomy
+Kubernetes | tool | k8s, kube
+Go | technical | ~go, golang
+C++ | technical | cpp
+"""
+
+
+def _write_source(tmp_path, text=SOURCE):
+    source = tmp_path / "taxonomy.txt"
+    source.write_text(text, encoding="utf-8")
+    return str(source)
+
+
+def test_aliases_resolve_to_canonical_skills(tmp_path):
+    taxonomy = SkillTaxonomy(build_index(parse_taxonomy(_write_source(tmp_path))))
+
+    assert taxonomy.lookup("K8S") == Skill("Kubernetes", "tool")
+    assert taxonomy.lookup("golang") == Skill("Go", "technical")
+    assert taxonomy.lookup("c++") == Skill("C++", "technical")
+    assert taxonomy.lookup("C") is None
+    assert taxonomy.canonicalize(" kube ") == "Kubernetes"
+    assert taxonomy.canonicalize("Haskell") == "Haskell"
+    assert len(taxonomy) == 3
+
+
+def test_lookup_only_aliases_are_not_scannable(tmp_path):
+    taxonomy = SkillTaxonomy(build_index(parse_taxonomy(_write_source(tmp_path))))
+
+    scannable = dict(taxonomy.aliases(scannable_only=True))
+
+    assert "golang" in scannable
+    # Marked ~ in the source, and a symbol-only form
+    assert "go" not in scannable
+    assert "c++" not in scannable
+    assert "go" in dict(taxonomy.aliases())
+
+
+def test_bundled_taxonomy_resolves_common_aliases():
+    taxonomy = get_skill_taxonomy()
+
+    assert taxonomy.canonicalize("js") == "JavaScript"
+    assert taxonomy.canonicalize("Machine-Learning") == taxonomy.canonicalize(
+        "machine learning"
+    )
+
+
+def test_index_is_rebuilt_when_source_checksum_changes(tmp_path):
+    source = _write_source(tmp_path)
+    index = str(tmp_path / "taxonomy.idx")
+
+    first = load_taxonomy(source, index)
+    assert first.lookup("kube").name == "Kubernetes"
+    assert first.lookup("terraform") is None
+
+    _write_source(tmp_path, SOURCE + "Terraform | tool | tf\n")
+    rebuilt = load_taxonomy(source, index)
+
+    assert rebuilt.source_checksum != first.source_checksum
+    assert rebuilt.lookup("tf") == Skill("Terraform", "tool")
+    # The rebuilt file is reused as long as the source is unchanged
+    assert load_taxonomy(source, index).source_checksum == rebuilt.source_checksum
+
+
+def test_unreadable_index_is_rebuilt(tmp_path):
+    source = _write_source(tmp_path)
+    index = tmp_path / "taxonomy.idx"
+    index.write_bytes(b"not an index")
+
+    assert load_taxonomy(source, str(index)).lookup("k8s").name == "Kubernetes"
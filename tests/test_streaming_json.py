@@ -0,0 +1,74 @@
+"""Tests for utils/streaming_json.py"""
+
+import json
+import random
+
+from utils.streaming_json import StreamingJSONParser
+
+RESULT = {
+    "match_score": 72,
+    "match_reasoning": 'Strong "backend" fit: Python, Kafka {streaming}, [queues]',
+    "found_keywords": {"technical_skills": ["Python", "Kafka"], "soft_skills": []},
+    "missing_keywords": {"critical_technical_skills": ["Go, Rust"]},
+    "suggestions": ["Quantify impact\\results", "Add a\nsummary"],
+    "is_remote": False,
+    "salary": None,
+    "confidence": 0.8,
+}
+RESPONSE = "```json\n" + json.dumps(RESULT, indent=2) + "\n```\nDone."
+
+# Fields feed() emits: every one except those with a null value
+EXPECTED = [(key, value) for key, value in RESULT.items() if value is not None]
+
+
+def _parse(chunks):
+    parser = StreamingJSONParser()
+    fields = []
+    for chunk in chunks:
+        fields.extend(parser.feed(chunk))
+    return parser, fields
+
+
+def test_whole_response_at_once():
+    parser, fields = _parse([RESPONSE])
+
+    assert fields == EXPECTED
+    assert parser.done
+
+
+def test_same_fields_at_every_split_point():
+    for split in range(len(RESPONSE) + 1):
+        _, fields = _parse([RESPONSE[:split], RESPONSE[split:]])
+        assert fields == EXPECTED, split
+
+
+def test_same_fields_one_character_at_a_time():
+    assert _parse(RESPONSE)[1] == EXPECTED
+
+
+def test_same_fields_in_random_chunks():
+    rng = random.Random(5)
+    for _ in range(50):
+        chunks = []
+        position = 0
+        while position < len(RESPONSE):
+            size = rng.randint(1, 20)
+            chunks.append(RESPONSE[position : position + size])
+            position += size
+        assert _parse(chunks)[1] == EXPECTED
+
+
+def test_fields_are_emitted_as_soon_as_they_complete():
+    parser = StreamingJSONParser()
+
+    assert parser.feed('{"match_score": 7') == []
+    assert parser.feed('2, "suggestions": ["a",') == [("match_score", 72)]
+    assert parser.feed(' "b"]}') == [("suggestions", ["a", "b"])]
+    assert parser.done
+    assert parser.feed('{"ignored": 1}') == []
+
+
+def test_invalid_values_are_skipped():
+    _, fields = _parse(['{"score": 8O, "ok": true}'])
+
+    assert fields == [("ok", True)]
@@ -0,0 +1,255 @@
+"""Memoized resume analysis: every metric computed at most once per text"""
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from .local_scorer import score_locally
+from .relevance import score_relevance
+from .resume_analyzer import (
+    analyze_action_verbs,
+    analyze_resume_length,
+    calculate_readability_score,
+    check_date_formats,
+    check_quantification,
+    count_bullet_points,
+    create_keyword_density_map,
+    detect_resume_sections,
+    find_duplicate_content,
+    generate_wordcloud,
+    validate_contact_information,
+)
+from .resume_document import ResumeDocument
+from .section_segmenter import section_document
+
+# Resume texts whose results are kept; the least recently used is dropped
+ANALYSIS_CACHE_SIZE = int(os.getenv("ANALYSIS_CACHE_SIZE", "32"))
+
+# Job descriptions per resume text whose results are kept
+JOB_DESCRIPTIONS_PER_ENTRY = 4
+
+# Pipeline inputs every analyzer can depend on
+INPUTS = ("text", "job_description")
+
+
+class _Analyzer(NamedTuple):
+    func: Callable[..., Any]
+    requires: Tuple[str, ...]
+    # Whether the result depends on the job description, directly or through
+    # another analyzer; such results are cached per job description
+    uses_job_description: bool
+
+
+def _digest(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class _Entry:
+    """Results computed so far for one resume text"""
+
+    def __init__(self, text: str):
+        self.text = text
+        self.values: Dict[Tuple[str, Optional[str]], Any] = {}
+        # Job description keys with cached results, least recently used first
+        self.job_descriptions: "OrderedDict[str, None]" = OrderedDict()
+        self.lock = threading.RLock()
+
+    def touch_job_description(self, jd_key: str) -> None:
+        """Mark a job description as used, dropping the results of old ones"""
+        self.job_descriptions[jd_key] = None
+        self.job_descriptions.move_to_end(jd_key)
+        while len(self.job_descriptions) > JOB_DESCRIPTIONS_PER_ENTRY:
+            stale, _ = self.job_descriptions.popitem(last=False)
+            for key in [key for key in self.values if key[1] == stale]:
+                del self.values[key]
+
+
+class AnalysisPipeline:
+    """
+    Named analyzers with declared dependencies, memoized per resume text.
+
+    Each analyzer is a function of the results it requires, e.g. the
+    Experience-section quantification check requires the Experience-section
+    document, which requires the tokenized document, which requires the
+    text. Asking for a result computes it and whatever it depends on once;
+    later requests from any tab, export or rerun read the cached value.
+    Results are keyed by a hash of the resume text (and of the job
+    description for analyzers that use it); at most max_entries texts, each
+    with results for up to JOB_DESCRIPTIONS_PER_ENTRY job descriptions, are
+    kept.
+    """
+
+    def __init__(self, max_entries: int = ANALYSIS_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._analyzers: Dict[str, _Analyzer] = {}
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def register(
+        self,
+        name: str,
+        func: Callable[..., Any],
+        requires: Iterable[str] = ("document",),
+    ) -> None:
+        """
+        Add an analyzer.
+
+        Args:
+            name: Result name
+            func: Called with the required results, in order
+            requires: Names of inputs (INPUTS) or already registered
+                analyzers; registering in dependency order keeps the graph
+                acyclic
+        """
+        if name in self._analyzers or name in INPUTS:
+            raise ValueError(f"Analyzer '{name}' is already registered")
+        requires = tuple(requires)
+        for dependency in requires:
+            if dependency not in INPUTS and dependency not in self._analyzers:
+                raise ValueError(f"Analyzer '{name}' requires unknown '{dependency}'")
+
+        uses_job_description = any(
+            dependency == "job_description"
+            or (
+                dependency in self._analyzers
+                and self._analyzers[dependency].uses_job_description
+            )
+            for dependency in requires
+        )
+        self._analyzers[name] = _Analyzer(func, requires, uses_job_description)
+
+    @property
+    def names(self) -> List[str]:
+        return list(self._analyzers)
+
+    def analyze(self, text: str, job_description: str = "") -> "ResumeAnalysis":
+        """
+        Get the (lazily computed) results for a resume.
+
+        Args:
+            text: Resume text
+            job_description: Job description text, if any
+
+        Returns:
+            ResumeAnalysis; index it by analyzer name to get results
+        """
+        key = _digest(text)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._entries[key] = _Entry(text)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+            else:
+                self._entries.move_to_end(key)
+        return ResumeAnalysis(self, entry, job_description or "")
+
+    def clear(self) -> None:
+        """Drop every cached result"""
+        with self._lock:
+            self._entries.clear()
+
+    def _compute(self, entry: _Entry, name: str, job_description: str, jd_key: str):
+        if name == "text":
+            return entry.text
+        if name == "job_description":
+            return job_description
+
+        analyzer = self._analyzers.get(name)
+        if analyzer is None:
+            raise KeyError(f"Unknown analyzer '{name}'")
+        key = (name, jd_key if analyzer.uses_job_description else None)
+
+        with entry.lock:
+            if analyzer.uses_job_description:
+                entry.touch_job_description(jd_key)
+            if key not in entry.values:
+                arguments = [
+                    self._compute(entry, dependency, job_description, jd_key)
+                    for dependency in analyzer.requires
+                ]
+                entry.values[key] = analyzer.func(*arguments)
+            return entry.values[key]
+
+
+class ResumeAnalysis:
+    """Results of one resume (and job description), computed on first access"""
+
+    def __init__(self, pipeline: AnalysisPipeline, entry: _Entry, job_description: str):
+        self._pipeline = pipeline
+        self._entry = entry
+        self.job_description = job_description
+        self._jd_key = _digest(job_description)
+
+    @property
+    def text(self) -> str:
+        return self._entry.text
+
+    def __getitem__(self, name: str) -> Any:
+        return self._pipeline._compute(
+            self._entry, name, self.job_description, self._jd_key
+        )
+
+    def get_many(self, names: Iterable[str]) -> Dict[str, Any]:
+        """Results for several analyzers, as a dictionary"""
+        return {name: self[name] for name in names}
+
+    def is_computed(self, name: str) -> bool:
+        """Whether a result is already cached"""
+        analyzer = self._pipeline._analyzers[name]
+        key = (name, self._jd_key if analyzer.uses_job_description else None)
+        return key in self._entry.values
+
+
+RESUME_PIPELINE = AnalysisPipeline()
+RESUME_PIPELINE.register("document", ResumeDocument.from_text, ("text",))
+RESUME_PIPELINE.register(
+    "experience_document",
+    lambda document: section_document(document, "experience"),
+)
+RESUME_PIPELINE.register("length", analyze_resume_length)
+RESUME_PIPELINE.register("contact", validate_contact_information)
+RESUME_PIPELINE.register("bullets", count_bullet_points)
+RESUME_PIPELINE.register("verbs", analyze_action_verbs)
+RESUME_PIPELINE.register("quantification", check_quantification)
+# The same checks on the Experience section alone (empty if it has none)
+RESUME_PIPELINE.register(
+    "experience_verbs", analyze_action_verbs, ("experience_document",)
+)
+RESUME_PIPELINE.register(
+    "experience_quantification", check_quantification, ("experience_document",)
+)
+RESUME_PIPELINE.register("readability", calculate_readability_score)
+RESUME_PIPELINE.register("wordcloud", generate_wordcloud)
+RESUME_PIPELINE.register("sections", detect_resume_sections)
+RESUME_PIPELINE.register("dates", check_date_formats)
+RESUME_PIPELINE.register("duplicates", find_duplicate_content)
+RESUME_PIPELINE.register(
+    "keyword_density",
+    lambda document, job_description: create_keyword_density_map(
+        document, job_description or None
+    ),
+    ("document", "job_description"),
+)
+RESUME_PIPELINE.register(
+    "relevance",
+    lambda document, job_description: (
+        score_relevance(document, job_description) if job_description else None
+    ),
+    ("document", "job_description"),
+)
+RESUME_PIPELINE.register("local_score", score_locally, ("document", "job_description"))
+# The additional metrics included in CSV/Excel exports
+RESUME_PIPELINE.register(
+    "export_data",
+    lambda length, contact, bullets, verbs, quantification: {
+        "length": length,
+        "contact": contact,
+        "bullets": bullets,
+        "verbs": verbs,
+        "quantification": quantification,
+    },
+    ("length", "contact", "bullets", "verbs", "quantification"),
+)
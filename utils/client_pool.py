@@ -0,0 +1,152 @@
+"""Process-wide pool of AI provider clients, reused across calls and sessions"""
+
+import hashlib
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+# Seconds an unused client is kept before it is closed and dropped
+CLIENT_IDLE_SECONDS = float(os.getenv("AI_CLIENT_IDLE_SECONDS", "600"))
+
+
+class _PooledClient:
+    """A client and its usage, for health checks and idle eviction"""
+
+    __slots__ = ("client", "last_used", "in_use", "retired")
+
+    def __init__(self, client: Any):
+        self.client = client
+        self.last_used = time.monotonic()
+        self.in_use = 0
+        # Dropped from the pool while leased; closed when the last lease ends
+        self.retired = False
+
+
+def _close(client: Any) -> None:
+    close = getattr(client, "close", None)
+    if close is None:
+        return
+    try:
+        close()
+    except Exception as e:
+        print(f"Error closing AI client: {e}")
+
+
+class ClientPool:
+    """
+    One client per (provider, API key), shared by every session of the process.
+
+    A provider client owns an HTTP connection pool, so reusing it keeps
+    connections alive between analyses instead of paying for a new TCP and
+    TLS handshake on every call. Each lease checks that the client is still
+    usable and builds a new one if not; a replaced client still leased is
+    closed when its last lease ends. Clients unused for idle_seconds are
+    closed on the next lease of any client.
+    """
+
+    def __init__(self, idle_seconds: float = CLIENT_IDLE_SECONDS):
+        self.idle_seconds = idle_seconds
+        self._factories: Dict[str, Callable[[str], Any]] = {}
+        self._health_checks: Dict[str, Callable[[Any], bool]] = {}
+        self._clients: Dict[Tuple[str, str], _PooledClient] = {}
+        self._lock = threading.Lock()
+
+    def register(
+        self,
+        provider: str,
+        factory: Callable[[str], Any],
+        is_healthy: Optional[Callable[[Any], bool]] = None,
+    ) -> None:
+        """
+        Add a provider.
+
+        Args:
+            provider: Provider name, e.g. "groq"
+            factory: Builds a client from an API key
+            is_healthy: Whether a pooled client can still be used; None to
+                always reuse it
+        """
+        self._factories[provider] = factory
+        if is_healthy is not None:
+            self._health_checks[provider] = is_healthy
+
+    @contextmanager
+    def lease(self, provider: str, api_key: str) -> Iterator[Any]:
+        """
+        Borrow the pooled client for a provider and API key.
+
+        A client in use is never evicted, and several threads can lease the
+        same client at once (the provider SDKs are thread-safe).
+
+        Args:
+            provider: Registered provider name
+            api_key: API key the client authenticates with
+        """
+        entry = self._acquire(provider, api_key)
+        try:
+            yield entry.client
+        finally:
+            with self._lock:
+                entry.in_use -= 1
+                entry.last_used = time.monotonic()
+                close_now = entry.retired and entry.in_use == 0
+            if close_now:
+                _close(entry.client)
+
+    def _acquire(self, provider: str, api_key: str) -> _PooledClient:
+        if provider not in self._factories:
+            raise KeyError(f"Unknown AI provider '{provider}'")
+        # Keys are held hashed; the client itself still has the raw key
+        key = (provider, hashlib.sha256(api_key.encode("utf-8")).hexdigest())
+        is_healthy = self._health_checks.get(provider)
+
+        with self._lock:
+            stale = self._evict_idle()
+            entry = self._clients.get(key)
+            if entry is not None and is_healthy and not is_healthy(entry.client):
+                del self._clients[key]
+                if entry.in_use == 0:
+                    stale.append(entry.client)
+                else:
+                    entry.retired = True
+                entry = None
+            if entry is None:
+                entry = self._clients[key] = _PooledClient(
+                    self._factories[provider](api_key)
+                )
+            entry.in_use += 1
+            entry.last_used = time.monotonic()
+
+        for client in stale:
+            _close(client)
+        return entry
+
+    def _evict_idle(self) -> list:
+        """Drop clients unused for idle_seconds; returns them for closing"""
+        deadline = time.monotonic() - self.idle_seconds
+        stale_keys = [
+            key
+            for key, entry in self._clients.items()
+            if entry.in_use == 0 and entry.last_used < deadline
+        ]
+        return [self._clients.pop(key).client for key in stale_keys]
+
+    def stats(self) -> Dict[str, int]:
+        """Pooled clients per provider"""
+        with self._lock:
+            counts: Dict[str, int] = {}
+            for provider, _ in self._clients:
+                counts[provider] = counts.get(provider, 0) + 1
+        return counts
+
+    def close(self) -> None:
+        """Close and drop every client that isn't in use"""
+        with self._lock:
+            idle_keys = [
+                key for key, entry in self._clients.items() if entry.in_use == 0
+            ]
+            stale = [self._clients.pop(key).client for key in idle_keys]
+        for client in stale:
+            _close(client)
@@ -0,0 +1,206 @@
+"""Size-bounded, disk-backed LRU cache shared between processes"""
+
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+
+DEFAULT_CACHE_DIR = os.path.expanduser(
+    os.getenv("CACHE_DIR", os.path.join("~", ".cache", "resume-keyword-matcher"))
+)
+
+# A hit only records its access time if the stored one is older than this, so
+# most reads don't write; LRU order needs no finer resolution
+ACCESS_REFRESH_SECONDS = 60
+
+
+class DiskCache:
+    """
+    Key/value store backed by a SQLite file.
+
+    SQLite handles locking, so several Streamlit workers on one host can share
+    the same cache file. Entries are evicted least-recently-used first once the
+    stored values exceed max_bytes, and expire ttl seconds after being stored
+    if a ttl is set.
+
+    Reads don't take SQLite's writer lock, so workers don't queue on each
+    other's lookups: a hit updates last_access only when it is older than
+    ACCESS_REFRESH_SECONDS, and hit/miss counts are kept in memory and added
+    to the shared counters on the next write (set, an access refresh or
+    stats()), so the counters still cover every process using the cache.
+    """
+
+    def __init__(
+        self, path: str, max_bytes: int = 64 * 1024 * 1024, ttl: Optional[float] = None
+    ):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        # Hits and misses not yet added to the stats table
+        self._pending = {"hits": 0, "misses": 0}
+        self._pending_lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                "key TEXT PRIMARY KEY, value BLOB, size INTEGER, last_access REAL, "
+                "expires_at REAL)"
+            )
+            columns = [row[1] for row in conn.execute("PRAGMA table_info(entries)")]
+            if "expires_at" not in columns:
+                # Cache files created before entries could expire
+                conn.execute("ALTER TABLE entries ADD COLUMN expires_at REAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS stats (name TEXT PRIMARY KEY, value INTEGER)"
+            )
+            conn.executemany(
+                "INSERT OR IGNORE INTO stats (name, value) VALUES (?, 0)",
+                [("hits",), ("misses",)],
+            )
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        # A connection per operation keeps the cache safe to use from
+        # Streamlit's script threads
+        conn = sqlite3.connect(self.path, timeout=5)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def get(self, key: str) -> Optional[bytes]:
+        """
+        Look up a value and mark it as recently used.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Stored bytes, or None on a miss, an expired entry or cache error.
+            Expired entries are deleted by the next set().
+        """
+        try:
+            with self._connect() as conn:
+                now = time.time()
+                row = conn.execute(
+                    "SELECT value, expires_at, last_access FROM entries WHERE key = ?",
+                    (key,),
+                ).fetchone()
+                if row is None or (row[1] is not None and row[1] <= now):
+                    self._count("misses")
+                    return None
+
+                self._count("hits")
+                if row[2] is None or row[2] < now - ACCESS_REFRESH_SECONDS:
+                    conn.execute(
+                        "UPDATE entries SET last_access = ? WHERE key = ?", (now, key)
+                    )
+                    self._flush_stats(conn)
+                return bytes(row[0])
+
+        except sqlite3.Error as e:
+            print(f"Cache read error: {e}")
+            return None
+
+    def _count(self, name: str) -> None:
+        with self._pending_lock:
+            self._pending[name] += 1
+
+    def _flush_stats(self, conn: sqlite3.Connection) -> None:
+        """Add this process's pending hit/miss counts to the shared counters"""
+        with self._pending_lock:
+            pending = [(count, name) for name, count in self._pending.items() if count]
+            self._pending = {"hits": 0, "misses": 0}
+        if pending:
+            conn.executemany(
+                "UPDATE stats SET value = value + ? WHERE name = ?", pending
+            )
+
+    def set(self, key: str, value: bytes, ttl: Optional[float] = None) -> None:
+        """
+        Store a value, evicting least-recently-used entries over the byte budget.
+
+        Args:
+            key: Cache key
+            value: Bytes to store
+            ttl: Seconds until the entry expires; None for the cache's ttl
+        """
+        size = len(value)
+        if size > self.max_bytes:
+            return
+
+        now = time.time()
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = now + ttl if ttl is not None else None
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO entries "
+                    "(key, value, size, last_access, expires_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (key, sqlite3.Binary(value), size, now, expires_at),
+                )
+                self._evict(conn)
+                self._flush_stats(conn)
+
+        except sqlite3.Error as e:
+            print(f"Cache write error: {e}")
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        """Delete expired entries, then the oldest until the cache fits in max_bytes"""
+        conn.execute("DELETE FROM entries WHERE expires_at <= ?", (time.time(),))
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        stale_keys = []
+        for key, size in conn.execute(
+            "SELECT key, size FROM entries ORDER BY last_access"
+        ):
+            if total <= self.max_bytes:
+                break
+            stale_keys.append((key,))
+            total -= size
+
+        conn.executemany("DELETE FROM entries WHERE key = ?", stale_keys)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get cache counters.
+
+        Returns:
+            Dictionary with hits, misses, entries and stored bytes
+        """
+        try:
+            with self._connect() as conn:
+                self._flush_stats(conn)
+                counters = dict(conn.execute("SELECT name, value FROM stats"))
+                entries, size = conn.execute(
+                    "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries"
+                ).fetchone()
+        except sqlite3.Error as e:
+            print(f"Cache stats error: {e}")
+            return {"hits": 0, "misses": 0, "entries": 0, "bytes": 0}
+
+        return {
+            "hits": counters.get("hits", 0),
+            "misses": counters.get("misses", 0),
+            "entries": entries,
+            "bytes": size,
+        }
+
+    def clear(self) -> None:
+        """Remove every entry and reset the counters"""
+        try:
+            with self._connect() as conn:
+                conn.execute("DELETE FROM entries")
+                conn.execute("UPDATE stats SET value = 0")
+            with self._pending_lock:
+                self._pending = {"hits": 0, "misses": 0}
+        except sqlite3.Error as e:
+            print(f"Cache clear error: {e}")
@@ -1,56 +1,38 @@
 """AI API integration for resume analysis - Supports Gemini and Groq"""
 
 import os
+import functools
 import json
 import re
-from typing import Optional, Dict, Any
+import threading
+from typing import Any, Callable, Dict, Iterable, Optional
+import httpx
 from google import genai
 from google.genai import types
 import time
 
+from .client_pool import ClientPool
+from .prompt_compaction import PROMPT_TOKEN_BUDGET, compact_prompt_inputs
+from .response_cache import cached_response
+from .skill_taxonomy import normalize_analysis_keywords
+from .streaming_json import StreamingJSONParser
 
-def initialize_gemini(api_key: str):
-    """
-    Initialize Gemini API with provided key.
-
-    Args:
-        api_key: Google Gemini API key
-    """
-    return genai.Client(api_key=api_key)
-
+GROQ_MODEL_ID = "llama-3.3-70b-versatile"  # Fast and accurate
+GEMINI_MODEL_ID = "models/gemini-1.5-flash"  # Full model path required
 
-def initialize_groq(api_key: str):
-    """
-    Initialize Groq API with provided key.
-
-    Args:
-        api_key: Groq API key
-    """
-    from groq import Groq
-
-    return Groq(api_key=api_key)
-
-
-def analyze_resume_with_groq(
-    resume_text: str, job_description: str, api_key: str, max_retries: int = 3
-) -> Optional[Dict[str, Any]]:
-    """
-    Analyze resume against job description using Groq API.
+# Receives (key, value) for each top-level field of a streamed analysis
+FieldCallback = Callable[[str, Any], None]
 
-    Args:
-        resume_text: Extracted text from resume
-        job_description: Job description text
-        api_key: Groq API key
-        max_retries: Maximum number of retry attempts
+# Key passed to a FieldCallback, with value None, when a failed attempt is
+# retried: the fields received so far are void and are all sent again
+STREAM_RESTART = "__restart__"
 
-    Returns:
-        Dictionary containing analysis results or None if failed
-    """
-    try:
-        client = initialize_groq(api_key)
-        model_id = "llama-3.3-70b-versatile"  # Fast and accurate
+# Version of ANALYSIS_PROMPT, of how inputs are compacted into it, and of the
+# result format; cached responses from other versions are ignored, so bump it
+# whenever any of them changes
+PROMPT_VERSION = 2
 
-        prompt = f"""You are an expert ATS (Applicant Tracking System) and resume analyst. Analyze the following resume against the job description and provide a comprehensive analysis.
+ANALYSIS_PROMPT = """You are an expert ATS (Applicant Tracking System) and resume analyst. Analyze the following resume against the job description and provide a comprehensive analysis.
 
 Resume:
 {resume_text}
@@ -95,56 +77,249 @@ Provide your analysis in the following JSON format (respond ONLY with valid JSON
 
 Be specific and actionable in your suggestions. Focus on what's actually present or missing in the resume compared to the job description."""
 
-        for attempt in range(max_retries):
-            try:
-                response = client.chat.completions.create(
-                    model=model_id,
-                    messages=[{"role": "user", "content": prompt}],
-                    temperature=0.3,
-                    max_tokens=4096,
-                )
 
-                if not response or not response.choices:
-                    if attempt < max_retries - 1:
-                        time.sleep(2**attempt)
-                        continue
-                    return None
+def build_analysis_prompt(resume_text: str, job_description: str) -> str:
+    """
+    Fill the analysis prompt template with a resume and job description,
+    compacted to PROMPT_TOKEN_BUDGET (see compact_prompt_inputs)
+    """
+    resume_text, job_description = compact_prompt_inputs(resume_text, job_description)
+    return ANALYSIS_PROMPT.format(
+        resume_text=resume_text, job_description=job_description
+    )
+
 
-                response_text = response.choices[0].message.content.strip()
+# API calls in flight per provider, across every session in the process;
+# further calls wait for a free slot
+PROVIDER_MAX_CONCURRENCY = int(os.getenv("AI_MAX_CONCURRENCY", "3"))
 
-                # Extract JSON from response
-                json_match = re.search(r"\{[\s\S]*\}", response_text)
-                if json_match:
-                    json_str = json_match.group()
-                    result = json.loads(json_str)
+_provider_slots = {
+    provider: threading.BoundedSemaphore(PROVIDER_MAX_CONCURRENCY)
+    for provider in ("groq", "gemini")
+}
 
-                    # Add match rating
-                    result["match_rating"] = get_match_rating(
-                        result.get("match_score", 0)
+
+def limit_concurrency(provider: str):
+    """Decorate an API-calling function to hold one of the provider's slots"""
+
+    def decorator(analyze):
+        @functools.wraps(analyze)
+        def wrapper(*args, **kwargs):
+            with _provider_slots[provider]:
+                return analyze(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def _restore_match_rating(result: Dict[str, Any]) -> None:
+    """Turn a cached match_rating back into the (text, color) tuple"""
+    if "match_rating" in result:
+        result["match_rating"] = get_match_rating(result.get("match_score", 0))
+
+
+# Seconds an idle HTTP connection to a provider stays open for the next call
+CLIENT_KEEPALIVE_SECONDS = float(os.getenv("AI_CLIENT_KEEPALIVE_SECONDS", "120"))
+
+
+def _connection_limits() -> httpx.Limits:
+    """Keep one connection alive per concurrent call, longer than httpx's 5s"""
+    return httpx.Limits(
+        max_connections=100,
+        max_keepalive_connections=PROVIDER_MAX_CONCURRENCY,
+        keepalive_expiry=CLIENT_KEEPALIVE_SECONDS,
+    )
+
+
+def initialize_gemini(api_key: str):
+    """
+    Initialize Gemini API with provided key.
+
+    Analyses get the client from CLIENT_POOL instead of building one per call.
+
+    Args:
+        api_key: Google Gemini API key
+    """
+    return genai.Client(
+        api_key=api_key,
+        http_options=types.HttpOptions(client_args={"limits": _connection_limits()}),
+    )
+
+
+def initialize_groq(api_key: str):
+    """
+    Initialize Groq API with provided key.
+
+    Analyses get the client from CLIENT_POOL instead of building one per call.
+
+    Args:
+        api_key: Groq API key
+    """
+    from groq import DefaultHttpxClient, Groq
+
+    return Groq(
+        api_key=api_key,
+        http_client=DefaultHttpxClient(limits=_connection_limits()),
+    )
+
+
+def _gemini_client_is_open(client) -> bool:
+    # The SDK doesn't expose whether the client was closed
+    http_client = getattr(getattr(client, "_api_client", None), "_httpx_client", None)
+    return http_client is None or not http_client.is_closed
+
+
+CLIENT_POOL = ClientPool()
+CLIENT_POOL.register("gemini", initialize_gemini, _gemini_client_is_open)
+CLIENT_POOL.register("groq", initialize_groq, lambda client: not client.is_closed())
+
+
+def _stream_fields(chunks: Iterable[Optional[str]], on_field: FieldCallback) -> str:
+    """Join streamed response text, passing on each JSON field as it completes"""
+    parser = StreamingJSONParser()
+    parts = []
+    for chunk in chunks:
+        if chunk:
+            parts.append(chunk)
+            for key, value in parser.feed(chunk):
+                on_field(key, value)
+    return "".join(parts)
+
+
+def _groq_response_text(
+    client, model_id: str, prompt: str, on_field: Optional[FieldCallback]
+) -> Optional[str]:
+    """Text of Groq's reply, streamed if on_field is given"""
+    request = {
+        "model": model_id,
+        "messages": [{"role": "user", "content": prompt}],
+        "temperature": 0.3,
+        "max_tokens": 4096,
+    }
+    if on_field is None:
+        response = client.chat.completions.create(**request)
+        if not response or not response.choices:
+            return None
+        return response.choices[0].message.content
+
+    stream = client.chat.completions.create(stream=True, **request)
+    return _stream_fields(
+        (chunk.choices[0].delta.content for chunk in stream if chunk.choices),
+        on_field,
+    )
+
+
+def _gemini_response_text(
+    client, model_id: str, prompt: str, on_field: Optional[FieldCallback]
+) -> Optional[str]:
+    """Text of Gemini's reply, streamed if on_field is given"""
+    if on_field is None:
+        response = client.models.generate_content(model=model_id, contents=prompt)
+        return response.text if response else None
+
+    stream = client.models.generate_content_stream(model=model_id, contents=prompt)
+    return _stream_fields((chunk.text for chunk in stream), on_field)
+
+
+@cached_response(
+    "groq",
+    GROQ_MODEL_ID,
+    PROMPT_VERSION,
+    _restore_match_rating,
+    token_budget=PROMPT_TOKEN_BUDGET,
+)
+@limit_concurrency("groq")
+def analyze_resume_with_groq(
+    resume_text: str,
+    job_description: str,
+    api_key: str,
+    max_retries: int = 3,
+    on_field: Optional[FieldCallback] = None,
+) -> Optional[Dict[str, Any]]:
+    """
+    Analyze resume against job description using Groq API.
+
+    Args:
+        resume_text: Extracted text from resume
+        job_description: Job description text
+        api_key: Groq API key
+        max_retries: Maximum number of retry attempts
+        on_field: If given, the response is streamed and on_field(key, value)
+            is called as each top-level field of the result arrives (raw,
+            before normalization). A retry first calls
+            on_field(STREAM_RESTART, None), then sends every field again.
+            Cached results are returned without calling it.
+
+    Returns:
+        Dictionary containing analysis results or None if failed
+    """
+    try:
+        model_id = GROQ_MODEL_ID
+
+        prompt = build_analysis_prompt(resume_text, job_description)
+
+        with CLIENT_POOL.lease("groq", api_key) as client:
+            for attempt in range(max_retries):
+                if attempt and on_field is not None:
+                    on_field(STREAM_RESTART, None)
+                try:
+                    response_text = _groq_response_text(
+                        client, model_id, prompt, on_field
                     )
 
-                    return result
-                elif attempt < max_retries - 1:
-                    time.sleep(2**attempt)
-                    continue
-                else:
-                    return None
+                    if not response_text:
+                        if attempt < max_retries - 1:
+                            time.sleep(2**attempt)
+                            continue
+                        return None
 
-            except Exception as e:
-                print(f"Error in Groq API call (attempt {attempt + 1}): {str(e)}")
-                if attempt < max_retries - 1:
-                    time.sleep(2**attempt)
-                    continue
-                else:
-                    return None
+                    response_text = response_text.strip()
+
+                    # Extract JSON from response
+                    json_match = re.search(r"\{[\s\S]*\}", response_text)
+                    if json_match:
+                        json_str = json_match.group()
+                        result = json.loads(json_str)
+
+                        # Merge aliases and duplicates ("JS" / "JavaScript")
+                        normalize_analysis_keywords(result)
+
+                        # Add match rating
+                        result["match_rating"] = get_match_rating(
+                            result.get("match_score", 0)
+                        )
+
+                        return result
+                    elif attempt < max_retries - 1:
+                        time.sleep(2**attempt)
+                        continue
+                    else:
+                        return None
+
+                except Exception as e:
+                    print(f"Error in Groq API call (attempt {attempt + 1}): {str(e)}")
+                    if attempt < max_retries - 1:
+                        time.sleep(2**attempt)
+                        continue
+                    else:
+                        return None
 
     except Exception as e:
         print(f"Fatal error in Groq analysis: {str(e)}")
         return None
 
 
+@cached_response(
+    "gemini", GEMINI_MODEL_ID, PROMPT_VERSION, token_budget=PROMPT_TOKEN_BUDGET
+)
+@limit_concurrency("gemini")
 def analyze_resume_with_gemini(
-    resume_text: str, job_description: str, api_key: str, max_retries: int = 3
+    resume_text: str,
+    job_description: str,
+    api_key: str,
+    max_retries: int = 3,
+    on_field: Optional[FieldCallback] = None,
 ) -> Optional[Dict[str, Any]]:
     """
     Analyze resume against job description using Gemini API.
@@ -154,119 +329,86 @@ def analyze_resume_with_gemini(
         job_description: Job description text
         api_key: Gemini API key
         max_retries: Maximum number of retry attempts
+        on_field: If given, the response is streamed and on_field(key, value)
+            is called as each top-level field of the result arrives (raw,
+            before normalization). A retry first calls
+            on_field(STREAM_RESTART, None), then sends every field again.
+            Cached results are returned without calling it.
 
     Returns:
         Dictionary containing analysis results or None if failed
     """
     try:
-        client = initialize_gemini(api_key)
-        model_id = "models/gemini-1.5-flash"  # Full model path required
+        model_id = GEMINI_MODEL_ID
 
-        prompt = f"""You are an expert ATS (Applicant Tracking System) and resume analyst. Analyze the following resume against the job description and provide a comprehensive analysis.
+        prompt = build_analysis_prompt(resume_text, job_description)
 
-Resume:
-{resume_text}
-
-Job Description:
-{job_description}
+        with CLIENT_POOL.lease("gemini", api_key) as client:
+            for attempt in range(max_retries):
+                if attempt and on_field is not None:
+                    on_field(STREAM_RESTART, None)
+                try:
+                    response_text = _gemini_response_text(
+                        client, model_id, prompt, on_field
+                    )
 
-Provide your analysis in the following JSON format (respond ONLY with valid JSON, no additional text):
-{{
-    "match_score": <number between 0-100>,
-    "match_reasoning": "<brief explanation of the score>",
-    "found_keywords": {{
-        "technical_skills": ["skill1", "skill2"],
-        "soft_skills": ["skill1", "skill2"],
-        "experience_keywords": ["keyword1", "keyword2"],
-        "education_keywords": ["keyword1", "keyword2"]
-    }},
-    "missing_keywords": {{
-        "critical_technical_skills": ["skill1", "skill2"],
-        "important_soft_skills": ["skill1", "skill2"],
-        "experience_gaps": ["gap1", "gap2"],
-        "education_gaps": ["gap1", "gap2"]
-    }},
-    "suggestions": [
-        "Specific actionable suggestion 1",
-        "Specific actionable suggestion 2",
-        "Specific actionable suggestion 3",
-        "Specific actionable suggestion 4",
-        "Specific actionable suggestion 5"
-    ],
-    "ats_optimization_tips": [
-        "ATS tip 1",
-        "ATS tip 2",
-        "ATS tip 3"
-    ],
-    "strengths": [
-        "Key strength 1",
-        "Key strength 2",
-        "Key strength 3"
-    ]
-}}
+                    if not response_text:
+                        if attempt < max_retries - 1:
+                            time.sleep(2**attempt)  # Exponential backoff
+                            continue
+                        return None
+
+                    # Extract JSON from response
+                    response_text = response_text.strip()
+
+                    # Try to find JSON in the response (in case there's extra text)
+                    json_match = re.search(r"\{.*\}", response_text, re.DOTALL)
+                    if json_match:
+                        response_text = json_match.group(0)
+
+                    analysis_result = json.loads(response_text)
+
+                    # Validate the structure
+                    required_keys = [
+                        "match_score",
+                        "found_keywords",
+                        "missing_keywords",
+                        "suggestions",
+                    ]
+                    if not all(key in analysis_result for key in required_keys):
+                        if attempt < max_retries - 1:
+                            time.sleep(2**attempt)
+                            continue
+                        return None
+
+                    # Ensure match_score is within range
+                    if not isinstance(analysis_result["match_score"], (int, float)):
+                        analysis_result["match_score"] = 50
+
+                    analysis_result["match_score"] = max(
+                        0, min(100, analysis_result["match_score"])
+                    )
 
-Be specific and actionable in your suggestions. Focus on what's actually present or missing in the resume compared to the job description."""
+                    # Merge aliases and duplicates ("JS" / "JavaScript")
+                    normalize_analysis_keywords(analysis_result)
 
-        for attempt in range(max_retries):
-            try:
-                response = client.models.generate_content(
-                    model=model_id, contents=prompt
-                )
+                    return analysis_result
 
-                if not response or not response.text:
+                except json.JSONDecodeError as e:
+                    print(f"JSON decode error (attempt {attempt + 1}): {e}")
                     if attempt < max_retries - 1:
-                        time.sleep(2**attempt)  # Exponential backoff
+                        time.sleep(2**attempt)
                         continue
                     return None
 
-                # Extract JSON from response
-                response_text = response.text.strip()
-
-                # Try to find JSON in the response (in case there's extra text)
-                json_match = re.search(r"\{.*\}", response_text, re.DOTALL)
-                if json_match:
-                    response_text = json_match.group(0)
-
-                analysis_result = json.loads(response_text)
-
-                # Validate the structure
-                required_keys = [
-                    "match_score",
-                    "found_keywords",
-                    "missing_keywords",
-                    "suggestions",
-                ]
-                if not all(key in analysis_result for key in required_keys):
+                except Exception as e:
+                    print(f"Error in API call (attempt {attempt + 1}): {e}")
                     if attempt < max_retries - 1:
                         time.sleep(2**attempt)
                         continue
                     return None
 
-                # Ensure match_score is within range
-                if not isinstance(analysis_result["match_score"], (int, float)):
-                    analysis_result["match_score"] = 50
-
-                analysis_result["match_score"] = max(
-                    0, min(100, analysis_result["match_score"])
-                )
-
-                return analysis_result
-
-            except json.JSONDecodeError as e:
-                print(f"JSON decode error (attempt {attempt + 1}): {e}")
-                if attempt < max_retries - 1:
-                    time.sleep(2**attempt)
-                    continue
-                return None
-
-            except Exception as e:
-                print(f"Error in API call (attempt {attempt + 1}): {e}")
-                if attempt < max_retries - 1:
-                    time.sleep(2**attempt)
-                    continue
-                return None
-
-        return None
+            return None
 
     except Exception as e:
         print(f"Error initializing Gemini or making request: {e}")
@@ -0,0 +1,166 @@
+"""Word and phrase dictionaries matched with a token-level Aho-Corasick automaton"""
+
+import re
+from collections import Counter, deque
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+_TERM_TOKEN_RE = re.compile(r"\w+")
+
+
+class LexiconHit(NamedTuple):
+    # Term as registered (lowercase, tokens joined by single spaces)
+    term: str
+    # Character offsets of the match in the scanned text
+    start: int
+    end: int
+
+
+def normalize_term(term: str) -> Tuple[str, ...]:
+    """Tokenize a term the same way ResumeDocument tokenizes text"""
+    return tuple(token.lower() for token in _TERM_TOKEN_RE.findall(term))
+
+
+def load_terms(path: str) -> List[str]:
+    """
+    Read a lexicon file: one term per line, blank lines and # comments ignored.
+
+    Args:
+        path: Path to a UTF-8 text file
+
+    Returns:
+        List of terms
+    """
+    terms = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.split("#", 1)[0].strip()
+            if line:
+                terms.append(line)
+    return terms
+
+
+class LexiconMatcher:
+    """
+    Several named lexicons compiled into one Aho-Corasick automaton.
+
+    The automaton runs over a document's token stream, so single words and
+    multi-word phrases from every lexicon are found in one linear pass no
+    matter how many terms are loaded. A term may belong to several lexicons.
+    """
+
+    def __init__(self):
+        # token tuple -> names of the lexicons containing it
+        self._terms: Dict[Tuple[str, ...], set] = {}
+        self._lexicons: Dict[str, int] = {}
+        self._automaton = None
+        # Bumped on every change, so cached scan results are recomputed
+        self.version = 0
+
+    def add_lexicon(self, name: str, terms: Iterable[str]) -> None:
+        """
+        Add terms to a lexicon, creating it if needed.
+
+        Args:
+            name: Lexicon name, used as the key in scan results
+            terms: Words or phrases; matching is case-insensitive and
+                punctuation is ignored, so "Node.js" matches "node js" and
+                "C++" matches a bare "C"
+        """
+        added = 0
+        for term in terms:
+            tokens = normalize_term(term)
+            if tokens:
+                self._terms.setdefault(tokens, set()).add(name)
+                added += 1
+        self._lexicons[name] = self._lexicons.get(name, 0) + added
+        self._automaton = None
+        self.version += 1
+
+    def load_lexicon(self, name: str, path: str) -> None:
+        """Add every term in a lexicon file (see load_terms) to a lexicon"""
+        self.add_lexicon(name, load_terms(path))
+
+    @property
+    def lexicons(self) -> List[str]:
+        return list(self._lexicons)
+
+    def _compile(self):
+        """Build goto, failure and output tables, breadth-first"""
+        if self._automaton is not None:
+            return self._automaton
+
+        goto: List[Dict[str, int]] = [{}]
+        outputs: List[List[Tuple[str, str, int]]] = [[]]
+        for tokens, names in self._terms.items():
+            state = 0
+            for token in tokens:
+                next_state = goto[state].get(token)
+                if next_state is None:
+                    next_state = len(goto)
+                    goto[state][token] = next_state
+                    goto.append({})
+                    outputs.append([])
+                state = next_state
+            term = " ".join(tokens)
+            outputs[state].extend((name, term, len(tokens)) for name in sorted(names))
+
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for token, next_state in goto[state].items():
+                queue.append(next_state)
+                fallback = fail[state]
+                while fallback and token not in goto[fallback]:
+                    fallback = fail[fallback]
+                fail[next_state] = goto[fallback].get(token, 0)
+                # Phrases ending here also end every suffix phrase
+                outputs[next_state] = outputs[next_state] + outputs[fail[next_state]]
+
+        self._automaton = (goto, fail, outputs)
+        return self._automaton
+
+    def scan(
+        self,
+        tokens: List[str],
+        token_spans: Optional[List[Tuple[int, int]]] = None,
+    ) -> Dict[str, List[LexiconHit]]:
+        """
+        Find every lexicon term in a token stream.
+
+        Args:
+            tokens: Lowercase tokens, as ResumeDocument.tokens
+            token_spans: Character offsets of each token; without them hits
+                carry token indices instead
+
+        Returns:
+            Dictionary mapping each lexicon name to its hits in text order.
+            Overlapping phrases are all reported.
+        """
+        goto, fail, outputs = self._compile()
+        results: Dict[str, List[LexiconHit]] = {name: [] for name in self._lexicons}
+
+        state = 0
+        for index, token in enumerate(tokens):
+            while state and token not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(token, 0)
+            for name, term, length in outputs[state]:
+                first = index - length + 1
+                if token_spans is None:
+                    results[name].append(LexiconHit(term, first, index + 1))
+                else:
+                    results[name].append(
+                        LexiconHit(term, token_spans[first][0], token_spans[index][1])
+                    )
+
+        return results
+
+    def scan_document(self, doc) -> Dict[str, List[LexiconHit]]:
+        """Scan a ResumeDocument's tokens; hits carry character offsets"""
+        return self.scan(doc.tokens, doc.token_spans)
+
+
+def term_counts(hits: List[LexiconHit]) -> Counter:
+    """Count hits per term"""
+    return Counter(hit.term for hit in hits)
@@ -0,0 +1,504 @@
+"""Deterministic local keyword match scoring, without an AI provider"""
+
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple, Union
+
+from .gemini_analyzer import get_match_rating
+from .lexicon import LexiconMatcher, normalize_term
+from .relevance import extract_terms
+from .resume_analyzer import STOPWORDS
+from .resume_document import ResumeDocument, as_document
+from .skill_taxonomy import get_skill_taxonomy
+
+# Degrees and fields of study; skills and certifications come from the
+# skill taxonomy
+EDUCATION_KEYWORDS = frozenset(
+    {
+        "Bachelor",
+        "Master",
+        "PhD",
+        "Doctorate",
+        "Degree",
+        "BSc",
+        "MSc",
+        "MBA",
+        "Computer Science",
+        "Software Engineering",
+        "Electrical Engineering",
+        "Mathematics",
+        "Physics",
+        "Economics",
+    }
+)
+
+# Words every job description uses; they never count as experience keywords
+JD_BOILERPLATE = frozenset(
+    {
+        "ability",
+        "able",
+        "candidate",
+        "company",
+        "developer",
+        "developers",
+        "engineer",
+        "engineers",
+        "experience",
+        "including",
+        "job",
+        "join",
+        "knowledge",
+        "looking",
+        "opportunity",
+        "our",
+        "plus",
+        "preferred",
+        "qualifications",
+        "required",
+        "requirements",
+        "responsibilities",
+        "role",
+        "skills",
+        "strong",
+        "team",
+        "understanding",
+        "work",
+        "working",
+        "years",
+        "you",
+        "your",
+    }
+)
+
+# Everyday English that STOPWORDS leaves out: pronouns, determiners,
+# prepositions and the verbs and adverbs job descriptions are written in.
+# Like JD_BOILERPLATE, these never count as experience keywords, alone or in
+# a phrase.
+COMMON_WORDS = frozenset(
+    {
+        "about",
+        "above",
+        "across",
+        "after",
+        "again",
+        "against",
+        "all",
+        "also",
+        "am",
+        "any",
+        "anyone",
+        "around",
+        "because",
+        "before",
+        "being",
+        "below",
+        "between",
+        "both",
+        "build",
+        "building",
+        "builds",
+        "built",
+        "daily",
+        "day",
+        "each",
+        "either",
+        "else",
+        "enjoy",
+        "enjoys",
+        "ensure",
+        "etc",
+        "ever",
+        "every",
+        "everyone",
+        "few",
+        "further",
+        "get",
+        "gets",
+        "getting",
+        "give",
+        "go",
+        "going",
+        "great",
+        "help",
+        "helping",
+        "helps",
+        "her",
+        "here",
+        "hers",
+        "him",
+        "hire",
+        "hiring",
+        "his",
+        "how",
+        "however",
+        "if",
+        "into",
+        "it",
+        "its",
+        "itself",
+        "just",
+        "keep",
+        "know",
+        "like",
+        "love",
+        "make",
+        "makes",
+        "making",
+        "many",
+        "me",
+        "more",
+        "most",
+        "much",
+        "my",
+        "need",
+        "needed",
+        "needs",
+        "new",
+        "no",
+        "nor",
+        "not",
+        "now",
+        "off",
+        "often",
+        "once",
+        "one",
+        "only",
+        "other",
+        "others",
+        "ours",
+        "out",
+        "over",
+        "own",
+        "per",
+        "really",
+        "same",
+        "seek",
+        "seeking",
+        "she",
+        "ship",
+        "shipped",
+        "ships",
+        "so",
+        "some",
+        "someone",
+        "something",
+        "such",
+        "take",
+        "than",
+        "their",
+        "theirs",
+        "them",
+        "then",
+        "there",
+        "they",
+        "thing",
+        "things",
+        "thrive",
+        "through",
+        "too",
+        "under",
+        "until",
+        "up",
+        "upon",
+        "us",
+        "use",
+        "used",
+        "using",
+        "very",
+        "want",
+        "wants",
+        "we",
+        "well",
+        "what",
+        "when",
+        "where",
+        "whether",
+        "which",
+        "while",
+        "who",
+        "whom",
+        "whose",
+        "why",
+        "within",
+        "without",
+        "yet",
+    }
+)
+
+# Share of the match score carried by each keyword category. Categories the
+# job description doesn't mention are left out and the rest rescaled.
+LOCAL_SCORE_WEIGHTS = {
+    "technical_skills": 0.5,
+    "soft_skills": 0.15,
+    "experience_keywords": 0.25,
+    "education_keywords": 0.1,
+}
+
+# How many of the job description's most frequent other terms are checked as
+# experience keywords
+EXPERIENCE_TERM_LIMIT = 15
+
+# Skill taxonomy category -> keyword category of the analysis result
+TAXONOMY_CATEGORIES = {
+    "technical": "technical_skills",
+    "tool": "technical_skills",
+    "soft": "soft_skills",
+    "certification": "education_keywords",
+}
+
+# Found category -> missing category, as in the AI analysis result
+_MISSING_KEYS = {
+    "technical_skills": "critical_technical_skills",
+    "soft_skills": "important_soft_skills",
+    "experience_keywords": "experience_gaps",
+    "education_keywords": "education_gaps",
+}
+
+
+@lru_cache(maxsize=None)
+def skill_matcher() -> Tuple[LexiconMatcher, Dict[str, str]]:
+    """
+    Build the lexicons of every keyword category, once per process.
+
+    Returns:
+        LexiconMatcher with one lexicon per found_keywords category, and a
+        dictionary of matched term -> canonical name ("k8s" -> "Kubernetes")
+    """
+    matcher = LexiconMatcher()
+    canonical_names = {}
+    for alias, skill in get_skill_taxonomy().aliases(scannable_only=True):
+        category = TAXONOMY_CATEGORIES[skill.category]
+        matcher.add_lexicon(category, [alias])
+        canonical_names[" ".join(normalize_term(alias))] = skill.name
+    matcher.add_lexicon("education_keywords", EDUCATION_KEYWORDS)
+    for term in EDUCATION_KEYWORDS:
+        canonical_names.setdefault(" ".join(normalize_term(term)), term)
+    return matcher, canonical_names
+
+
+def _lexicon_terms(doc: ResumeDocument) -> Dict[str, List[str]]:
+    """Distinct canonical skills of each category in a document, in text order"""
+    matcher, canonical_names = skill_matcher()
+    return {
+        name: list(dict.fromkeys(canonical_names[hit.term] for hit in hits))
+        for name, hits in doc.matches(matcher).items()
+    }
+
+
+def _is_common(word: str) -> bool:
+    """Whether a word is too common to be an experience keyword"""
+    return word in STOPWORDS or word in COMMON_WORDS or word in JD_BOILERPLATE
+
+
+def _experience_terms(jd_doc: ResumeDocument, skill_terms: set) -> List[str]:
+    """The job description's most frequent terms that aren't dictionary skills"""
+    skill_words = {word for term in skill_terms for word in term.split()}
+    candidates = []
+    for term, count in extract_terms(jd_doc).items():
+        words = term.split()
+        if term in skill_terms or all(word in skill_words for word in words):
+            continue
+        # A phrase with a filtered word in it is prose, not a keyword
+        if any(_is_common(word) for word in words):
+            continue
+        if len(words) == 1 and len(term) < 4:
+            continue
+        candidates.append((term, count))
+
+    # Phrases before single words at equal frequency; then first occurrence
+    candidates.sort(key=lambda item: (-item[1], -len(item[0].split())))
+    return [term for term, _ in candidates[:EXPERIENCE_TERM_LIMIT]]
+
+
+def _has_term(term: str, vocabulary: set) -> bool:
+    """Whether a term, or its plural/singular form, is in a term vocabulary"""
+    if term in vocabulary:
+        return True
+    if term.endswith("s"):
+        return term[:-1] in vocabulary
+    return term + "s" in vocabulary
+
+
+def score_locally(
+    resume: Union[str, ResumeDocument],
+    job_description: Union[str, ResumeDocument],
+    weights: Optional[Dict[str, float]] = None,
+) -> Dict[str, any]:
+    """
+    Score a resume against a job description without calling an AI provider.
+
+    Technical skills, soft skills and certifications come from the skill
+    taxonomy, with aliases resolved to canonical names ("k8s" counts as
+    Kubernetes), plus a list of degrees, all matched in one Aho-Corasick pass
+    per document. Experience keywords are the job description's most
+    frequent other terms. Each category scores the share of the job
+    description's terms found in the resume, and the match score is their
+    weighted average. The same inputs always give the same result, in a few
+    milliseconds.
+
+    Args:
+        resume: Resume text or ResumeDocument
+        job_description: Job description text or ResumeDocument
+        weights: Category weights; None for LOCAL_SCORE_WEIGHTS
+
+    Returns:
+        Dictionary with the same keys as the AI analysis (match_score,
+        match_reasoning, found_keywords, missing_keywords, suggestions,
+        ats_optimization_tips, strengths, match_rating) plus
+        category_scores and source ("local")
+    """
+    weights = weights or LOCAL_SCORE_WEIGHTS
+    resume_doc = as_document(resume)
+    jd_doc = as_document(job_description)
+
+    jd_terms = _lexicon_terms(jd_doc)
+    resume_terms = _lexicon_terms(resume_doc)
+    skill_terms = {
+        hit.term for hits in jd_doc.matches(skill_matcher()[0]).values() for hit in hits
+    }
+    jd_terms["experience_keywords"] = _experience_terms(jd_doc, skill_terms)
+    resume_vocabulary = set(extract_terms(resume_doc))
+
+    found_keywords = {}
+    missing_keywords = {}
+    category_scores = {}
+    for category, missing_key in _MISSING_KEYS.items():
+        wanted = jd_terms[category]
+        if category == "experience_keywords":
+            found = [term for term in wanted if _has_term(term, resume_vocabulary)]
+        else:
+            present = set(resume_terms[category])
+            found = [term for term in wanted if term in present]
+        found_set = set(found)
+        found_keywords[category] = found
+        missing_keywords[missing_key] = [
+            term for term in wanted if term not in found_set
+        ]
+        if wanted:
+            category_scores[category] = round(len(found) / len(wanted) * 100, 1)
+
+    total_weight = sum(weights.get(category, 0) for category in category_scores)
+    match_score = (
+        round(
+            sum(
+                score * weights.get(category, 0)
+                for category, score in category_scores.items()
+            )
+            / total_weight
+        )
+        if total_weight
+        else 0
+    )
+
+    return {
+        "match_score": match_score,
+        "match_reasoning": _reasoning(category_scores, found_keywords, jd_terms),
+        "found_keywords": found_keywords,
+        "missing_keywords": missing_keywords,
+        "suggestions": _suggestions(missing_keywords),
+        "ats_optimization_tips": _ats_tips(missing_keywords, resume_doc),
+        "strengths": _strengths(found_keywords),
+        "match_rating": get_match_rating(match_score),
+        "category_scores": category_scores,
+        "source": "local",
+    }
+
+
+def _reasoning(
+    category_scores: Dict[str, float],
+    found_keywords: Dict[str, List[str]],
+    jd_terms: Dict[str, List[str]],
+) -> str:
+    if not category_scores:
+        return (
+            "No recognizable skills or requirements were found in the job description."
+        )
+
+    labels = {
+        "technical_skills": "technical skills",
+        "soft_skills": "soft skills",
+        "experience_keywords": "experience keywords",
+        "education_keywords": "education requirements",
+    }
+    parts = [
+        f"{len(found_keywords[category])} of {len(jd_terms[category])} "
+        f"{labels[category]}"
+        for category in category_scores
+    ]
+    return (
+        "Local keyword match (no AI): the resume covers "
+        + ", ".join(parts)
+        + " named in the job description."
+    )
+
+
+def _suggestions(missing_keywords: Dict[str, List[str]]) -> List[str]:
+    suggestions = []
+    technical = missing_keywords["critical_technical_skills"]
+    if technical:
+        suggestions.append(
+            "Add evidence of these required technical skills if you have them: "
+            + ", ".join(technical[:8])
+        )
+    soft = missing_keywords["important_soft_skills"]
+    if soft:
+        suggestions.append(
+            "Show these soft skills through concrete achievements: "
+            + ", ".join(soft[:5])
+        )
+    experience = missing_keywords["experience_gaps"]
+    if experience:
+        suggestions.append(
+            "Mirror the job description's wording where it matches your experience: "
+            + ", ".join(experience[:8])
+        )
+    education = missing_keywords["education_gaps"]
+    if education:
+        suggestions.append(
+            "Make sure your education section states: " + ", ".join(education[:5])
+        )
+    if not suggestions:
+        suggestions.append(
+            "Your resume already covers the job description's keywords; "
+            "focus on quantifying your impact."
+        )
+    return suggestions
+
+
+def _ats_tips(
+    missing_keywords: Dict[str, List[str]], resume_doc: ResumeDocument
+) -> List[str]:
+    tips = [
+        "Use the exact skill names from the job description; ATS keyword "
+        "matching is often literal."
+    ]
+    if missing_keywords["critical_technical_skills"]:
+        tips.append(
+            "List your tools and technologies in a dedicated Skills section "
+            "so they are parsed reliably."
+        )
+    if len(resume_doc.words) < 300:
+        tips.append(
+            "Your resume is short; more detail on your experience gives an ATS "
+            "more keywords to match."
+        )
+    return tips
+
+
+def _strengths(found_keywords: Dict[str, List[str]]) -> List[str]:
+    strengths = []
+    if found_keywords["technical_skills"]:
+        strengths.append(
+            "Matches required technical skills: "
+            + ", ".join(found_keywords["technical_skills"][:8])
+        )
+    if found_keywords["soft_skills"]:
+        strengths.append(
+            "Shows requested soft skills: "
+            + ", ".join(found_keywords["soft_skills"][:5])
+        )
+    if found_keywords["experience_keywords"]:
+        strengths.append(
+            "Uses the job description's language: "
+            + ", ".join(found_keywords["experience_keywords"][:8])
+        )
+    return strengths
@@ -0,0 +1,252 @@
+"""Near-duplicate detection with rolling-hash shingles, MinHash and LSH banding"""
+
+import zlib
+from collections import defaultdict
+from itertools import combinations
+from typing import Dict, Hashable, Iterable, Iterator, List, NamedTuple, Tuple
+
+import numpy as np
+
+# Modulus for rolling shingle hashes (Mersenne prime 2^61 - 1)
+_ROLLING_MOD = (1 << 61) - 1
+_ROLLING_BASE = 1_000_003
+
+# MinHash works in the field of this Mersenne prime (2^31 - 1), so a * x + b
+# fits in uint64 without overflow
+_MINHASH_PRIME = (1 << 31) - 1
+
+
+def token_hash(token: str) -> int:
+    """Stable 32-bit hash of a token (str hashes are randomized per process)"""
+    return zlib.crc32(token.encode("utf-8"))
+
+
+def rolling_shingles(token_hashes: List[int], size: int) -> Iterator[int]:
+    """
+    Hash every window of `size` consecutive tokens in O(n).
+
+    Each window's hash is derived from the previous one, so no window is
+    materialized as a string.
+
+    Args:
+        token_hashes: Per-token hashes, as token_hash
+        size: Window size in tokens
+
+    Yields:
+        One hash per window, in order
+    """
+    if len(token_hashes) < size:
+        return
+
+    drop_factor = pow(_ROLLING_BASE, size - 1, _ROLLING_MOD)
+    value = 0
+    for index, token_value in enumerate(token_hashes):
+        if index >= size:
+            value = (value - token_hashes[index - size] * drop_factor) % _ROLLING_MOD
+        value = (value * _ROLLING_BASE + token_value) % _ROLLING_MOD
+        if index >= size - 1:
+            yield value
+
+
+class MinHasher:
+    """Fixed-size MinHash signatures from sets of shingle hashes"""
+
+    def __init__(self, num_perm: int = 64, seed: int = 1):
+        rng = np.random.default_rng(seed)
+        self.num_perm = num_perm
+        self._a = rng.integers(1, _MINHASH_PRIME, size=(num_perm, 1), dtype=np.uint64)
+        self._b = rng.integers(0, _MINHASH_PRIME, size=(num_perm, 1), dtype=np.uint64)
+
+    def signature(self, shingles: Iterable[int]) -> np.ndarray:
+        """
+        Compute the MinHash signature of a shingle set.
+
+        Args:
+            shingles: Shingle hashes
+
+        Returns:
+            uint32 array of num_perm minimum hash values
+        """
+        values = np.fromiter(
+            {shingle % _MINHASH_PRIME for shingle in shingles}, dtype=np.uint64
+        )
+        if values.size == 0:
+            return np.full(self.num_perm, _MINHASH_PRIME, dtype=np.uint32)
+        hashed = (self._a * values + self._b) % _MINHASH_PRIME
+        return hashed.min(axis=1).astype(np.uint32)
+
+
+class NearDuplicate(NamedTuple):
+    first: Hashable
+    second: Hashable
+    # Estimated Jaccard similarity of the two shingle sets
+    similarity: float
+
+
+class NearDuplicateIndex:
+    """
+    LSH index of MinHash signatures for finding similar text units.
+
+    Units (sentences, bullets) are added under any hashable key, e.g.
+    (resume_name, sentence_index). Each unit costs one fixed-size signature
+    plus one bucket entry per band, however long its text is, and finding
+    candidates only compares units that share a band bucket. Within a bucket,
+    units are compared with at most max_bucket_size representatives, so a
+    batch full of one template stays linear instead of quadratic.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.6,
+        num_perm: int = 64,
+        bands: int = 16,
+        shingle_size: int = 3,
+        seed: int = 1,
+        max_bucket_size: int = 16,
+    ):
+        """
+        Args:
+            threshold: Minimum estimated Jaccard similarity to report
+            num_perm: MinHash signature length; must be divisible by bands
+            bands: LSH bands. More bands catch less similar pairs (more
+                candidates); the candidate threshold is about
+                (1 / bands) ** (bands / num_perm)
+            shingle_size: Tokens per shingle
+            seed: Seed for the MinHash permutations
+            max_bucket_size: Representatives compared per LSH bucket
+        """
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.threshold = threshold
+        self.shingle_size = shingle_size
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.max_bucket_size = max_bucket_size
+        self.hasher = MinHasher(num_perm, seed)
+        self._ids: Dict[Hashable, int] = {}
+        self._keys: List[Hashable] = []
+        self._signatures: List[np.ndarray] = []
+        # (band, band rows) -> ids of the units in the bucket
+        self._buckets: Dict[Tuple[int, bytes], List[int]] = defaultdict(list)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def add(self, key: Hashable, tokens: List[str]) -> None:
+        """
+        Index one text unit.
+
+        Args:
+            key: Unique key for the unit
+            tokens: The unit's lowercase tokens; units shorter than the
+                shingle size are shingled as a whole
+        """
+        if key in self._ids:
+            raise ValueError(f"Key {key!r} is already indexed")
+
+        hashes = [token_hash(token) for token in tokens]
+        size = min(self.shingle_size, len(hashes)) or 1
+        signature = self.hasher.signature(rolling_shingles(hashes, size))
+
+        unit_id = len(self._keys)
+        self._ids[key] = unit_id
+        self._keys.append(key)
+        self._signatures.append(signature)
+
+        raw = signature.tobytes()
+        band_bytes = self.rows * signature.itemsize
+        for band in range(self.bands):
+            rows = raw[band * band_bytes : (band + 1) * band_bytes]
+            self._buckets[(band, rows)].append(unit_id)
+
+    def similarity(self, first: Hashable, second: Hashable) -> float:
+        """Estimated Jaccard similarity of two indexed units"""
+        first_signature = self._signatures[self._ids[first]]
+        second_signature = self._signatures[self._ids[second]]
+        return float(np.mean(first_signature == second_signature))
+
+    def near_duplicates(self) -> List[NearDuplicate]:
+        """
+        Find every pair of indexed units at or above the threshold.
+
+        Returns:
+            NearDuplicate pairs, most similar first
+        """
+        # Candidate pairs encoded as first * n + second (first < second)
+        n = len(self._keys)
+        candidates = set()
+        for unit_ids in self._buckets.values():
+            if len(unit_ids) < 2:
+                continue
+            representatives = unit_ids[: self.max_bucket_size]
+            candidates.update(a * n + b for a, b in combinations(representatives, 2))
+            for unit_id in unit_ids[self.max_bucket_size :]:
+                candidates.update(rep_id * n + unit_id for rep_id in representatives)
+
+        if not candidates:
+            return []
+
+        # Verify every candidate pair at once
+        first, second = np.divmod(
+            np.fromiter(candidates, dtype=np.int64, count=len(candidates)), n
+        )
+        signatures = np.stack(self._signatures)
+        similarities = (signatures[first] == signatures[second]).mean(axis=1)
+
+        keep = similarities >= self.threshold
+        first, second, similarities = first[keep], second[keep], similarities[keep]
+        order = np.lexsort((second, first, -similarities))
+
+        return [
+            NearDuplicate(self._keys[a], self._keys[b], round(sim, 2))
+            for a, b, sim in zip(
+                first[order].tolist(),
+                second[order].tolist(),
+                similarities[order].tolist(),
+            )
+        ]
+
+
+def repeated_phrases(
+    sentences: List[str], size: int = 5, min_chars: int = 21
+) -> List[Tuple[str, int]]:
+    """
+    Count phrases of `size` whitespace-separated words that occur more than once.
+
+    Windows are counted by rolling hash, so only repeated phrases are ever
+    built as strings.
+
+    Args:
+        sentences: Sentences to scan; phrases never span two sentences
+        size: Words per phrase
+        min_chars: Minimum phrase length in characters (words plus spaces)
+
+    Returns:
+        List of (lowercase phrase, count) in first-occurrence order
+    """
+    counts: Dict[int, int] = defaultdict(int)
+    first_seen: Dict[int, Tuple[int, int]] = {}
+
+    for sentence_index, sentence in enumerate(sentences):
+        words = sentence.lower().split()
+        if len(words) < size:
+            continue
+        lengths = [len(word) for word in words]
+        window_chars = sum(lengths[:size]) + size - 1
+
+        hashes = [token_hash(word) for word in words]
+        for start, shingle in enumerate(rolling_shingles(hashes, size)):
+            if start:
+                window_chars += lengths[start + size - 1] - lengths[start - 1]
+            if window_chars < min_chars:
+                continue
+            counts[shingle] += 1
+            first_seen.setdefault(shingle, (sentence_index, start))
+
+    repeated = []
+    for shingle, count in counts.items():
+        if count > 1:
+            sentence_index, start = first_seen[shingle]
+            words = sentences[sentence_index].lower().split()
+            repeated.append((" ".join(words[start : start + size]), count))
+    return repeated
@@ -0,0 +1,106 @@
+"""Precompiled regex scanners shared by the pattern-based analyzers"""
+
+import re
+from typing import Dict, List, NamedTuple, Optional
+
+
+class PatternMatch(NamedTuple):
+    start: int
+    end: int
+    text: str
+
+
+class _Scanner(NamedTuple):
+    regex: re.Pattern
+    first_only: bool
+
+
+class PatternEngine:
+    """
+    Named patterns compiled once and run together over a document.
+
+    A document is scanned once per engine (see ResumeDocument.matches) and
+    each analyzer reads its own matches from the result, so analyzers that
+    run several times per upload don't rescan the text.
+
+    Merging every pattern into a single alternation was measured to be
+    slower than separate scans with CPython's backtracking re, because every
+    alternative is still tried at every position. What makes the scans cheap
+    is the trigger: a character class that every match starts with, checked
+    as a lookahead so positions that can't start a match are rejected before
+    the full pattern is tried.
+    """
+
+    def __init__(self):
+        self._patterns: Dict[str, tuple] = {}
+        self._scanners: Optional[Dict[str, _Scanner]] = None
+        # Bumped on every change, so cached scan results are recomputed
+        self.version = 0
+
+    def add(
+        self,
+        name: str,
+        pattern: str,
+        flags: int = 0,
+        trigger: Optional[str] = None,
+        first_only: bool = False,
+    ) -> None:
+        """
+        Register a pattern.
+
+        Args:
+            name: Key for this pattern's matches in scan results
+            pattern: Regular expression; matches follow re.findall semantics
+            flags: re flags for this pattern
+            trigger: Character class every match starts with, e.g. r"[\\d(+]".
+                Must not exclude any real match start, or matches are lost.
+            first_only: Only the first match is needed (presence checks), so
+                the scan can stop there
+        """
+        if name in self._patterns:
+            raise ValueError(f"Pattern '{name}' is already registered")
+        if trigger:
+            pattern = f"(?={trigger}){pattern}"
+        self._patterns[name] = (pattern, flags, first_only)
+        self._scanners = None
+        self.version += 1
+
+    @property
+    def names(self) -> List[str]:
+        return list(self._patterns)
+
+    def _compile(self) -> Dict[str, _Scanner]:
+        if self._scanners is None:
+            self._scanners = {
+                name: _Scanner(re.compile(pattern, flags), first_only)
+                for name, (pattern, flags, first_only) in self._patterns.items()
+            }
+        return self._scanners
+
+    def scan(self, text: str) -> Dict[str, List[PatternMatch]]:
+        """
+        Find every registered pattern in the text.
+
+        Args:
+            text: Text to scan
+
+        Returns:
+            Dictionary mapping each pattern name to its matches in order (at
+            most one for first_only patterns)
+        """
+        results = {}
+        for name, scanner in self._compile().items():
+            if scanner.first_only:
+                match = scanner.regex.search(text)
+                found = [match] if match else []
+            else:
+                found = scanner.regex.finditer(text)
+            results[name] = [
+                PatternMatch(match.start(), match.end(), match.group())
+                for match in found
+            ]
+        return results
+
+    def scan_document(self, doc) -> Dict[str, List[PatternMatch]]:
+        """Scan a ResumeDocument's text"""
+        return self.scan(doc.text)
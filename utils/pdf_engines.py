@@ -0,0 +1,127 @@
+"""Pluggable plain-text extraction engines for PDFs"""
+
+import os
+import threading
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import pdfplumber
+import pypdfium2 as pdfium
+
+DEFAULT_TEXT_ENGINE = os.getenv("PDF_TEXT_ENGINE", "pdfplumber")
+
+
+class PdfTextEngine:
+    """
+    Interface for text extraction backends.
+
+    Engines receive a path or a seekable binary file object and only produce
+    page text; layout data (words, chars, tables) always comes from pdfplumber.
+    """
+
+    name = ""
+
+    # Whether splitting pages across worker processes pays off for this engine
+    parallel_friendly = False
+
+    def page_count(self, pdf_stream) -> int:
+        raise NotImplementedError
+
+    def iter_pages(
+        self, pdf_stream, page_numbers: Optional[List[int]] = None
+    ) -> Iterator[Tuple[int, str]]:
+        """
+        Yield (page_number, text) in page order.
+
+        Args:
+            pdf_stream: Path to a PDF, or a seekable binary file object
+            page_numbers: 1-based pages to extract; None for every page
+        """
+        raise NotImplementedError
+
+
+class PdfplumberEngine(PdfTextEngine):
+    """Full pdfplumber layout analysis; the most faithful reading order"""
+
+    name = "pdfplumber"
+    parallel_friendly = True
+
+    def page_count(self, pdf_stream) -> int:
+        with pdfplumber.open(pdf_stream) as pdf:
+            return len(pdf.pages)
+
+    def iter_pages(
+        self, pdf_stream, page_numbers: Optional[List[int]] = None
+    ) -> Iterator[Tuple[int, str]]:
+        with pdfplumber.open(pdf_stream, pages=page_numbers) as pdf:
+            for page in pdf.pages:
+                page_text = page.extract_text() or ""
+                # Release the page's parsed layout before moving on
+                page.close()
+                yield page.page_number, page_text
+
+
+# PDFium is not thread-safe and Streamlit runs each session in its own thread
+PDFIUM_LOCK = threading.Lock()
+
+
+class PdfiumEngine(PdfTextEngine):
+    """
+    PDFium text layer via pypdfium2 (already installed with pdfplumber).
+
+    Skips char-level layout analysis, so it is many times faster than
+    pdfplumber. Good enough for LLM input and previews.
+    """
+
+    name = "pdfium"
+
+    def page_count(self, pdf_stream) -> int:
+        with PDFIUM_LOCK:
+            doc = pdfium.PdfDocument(pdf_stream)
+            try:
+                return len(doc)
+            finally:
+                doc.close()
+
+    def iter_pages(
+        self, pdf_stream, page_numbers: Optional[List[int]] = None
+    ) -> Iterator[Tuple[int, str]]:
+        with PDFIUM_LOCK:
+            doc = pdfium.PdfDocument(pdf_stream)
+            if page_numbers is None:
+                page_numbers = list(range(1, len(doc) + 1))
+        try:
+            for page_number in page_numbers:
+                with PDFIUM_LOCK:
+                    page = doc[page_number - 1]
+                    textpage = page.get_textpage()
+                    page_text = textpage.get_text_range()
+                    textpage.close()
+                    page.close()
+                yield page_number, page_text.replace("\r\n", "\n").strip()
+        finally:
+            with PDFIUM_LOCK:
+                doc.close()
+
+
+TEXT_ENGINES: Dict[str, PdfTextEngine] = {
+    engine.name: engine for engine in (PdfplumberEngine(), PdfiumEngine())
+}
+
+
+def get_text_engine(name: Optional[str] = None) -> PdfTextEngine:
+    """
+    Look up a text extraction engine by name.
+
+    Args:
+        name: Engine name ("pdfplumber" or "pdfium"); None for PDF_TEXT_ENGINE
+
+    Returns:
+        PdfTextEngine instance
+    """
+    name = name or DEFAULT_TEXT_ENGINE
+    if name not in TEXT_ENGINES:
+        raise ValueError(
+            f"Unknown PDF text engine '{name}'. "
+            f"Available: {', '.join(sorted(TEXT_ENGINES))}"
+        )
+    return TEXT_ENGINES[name]
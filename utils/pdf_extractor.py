@@ -1,47 +1,677 @@
 """PDF text extraction utility"""
 
+import hashlib
 import io
-from typing import Optional
+import multiprocessing
+import os
+import re
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Iterator, List, Optional, Tuple
 import pdfplumber
+import pypdfium2 as pdfium
 
+from .disk_cache import DEFAULT_CACHE_DIR, DiskCache
+from .pdf_engines import PDFIUM_LOCK, PdfplumberEngine, PdfTextEngine, get_text_engine
 
-def extract_text_from_pdf(pdf_file) -> Optional[str]:
+# Bump when extraction output changes so stale cache entries are ignored
+EXTRACTOR_VERSION = "1"
+
+_text_cache = None
+
+# Documents with more pages than this are split across worker processes;
+# shorter ones are parsed in-process so they don't pay the spawn cost
+PARALLEL_PAGE_THRESHOLD = int(os.getenv("PDF_PARALLEL_PAGE_THRESHOLD", "10"))
+_AVAILABLE_CPUS = (
+    len(os.sched_getaffinity(0))
+    if hasattr(os, "sched_getaffinity")
+    else (os.cpu_count() or 1)
+)
+MAX_PAGE_WORKERS = int(os.getenv("PDF_MAX_PAGE_WORKERS", str(_AVAILABLE_CPUS)))
+
+# Set in sandbox children, where a MemoryError has to reach the sandbox to be
+# reported as "too expensive"; elsewhere it is handled like any other error
+RAISE_MEMORY_ERRORS = False
+
+_process_context = None
+
+# PDF bytes handed to each page worker once, by the pool initializer
+_worker_pdf_bytes = None
+
+# Rough characters-per-token ratio for English text, used for token budgets
+CHARS_PER_TOKEN = 4
+
+# Text this close to the top/bottom page edge (1 inch, in points) counts as
+# header/footer content
+HEADER_FOOTER_BAND = 72
+
+# Width of the x-position histogram buckets used for column detection (points)
+X_BUCKET_WIDTH = 10
+
+# Rough cost model for a full pdfplumber parse, measured on typical resumes:
+# layout analysis scales with the number of characters on each page
+PARSE_MS_PER_CHAR = 0.08
+PARSE_MS_PER_PAGE = 10
+
+# Pages with fewer extractable characters than this have no usable text layer
+MIN_TEXT_LAYER_CHARS = 20
+
+_PDF_HEADER_RE = re.compile(rb"%PDF-(\d\.\d)")
+
+
+def font_family(fontname: str) -> str:
+    """Strip the subset prefix and style suffix: 'ABCDEF+Calibri-Bold' -> 'Calibri'"""
+    name = fontname.split("+", 1)[-1]
+    return re.split(r"[-,]", name, maxsplit=1)[0] or name
+
+
+@dataclass
+class PageProfile:
+    """Font and layout aggregates built in one pass over a page's characters"""
+
+    char_count: int = 0
+    # font family -> number of characters
+    fonts: Counter = field(default_factory=Counter)
+    # font size (rounded to 0.5pt) -> number of characters
+    font_sizes: Counter = field(default_factory=Counter)
+    # characters inside the top / bottom HEADER_FOOTER_BAND
+    header_chars: int = 0
+    footer_chars: int = 0
+    # x0 // X_BUCKET_WIDTH -> number of characters
+    x_histogram: Counter = field(default_factory=Counter)
+
+
+def _profile_page(page) -> PageProfile:
+    """Build a PageProfile from a pdfplumber page, skipping whitespace chars"""
+    profile = PageProfile()
+    footer_top = page.height - HEADER_FOOTER_BAND
+
+    for char in page.chars:
+        if char["text"].isspace():
+            continue
+
+        profile.char_count += 1
+        profile.fonts[font_family(char.get("fontname") or "")] += 1
+        profile.font_sizes[round((char.get("size") or 0) * 2) / 2] += 1
+
+        if char["top"] < HEADER_FOOTER_BAND:
+            profile.header_chars += 1
+        elif char["bottom"] > footer_top:
+            profile.footer_chars += 1
+
+        profile.x_histogram[int(char["x0"] // X_BUCKET_WIDTH)] += 1
+
+    return profile
+
+
+@dataclass
+class ParsedPage:
+    """Everything the app reads from a single PDF page"""
+
+    page_number: int
+    width: float
+    height: float
+    text: str
+    profile: PageProfile = field(default_factory=PageProfile)
+    # Table bounding boxes; None when table detection was skipped
+    tables: Optional[list] = None
+    images: list = field(default_factory=list)
+
+
+@dataclass
+class ParsedPDF:
+    """
+    Result of parsing a PDF once.
+
+    Text extraction, the upload preview and ATS validation all read from this
+    object so the layout analysis only runs once per upload.
+    """
+
+    pages: list = field(default_factory=list)
+    metadata: dict = field(default_factory=dict)
+
+    @property
+    def page_count(self) -> int:
+        return len(self.pages)
+
+    @property
+    def text(self) -> str:
+        """Full document text: non-empty pages joined by newlines, stripped"""
+        return "\n".join(page.text for page in self.pages if page.text).strip()
+
+
+def get_text_cache() -> Optional[DiskCache]:
+    """
+    Get the process-wide extracted-text cache, creating it on first use.
+
+    Location and size come from CACHE_DIR and PDF_TEXT_CACHE_MB.
+
+    Returns:
+        DiskCache, or None if the cache directory is unusable
+    """
+    global _text_cache
+    if _text_cache is None:
+        try:
+            _text_cache = DiskCache(
+                os.path.join(DEFAULT_CACHE_DIR, "pdf_text.sqlite3"),
+                max_bytes=int(os.getenv("PDF_TEXT_CACHE_MB", "64")) * 1024 * 1024,
+            )
+        except Exception as e:
+            print(f"PDF text cache disabled: {e}")
+            return None
+    return _text_cache
+
+
+class _MemoryViewReader(io.RawIOBase):
+    """Read-only, seekable file object over a buffer, without copying it"""
+
+    def __init__(self, buffer):
+        self._view = memoryview(buffer).cast("B")
+        self._position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._position
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            offset += self._position
+        elif whence == io.SEEK_END:
+            offset += len(self._view)
+        self._position = max(0, offset)
+        return self._position
+
+    def readinto(self, target) -> int:
+        chunk = self._view[self._position : self._position + len(target)]
+        target[: len(chunk)] = chunk
+        self._position += len(chunk)
+        return len(chunk)
+
+
+def _as_pdf_stream(pdf_source):
+    """
+    Turn any supported PDF source into something pdfplumber.open accepts.
+
+    Paths are passed through, file-like objects are rewound, bytes are wrapped
+    in a BytesIO (which shares the bytes object rather than copying it), and
+    bytearrays / memoryviews are read in place.
+    """
+    if isinstance(pdf_source, (str, os.PathLike)):
+        return pdf_source
+    if isinstance(pdf_source, bytes):
+        return io.BytesIO(pdf_source)
+    if isinstance(pdf_source, (bytearray, memoryview)):
+        return _MemoryViewReader(pdf_source)
+    pdf_source.seek(0)
+    return pdf_source
+
+
+def read_pdf_bytes(pdf_file) -> bytes:
+    """
+    Read the raw bytes of any supported PDF source without moving its pointer.
+
+    bytes, bytearray and memoryview inputs are returned as-is.
+    """
+    if isinstance(pdf_file, (bytes, bytearray, memoryview)):
+        return pdf_file
+    if isinstance(pdf_file, (str, os.PathLike)):
+        with open(pdf_file, "rb") as f:
+            return f.read()
+    if hasattr(pdf_file, "getvalue"):
+        return pdf_file.getvalue()
+    position = pdf_file.tell()
+    pdf_file.seek(0)
+    data = pdf_file.read()
+    pdf_file.seek(position)
+    return data
+
+
+def _text_cache_key(pdf_bytes: bytes, engine_name: str) -> str:
+    """Content-addressed key: document hash plus extractor version and engine"""
+    digest = hashlib.sha256(pdf_bytes).hexdigest()
+    return f"text:v{EXTRACTOR_VERSION}:{engine_name}:{digest}"
+
+
+def _text_cache_lookup(key: str) -> Optional[str]:
+    cache = get_text_cache()
+    if cache is None:
+        return None
+    cached = cache.get(key)
+    return cached.decode("utf-8") if cached is not None else None
+
+
+def _text_cache_store(key: str, text: str) -> None:
+    cache = get_text_cache()
+    if cache is not None:
+        cache.set(key, text.encode("utf-8"))
+
+
+def get_cached_text(pdf_file, engine: Optional[str] = None) -> Optional[str]:
+    """
+    Look up previously extracted text for a PDF without parsing it.
+
+    Args:
+        pdf_file: Path to a PDF, or an uploaded PDF file
+        engine: Text engine the text was extracted with; None for the default
+
+    Returns:
+        Cached text ("" if the PDF had no text layer), or None on a miss
+    """
+    try:
+        engine_name = get_text_engine(engine).name
+        return _text_cache_lookup(
+            _text_cache_key(read_pdf_bytes(pdf_file), engine_name)
+        )
+    except Exception as e:
+        print(f"Error reading PDF for cache lookup: {e}")
+        return None
+
+
+@contextmanager
+def open_pdf(pdf_file) -> Iterator[pdfplumber.PDF]:
+    """
+    Open any supported PDF source with pdfplumber.
+
+    Args:
+        pdf_file: Path to a PDF, an uploaded PDF file (BytesIO or file-like
+            object), or the raw PDF as bytes / bytearray / memoryview
+    """
+    with pdfplumber.open(_as_pdf_stream(pdf_file)) as pdf:
+        yield pdf
+
+
+def parse_page(
+    page, detect_tables: bool = True, include_text: bool = True
+) -> ParsedPage:
+    """
+    Collect text and layout data for one pdfplumber page.
+
+    Args:
+        page: pdfplumber Page
+        detect_tables: Run table detection, by far the most expensive step
+        include_text: Run layout-aware text extraction
+
+    Returns:
+        ParsedPage; tables is None when detection was skipped
+    """
+    return ParsedPage(
+        page_number=page.page_number,
+        width=float(page.width),
+        height=float(page.height),
+        text=(page.extract_text() or "") if include_text else "",
+        profile=_profile_page(page),
+        tables=[table.bbox for table in page.find_tables()] if detect_tables else None,
+        images=[
+            {key: image.get(key) for key in ("x0", "x1", "top", "bottom")}
+            for image in page.images
+        ],
+    )
+
+
+def _init_page_worker(pdf_bytes: bytes) -> None:
+    global _worker_pdf_bytes
+    _worker_pdf_bytes = pdf_bytes
+
+
+def _parse_page_range(page_numbers: List[int]) -> List[ParsedPage]:
+    """Worker entry point: parse a range of pages from the shared PDF bytes"""
+    with pdfplumber.open(io.BytesIO(_worker_pdf_bytes), pages=page_numbers) as pdf:
+        return [parse_page(page) for page in pdf.pages]
+
+
+def _extract_text_range(page_numbers: List[int], engine_name: str) -> List[str]:
+    """Worker entry point: extract text for a range of pages with one engine"""
+    engine = get_text_engine(engine_name)
+    return [
+        text
+        for _, text in engine.iter_pages(io.BytesIO(_worker_pdf_bytes), page_numbers)
+    ]
+
+
+def _split_pages(page_count: int, chunk_count: int) -> List[List[int]]:
+    """Split 1-based page numbers into contiguous, similarly sized ranges"""
+    chunk_size, remainder = divmod(page_count, chunk_count)
+    ranges = []
+    start = 1
+    for i in range(chunk_count):
+        end = start + chunk_size + (1 if i < remainder else 0)
+        ranges.append(list(range(start, end)))
+        start = end
+    return ranges
+
+
+def _use_parallel(parallel: Optional[bool], page_count: int) -> bool:
+    if parallel is None:
+        return page_count > PARALLEL_PAGE_THRESHOLD and MAX_PAGE_WORKERS > 1
+    return parallel
+
+
+def reraise_in_sandbox(error: Exception) -> None:
+    """Re-raise a MemoryError if RAISE_MEMORY_ERRORS is set; else do nothing"""
+    if isinstance(error, MemoryError) and RAISE_MEMORY_ERRORS:
+        raise error
+
+
+def process_context():
+    """
+    Multiprocessing context for page workers and sandboxed PDF work.
+
+    Pools are started from Streamlit's and the analysis pool's threads, and
+    a forked child could inherit a lock another thread holds. forkserver
+    forks from a clean, single-threaded server with the PDF modules already
+    imported, so children start quickly and safely. Falls back to spawn
+    where forkserver is missing.
+    """
+    global _process_context
+    if _process_context is None:
+        if "forkserver" in multiprocessing.get_all_start_methods():
+            _process_context = multiprocessing.get_context("forkserver")
+            _process_context.set_forkserver_preload(
+                ["utils.pdf_extractor", "utils.resume_analyzer"]
+            )
+        else:
+            _process_context = multiprocessing.get_context("spawn")
+    return _process_context
+
+
+def _map_page_ranges(pdf_bytes: bytes, page_count: int, worker, *args) -> list:
+    """Fan page ranges out to a process pool and join the results in page order"""
+    workers = max(1, min(MAX_PAGE_WORKERS, page_count))
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=process_context(),
+        initializer=_init_page_worker,
+        initargs=(bytes(pdf_bytes),),
+    ) as pool:
+        chunks = pool.map(
+            worker,
+            _split_pages(page_count, workers),
+            *[[arg] * workers for arg in args],
+        )
+        return [item for chunk in chunks for item in chunk]
+
+
+def _parse_pages(
+    pdf_file, parallel: Optional[bool] = None
+) -> Tuple[dict, List[ParsedPage]]:
+    """
+    Parse every page of a PDF with pdfplumber, in worker processes for long documents.
+
+    Args:
+        pdf_file: Any PDF source accepted by parse_pdf
+        parallel: Force the process pool on or off; None decides by page count
+
+    Returns:
+        Tuple of (metadata, pages)
+    """
+    with open_pdf(pdf_file) as pdf:
+        metadata = dict(pdf.metadata or {})
+        page_count = len(pdf.pages)
+
+        if not _use_parallel(parallel, page_count):
+            return metadata, [parse_page(page) for page in pdf.pages]
+
+    try:
+        return metadata, _map_page_ranges(
+            read_pdf_bytes(pdf_file), page_count, _parse_page_range
+        )
+    except Exception as e:
+        print(f"Parallel page extraction failed, falling back to serial: {e}")
+        with open_pdf(pdf_file) as pdf:
+            return metadata, [parse_page(page) for page in pdf.pages]
+
+
+def _extract_page_texts(
+    pdf_file, engine: PdfTextEngine, parallel: Optional[bool] = None
+) -> List[str]:
+    """Text of every page, in worker processes for long documents"""
+    if parallel is None and not engine.parallel_friendly:
+        parallel = False
+
+    page_count = engine.page_count(_as_pdf_stream(pdf_file))
+    if _use_parallel(parallel, page_count):
+        try:
+            return _map_page_ranges(
+                read_pdf_bytes(pdf_file),
+                page_count,
+                _extract_text_range,
+                engine.name,
+            )
+        except Exception as e:
+            print(f"Parallel page extraction failed, falling back to serial: {e}")
+
+    return [text for _, text in engine.iter_pages(_as_pdf_stream(pdf_file))]
+
+
+def parse_pdf(pdf_file, parallel: Optional[bool] = None) -> Optional[ParsedPDF]:
+    """
+    Parse a PDF once, collecting text, a font/layout profile, tables, images
+    and metadata for every page.
+
+    Layout data always comes from pdfplumber, whatever the default text engine.
+
+    Args:
+        pdf_file: Path to a PDF, an uploaded PDF file (BytesIO or file-like
+            object), or the raw PDF as bytes / bytearray / memoryview
+        parallel: Split pages across worker processes; None enables it above
+            PARALLEL_PAGE_THRESHOLD pages
+
+    Returns:
+        ParsedPDF, or None if parsing fails
+    """
+    try:
+        metadata, pages = _parse_pages(pdf_file, parallel=parallel)
+        parsed = ParsedPDF(pages=pages, metadata=metadata)
+
+        # Later text lookups for the same bytes can skip parsing entirely
+        _text_cache_store(
+            _text_cache_key(read_pdf_bytes(pdf_file), PdfplumberEngine.name),
+            parsed.text,
+        )
+
+        return parsed
+
+    except Exception as e:
+        reraise_in_sandbox(e)
+        print(f"Error parsing PDF: {e}")
+        return None
+
+
+def iter_pdf_pages(
+    pdf_file,
+    max_chars: Optional[int] = None,
+    max_tokens: Optional[int] = None,
+    engine: Optional[str] = None,
+) -> Iterator[Tuple[int, str]]:
+    """
+    Yield page text one page at a time, stopping once a size budget is met.
+
+    Pages after the one that fills the budget are never parsed, so callers that
+    only need the start of a document (previews, size-capped prompts) don't pay
+    for the rest.
+
+    Args:
+        pdf_file: Path to a PDF, an uploaded PDF file (BytesIO or file-like
+            object), or the raw PDF as bytes / bytearray / memoryview
+        max_chars: Stop after this many characters of text have been yielded
+        max_tokens: Stop after roughly this many tokens (CHARS_PER_TOKEN chars each)
+        engine: Text engine name ("pdfplumber" or "pdfium"); None for the default
+
+    Yields:
+        Tuples of (page_number, page_text); page_text is "" for pages without text
+    """
+    budget = None
+    if max_chars is not None:
+        budget = max_chars
+    if max_tokens is not None:
+        token_chars = max_tokens * CHARS_PER_TOKEN
+        budget = token_chars if budget is None else min(budget, token_chars)
+
+    yielded_chars = 0
+    pages = get_text_engine(engine).iter_pages(_as_pdf_stream(pdf_file))
+    try:
+        for page_number, page_text in pages:
+            yield page_number, page_text
+
+            yielded_chars += len(page_text)
+            if budget is not None and yielded_chars >= budget:
+                return
+    finally:
+        pages.close()
+
+
+def extract_text_from_pdf(
+    pdf_file,
+    use_cache: bool = True,
+    parallel: Optional[bool] = None,
+    max_tokens: Optional[int] = None,
+    engine: Optional[str] = None,
+) -> Optional[str]:
     """
     Extract text content from a PDF file.
 
     Args:
-        pdf_file: Uploaded PDF file (BytesIO or file-like object)
+        pdf_file: Uploaded PDF file (BytesIO or file-like object), raw PDF
+            bytes / bytearray / memoryview, or a ParsedPDF that has already
+            been parsed
+        use_cache: Read from and write to the on-disk text cache
+        parallel: Split pages across worker processes; None enables it above
+            PARALLEL_PAGE_THRESHOLD pages for engines that benefit from it
+        max_tokens: Stop parsing pages once roughly this many tokens of text
+            have been extracted. Budgeted extraction bypasses the text cache.
+        engine: Text engine name ("pdfplumber" or "pdfium"); None for the
+            PDF_TEXT_ENGINE default. Ignored for a ParsedPDF.
 
     Returns:
         Extracted text as string, or None if extraction fails
     """
+    if isinstance(pdf_file, ParsedPDF):
+        return pdf_file.text or None
+
     try:
-        # Reset file pointer to beginning
-        pdf_file.seek(0)
+        text_engine = get_text_engine(engine)
 
-        text_content = []
+        cache_key = None
+        if use_cache and max_tokens is None:
+            cache_key = _text_cache_key(read_pdf_bytes(pdf_file), text_engine.name)
+            cached = _text_cache_lookup(cache_key)
+            if cached is not None:
+                return cached or None
 
-        with pdfplumber.open(pdf_file) as pdf:
-            for page in pdf.pages:
-                page_text = page.extract_text()
-                if page_text:
-                    text_content.append(page_text)
+        if max_tokens is not None:
+            page_texts = [
+                text
+                for _, text in iter_pdf_pages(
+                    pdf_file, max_tokens=max_tokens, engine=text_engine.name
+                )
+            ]
+        else:
+            page_texts = _extract_page_texts(pdf_file, text_engine, parallel)
 
-        full_text = "\n".join(text_content)
+        # Join non-empty pages in order and trim surrounding whitespace
+        full_text = "\n".join(text for text in page_texts if text).strip()
 
-        # Clean up the text
-        full_text = full_text.strip()
+        if cache_key:
+            _text_cache_store(cache_key, full_text)
 
         return full_text if full_text else None
 
     except Exception as e:
+        reraise_in_sandbox(e)
         print(f"Error extracting text from PDF: {e}")
         return None
 
 
+def preflight_pdf(pdf_file) -> dict:
+    """
+    Cheap triage of a PDF before any layout parsing.
+
+    Reads the header and trailer, lets PDFium load the xref (without parsing
+    page content beyond page 1) and counts the characters on page 1.
+
+    Args:
+        pdf_file: Any PDF source accepted by read_pdf_bytes
+
+    Returns:
+        Dictionary with valid, error, pdf_version, page_count, encrypted,
+        has_text_layer, first_page_chars and estimated_cost_ms
+    """
+    result = {
+        "valid": False,
+        "error": "",
+        "pdf_version": "",
+        "page_count": 0,
+        "encrypted": False,
+        "has_text_layer": False,
+        "first_page_chars": 0,
+        "estimated_cost_ms": 0,
+    }
+
+    pdf_bytes = read_pdf_bytes(pdf_file)
+    header = bytes(pdf_bytes[:1024])
+    trailer = bytes(pdf_bytes[-2048:])
+
+    match = _PDF_HEADER_RE.search(header)
+    if not match:
+        result["error"] = "File is not a PDF (missing %PDF header)."
+        return result
+    result["pdf_version"] = match.group(1).decode()
+
+    if b"%%EOF" not in trailer or b"startxref" not in trailer:
+        result["error"] = "PDF is truncated or corrupted (missing trailer)."
+        return result
+
+    with PDFIUM_LOCK:
+        try:
+            doc = pdfium.PdfDocument(_as_pdf_stream(pdf_bytes))
+        except pdfium.PdfiumError as e:
+            if "password" in str(e).lower():
+                result["encrypted"] = True
+                result["error"] = "PDF is password-protected."
+            else:
+                result["error"] = f"PDF could not be opened: {e}"
+            return result
+
+        try:
+            result["page_count"] = len(doc)
+            result["encrypted"] = (
+                pdfium.raw.FPDF_GetSecurityHandlerRevision(doc.raw) != -1
+            )
+            if result["page_count"]:
+                page = doc[0]
+                textpage = page.get_textpage()
+                result["first_page_chars"] = textpage.count_chars()
+                textpage.close()
+                page.close()
+        finally:
+            doc.close()
+
+    if not result["page_count"]:
+        result["error"] = "PDF has no pages."
+        return result
+
+    result["has_text_layer"] = result["first_page_chars"] >= MIN_TEXT_LAYER_CHARS
+    result["estimated_cost_ms"] = round(
+        result["page_count"]
+        * (PARSE_MS_PER_PAGE + result["first_page_chars"] * PARSE_MS_PER_CHAR)
+    )
+    result["valid"] = True
+    return result
+
+
 def validate_pdf(pdf_file, max_size_mb: int = 5) -> tuple[bool, str]:
     """
-    Validate PDF file type and size.
+    Validate PDF file type, size and structure.
+
+    Runs preflight_pdf so corrupted, password-protected and image-only files
+    are rejected before any parsing or API call.
 
     Args:
         pdf_file: Uploaded file
@@ -64,6 +694,16 @@ def validate_pdf(pdf_file, max_size_mb: int = 5) -> tuple[bool, str]:
         if file_size > max_size_bytes:
             return False, f"File size exceeds {max_size_mb}MB limit."
 
+        preflight = preflight_pdf(pdf_file)
+        if not preflight["valid"]:
+            return False, preflight["error"]
+        if not preflight["has_text_layer"]:
+            return (
+                False,
+                "This PDF has no text layer (it looks like a scanned or image-only "
+                "document). Please upload a PDF with selectable text.",
+            )
+
         return True, ""
 
     except Exception as e:
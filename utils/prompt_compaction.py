@@ -0,0 +1,321 @@
+"""Compaction of resume and job description text to an input-token budget"""
+
+import os
+import re
+from typing import Dict, List, Tuple
+
+from .section_segmenter import (
+    HEADER_SECTION,
+    SECTION_SEGMENTER,
+    SectionSegmenter,
+    SectionSpan,
+)
+
+# Estimated input tokens for the resume and job description together; longer
+# inputs are compacted and, if still too long, cut down to their most
+# relevant sections. 0 for no limit.
+PROMPT_TOKEN_BUDGET = int(os.getenv("PROMPT_TOKEN_BUDGET", "6000"))
+
+# Share of an exceeded budget reserved for the job description
+JD_BUDGET_SHARE = 0.35
+
+# Job description headings, in the form SectionSegmenter takes
+JD_SECTION_HEADINGS = {
+    "requirements": [
+        "requirements",
+        "qualifications",
+        "minimum qualifications",
+        "basic qualifications",
+        "required qualifications",
+        "required skills",
+        "what you bring",
+        "what we're looking for",
+        "who you are",
+        "must have",
+    ],
+    "responsibilities": [
+        "responsibilities",
+        "key responsibilities",
+        "duties",
+        "what you'll do",
+        "what you will do",
+        "the role",
+        "your role",
+        "in this role",
+    ],
+    "preferred": [
+        "preferred qualifications",
+        "nice to have",
+        "bonus points",
+        "pluses",
+    ],
+    "about_role": [
+        "about the role",
+        "about the job",
+        "job summary",
+        "position summary",
+        "overview",
+    ],
+    "about_company": [
+        "about us",
+        "about the company",
+        "who we are",
+        "our mission",
+        "our culture",
+    ],
+    "benefits": [
+        "benefits",
+        "perks",
+        "what we offer",
+        "compensation",
+        "salary range",
+        "pay range",
+        "compensation and benefits",
+    ],
+    "eeo": [
+        "equal opportunity",
+        "equal employment opportunity",
+        "eeo statement",
+        "diversity and inclusion",
+        "accommodations",
+        "privacy notice",
+    ],
+}
+
+# Job description sections that say nothing about the role's requirements
+JD_BOILERPLATE_SECTIONS = frozenset({"benefits", "eeo"})
+
+# Section order when cutting down to the budget: most relevant first
+RESUME_SECTION_PRIORITY = (
+    "skills",
+    "experience",
+    "summary",
+    "projects",
+    "certifications",
+    "education",
+    HEADER_SECTION,
+)
+JD_SECTION_PRIORITY = (
+    HEADER_SECTION,
+    "requirements",
+    "responsibilities",
+    "preferred",
+    "about_role",
+    "about_company",
+)
+
+JD_SEGMENTER = SectionSegmenter(JD_SECTION_HEADINGS)
+
+# Word pieces, numbers and single symbols; long words count as several tokens
+_TOKEN_PIECE_RE = re.compile(r"[^\W\d_]+|\d+|[^\w\s]")
+_SPACE_RE = re.compile(r"[ \t\u00a0\u2000-\u200b\u3000]+")
+# A line holding only a page number: "3", "Page 3", "3 of 5", "Page 3/5". Up
+# to 3 digits, so a year on a line of its own is not mistaken for one.
+_PAGE_NUMBER_RE = re.compile(
+    r"^(?:page\s*)?\d{1,3}(?:\s*(?:of|/)\s*\d{1,3})?$", re.IGNORECASE
+)
+# Equal-opportunity and legal statements pasted without a heading
+_BOILERPLATE_LINE_RE = re.compile(
+    r"equal (?:employment )?opportunity|without regard to|reasonable accommodation"
+    r"|e-verify|protected veteran|affirmative action|pay transparency",
+    re.IGNORECASE,
+)
+# Running headers and footers: short lines repeated word for word, every copy
+# within this many non-blank lines of a page boundary (the start or end of
+# the text, or a page number line)
+RUNNING_LINE_MAX_WORDS = 8
+PAGE_BOUNDARY_LINES = 2
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the number of LLM tokens in a text, without a tokenizer.
+
+    Counts word pieces, numbers and symbols, with one extra token per 6
+    letters of a long word. That is within about 10% of BPE tokenizers on
+    English prose and errs high, which is the safe side for a budget.
+    """
+    return sum(1 + len(piece) // 6 for piece in _TOKEN_PIECE_RE.findall(text))
+
+
+def _page_boundary_distances(lines: List[str]) -> List[int]:
+    """
+    For each line, how many non-blank lines separate it from the nearest page
+    boundary: the start or end of the text, or a page number line.
+    """
+    distances = [len(lines)] * len(lines)
+    for order in (range(len(lines)), range(len(lines) - 1, -1, -1)):
+        distance = 0
+        for index in order:
+            line = lines[index]
+            if _PAGE_NUMBER_RE.match(line):
+                distance = 0
+                continue
+            distances[index] = min(distances[index], distance)
+            if line:
+                distance += 1
+    return distances
+
+
+def compact_text(text: str) -> str:
+    """
+    Remove layout noise: runs of whitespace, blank lines, page numbers and
+    running headers/footers.
+
+    A line is only treated as a running header or footer if it repeats word
+    for word and every copy sits at a page boundary, so repeated job titles,
+    dates and other content lines are kept. Line breaks are kept, since
+    section detection depends on them.
+    """
+    lines = [_SPACE_RE.sub(" ", line).strip() for line in text.splitlines()]
+    distances = _page_boundary_distances(lines)
+
+    positions: Dict[str, List[int]] = {}
+    for index, line in enumerate(lines):
+        if line and len(line.split()) <= RUNNING_LINE_MAX_WORDS:
+            positions.setdefault(line, []).append(index)
+    running = {
+        line
+        for line, indexes in positions.items()
+        if len(indexes) > 1
+        and all(distances[index] < PAGE_BOUNDARY_LINES for index in indexes)
+    }
+
+    compacted: List[str] = []
+    seen = set()
+    for line in lines:
+        if _PAGE_NUMBER_RE.match(line):
+            continue
+        if not line:
+            # At most one blank line in a row, none at the start
+            if compacted and compacted[-1]:
+                compacted.append(line)
+            continue
+        if line in running:
+            if line in seen:
+                continue
+            seen.add(line)
+        compacted.append(line)
+    return "\n".join(compacted).strip()
+
+
+def compact_job_description(job_description: str) -> str:
+    """
+    Compact a job description and drop its boilerplate: benefits and
+    equal-opportunity sections, and legal statements anywhere else.
+    """
+    text = compact_text(job_description)
+    kept = []
+    for span in JD_SEGMENTER.segment(text):
+        if span.name in JD_BOILERPLATE_SECTIONS:
+            continue
+        kept.extend(
+            line
+            for line in text[span.start : span.end].split("\n")
+            if not _BOILERPLATE_LINE_RE.search(line)
+        )
+    return "\n".join(kept).strip()
+
+
+def _truncate_lines(text: str, budget: int) -> str:
+    """Whole lines from the start of a text, up to budget tokens"""
+    kept = []
+    for line in text.split("\n"):
+        tokens = estimate_tokens(line)
+        if tokens > budget:
+            break
+        kept.append(line)
+        budget -= tokens
+    return "\n".join(kept).strip()
+
+
+def fit_to_budget(
+    text: str,
+    spans: List[SectionSpan],
+    priority: Tuple[str, ...],
+    budget: int,
+) -> str:
+    """
+    Keep the most relevant sections of a text that fit in a token budget.
+
+    Sections are taken in priority order (unlisted ones last), whole while
+    they fit; the first one that doesn't fit is cut to its leading lines
+    and the rest are dropped. Kept sections stay in document order.
+
+    Args:
+        text: Text the spans index into
+        spans: Its sections, from a SectionSegmenter
+        priority: Section names, most relevant first
+        budget: Maximum estimated tokens
+
+    Returns:
+        The kept sections, joined by newlines
+    """
+    if estimate_tokens(text) <= budget:
+        return text
+
+    rank: Dict[str, int] = {name: index for index, name in enumerate(priority)}
+    ranked = sorted(
+        range(len(spans)), key=lambda index: rank.get(spans[index].name, len(rank))
+    )
+    kept: Dict[int, str] = {}
+    for index in ranked:
+        span = spans[index]
+        section = text[span.start : span.end].strip()
+        tokens = estimate_tokens(section)
+        if tokens <= budget:
+            kept[index] = section
+            budget -= tokens
+            continue
+        truncated = _truncate_lines(section, budget)
+        if truncated:
+            kept[index] = truncated
+        break
+    return "\n".join(kept[index] for index in sorted(kept))
+
+
+def compact_prompt_inputs(
+    resume_text: str, job_description: str, budget: int = PROMPT_TOKEN_BUDGET
+) -> Tuple[str, str]:
+    """
+    Prepare a resume and job description for an AI prompt.
+
+    Texts within the budget are returned as they are. Otherwise both are
+    compacted (see compact_text; the job description also loses its
+    boilerplate), and if together they still exceed the budget, each is cut
+    to its most relevant sections: skills and experience for the resume,
+    requirements and responsibilities for the job description, which gets
+    at least JD_BUDGET_SHARE of the budget if it needs it.
+
+    Args:
+        resume_text: Resume text
+        job_description: Job description text
+        budget: Estimated input tokens for both; 0 for no limit
+
+    Returns:
+        (resume text, job description) to put in the prompt
+    """
+    if budget <= 0 or (
+        estimate_tokens(resume_text) + estimate_tokens(job_description) <= budget
+    ):
+        return resume_text, job_description
+
+    resume = compact_text(resume_text)
+    jd = compact_job_description(job_description)
+    resume_tokens = estimate_tokens(resume)
+    jd_tokens = estimate_tokens(jd)
+    if resume_tokens + jd_tokens <= budget:
+        return resume, jd
+
+    jd_budget = min(
+        jd_tokens, max(int(budget * JD_BUDGET_SHARE), budget - resume_tokens)
+    )
+    resume_budget = budget - jd_budget
+    resume = fit_to_budget(
+        resume,
+        SECTION_SEGMENTER.segment(resume),
+        RESUME_SECTION_PRIORITY,
+        resume_budget,
+    )
+    jd = fit_to_budget(jd, JD_SEGMENTER.segment(jd), JD_SECTION_PRIORITY, jd_budget)
+    return resume, jd
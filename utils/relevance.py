@@ -0,0 +1,277 @@
+"""Local BM25 keyword relevance of a resume against a job description"""
+
+import hashlib
+import math
+import os
+import re
+import sqlite3
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, Optional, Union
+
+from .disk_cache import DEFAULT_CACHE_DIR
+from .resume_analyzer import STOPWORDS
+from .resume_document import ResumeDocument, as_document
+
+JD_CORPUS_PATH = os.path.expanduser(
+    os.getenv("JD_CORPUS_PATH", os.path.join(DEFAULT_CACHE_DIR, "jd_corpus.sqlite3"))
+)
+
+# BM25 parameters: term-frequency saturation and length normalization
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# What may separate the two words of a bigram
+_PHRASE_GAP_RE = re.compile(r" +|[ ]*[-/][ ]*")
+
+# SQLite's default limit on bound parameters per statement
+_MAX_QUERY_PARAMS = 900
+
+_jd_corpus = None
+_jd_corpus_lock = threading.Lock()
+
+
+def extract_terms(text: Union[str, ResumeDocument]) -> Counter:
+    """
+    Count the unigram and bigram terms of a text.
+
+    Unigrams are tokens of 2+ characters that are neither stop words nor pure
+    numbers; bigrams are two such tokens separated only by spaces, a hyphen
+    or a slash ("machine learning", "full-stack"), so phrases never span
+    punctuation or line breaks.
+
+    Args:
+        text: Text or ResumeDocument
+
+    Returns:
+        Counter of term -> occurrences
+    """
+    doc = as_document(text)
+    terms = Counter()
+    previous = None
+    previous_end = 0
+    for token, (start, end) in zip(doc.tokens, doc.token_spans):
+        if len(token) < 2 or token in STOPWORDS or token.isdigit():
+            previous = None
+            continue
+        terms[token] += 1
+        if previous and _PHRASE_GAP_RE.fullmatch(doc.text, previous_end, start):
+            terms[f"{previous} {token}"] += 1
+        previous, previous_end = token, end
+    return terms
+
+
+class JDCorpus:
+    """
+    Document frequencies of terms over every job description seen so far.
+
+    Stored in SQLite, so statistics persist across restarts and are shared by
+    every worker on the host. Each job description is counted once, however
+    often it is analyzed.
+    """
+
+    def __init__(self, path: str = JD_CORPUS_PATH):
+        self.path = path
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS terms (term TEXT PRIMARY KEY, df INTEGER)"
+            )
+            conn.execute("CREATE TABLE IF NOT EXISTS documents (hash TEXT PRIMARY KEY)")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value INTEGER)"
+            )
+            conn.executemany(
+                "INSERT OR IGNORE INTO meta (name, value) VALUES (?, 0)",
+                [("documents",), ("total_length",)],
+            )
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.path, timeout=5)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def add(self, job_description: Union[str, ResumeDocument]) -> bool:
+        """
+        Add a job description to the corpus statistics.
+
+        Args:
+            job_description: Job description text or ResumeDocument
+
+        Returns:
+            True if it was new, False if it had already been counted
+        """
+        doc = as_document(job_description)
+        digest = hashlib.sha256(doc.text.strip().lower().encode("utf-8")).hexdigest()
+        terms = extract_terms(doc)
+
+        with self._connect() as conn:
+            inserted = conn.execute(
+                "INSERT OR IGNORE INTO documents (hash) VALUES (?)", (digest,)
+            ).rowcount
+            if not inserted:
+                return False
+
+            conn.executemany(
+                "INSERT INTO terms (term, df) VALUES (?, 1) "
+                "ON CONFLICT(term) DO UPDATE SET df = df + 1",
+                [(term,) for term in terms],
+            )
+            conn.execute("UPDATE meta SET value = value + 1 WHERE name = 'documents'")
+            conn.execute(
+                "UPDATE meta SET value = value + ? WHERE name = 'total_length'",
+                (sum(count for term, count in terms.items() if " " not in term),),
+            )
+        return True
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Get corpus size.
+
+        Returns:
+            Dictionary with documents, terms and avg_length (unigrams per
+            job description)
+        """
+        with self._connect() as conn:
+            meta = dict(conn.execute("SELECT name, value FROM meta"))
+            term_count = conn.execute("SELECT COUNT(*) FROM terms").fetchone()[0]
+
+        documents = meta.get("documents", 0)
+        return {
+            "documents": documents,
+            "terms": term_count,
+            "avg_length": meta.get("total_length", 0) / documents if documents else 0,
+        }
+
+    def document_frequencies(self, terms: Iterable[str]) -> Dict[str, int]:
+        """
+        Look up how many job descriptions contain each term.
+
+        Args:
+            terms: Terms to look up
+
+        Returns:
+            Dictionary of term -> document frequency (0 for unseen terms)
+        """
+        terms = list(terms)
+        frequencies = dict.fromkeys(terms, 0)
+        with self._connect() as conn:
+            for start in range(0, len(terms), _MAX_QUERY_PARAMS):
+                chunk = terms[start : start + _MAX_QUERY_PARAMS]
+                placeholders = ",".join("?" * len(chunk))
+                frequencies.update(
+                    conn.execute(
+                        f"SELECT term, df FROM terms WHERE term IN ({placeholders})",
+                        chunk,
+                    )
+                )
+        return frequencies
+
+    def clear(self) -> None:
+        """Forget every job description"""
+        with self._connect() as conn:
+            conn.execute("DELETE FROM terms")
+            conn.execute("DELETE FROM documents")
+            conn.execute("UPDATE meta SET value = 0")
+
+
+def get_jd_corpus() -> JDCorpus:
+    """Get the shared job description corpus, creating it on first use"""
+    global _jd_corpus
+    with _jd_corpus_lock:
+        if _jd_corpus is None:
+            _jd_corpus = JDCorpus()
+    return _jd_corpus
+
+
+def _bm25_idf(documents: int, frequency: int) -> float:
+    return math.log(1 + (documents - frequency + 0.5) / (frequency + 0.5))
+
+
+def _bm25_tf(count: int, length: int, avg_length: float) -> float:
+    norm = 1 - BM25_B + BM25_B * (length / avg_length if avg_length else 1)
+    return count * (BM25_K1 + 1) / (count + BM25_K1 * norm)
+
+
+def score_relevance(
+    resume: Union[str, ResumeDocument],
+    job_description: Union[str, ResumeDocument],
+    corpus: Optional[JDCorpus] = None,
+    update_corpus: bool = True,
+    top_n: int = 20,
+) -> Dict[str, any]:
+    """
+    Score how well a resume covers the important terms of a job description.
+
+    Each job description term is weighted by BM25: its frequency in the job
+    description (saturated and length-normalized against the corpus average)
+    times its IDF across every job description seen. Terms every posting
+    uses ("experience", "team") get little weight; specific skills get a lot.
+
+    Args:
+        resume: Resume text or ResumeDocument
+        job_description: Job description text or ResumeDocument
+        corpus: JDCorpus for IDF statistics; None for the shared corpus
+        update_corpus: Add the job description to the corpus first
+        top_n: Number of matched and missing terms to return
+
+    Returns:
+        Dictionary with relevance_score (0-100, share of the job description's
+        term weight found in the resume), bm25_score (the resume's BM25 score
+        with the job description as the query), matched_terms as (term,
+        weight, resume count), missing_terms as (term, weight), and
+        corpus_documents
+    """
+    corpus = corpus or get_jd_corpus()
+    if update_corpus:
+        corpus.add(job_description)
+
+    jd_terms = extract_terms(job_description)
+    resume_terms = extract_terms(resume)
+    stats = corpus.stats()
+    # An empty corpus gives every term the same IDF
+    documents = max(stats["documents"], 1)
+    avg_length = stats["avg_length"]
+    frequencies = corpus.document_frequencies(jd_terms)
+
+    jd_length = sum(count for term, count in jd_terms.items() if " " not in term)
+    resume_length = sum(
+        count for term, count in resume_terms.items() if " " not in term
+    )
+
+    weights = {}
+    bm25_score = 0.0
+    for term, count in jd_terms.items():
+        idf = _bm25_idf(documents, frequencies[term])
+        weights[term] = idf * _bm25_tf(count, jd_length, avg_length)
+        if resume_terms[term]:
+            bm25_score += idf * _bm25_tf(resume_terms[term], resume_length, avg_length)
+
+    total_weight = sum(weights.values())
+    ranked = sorted(weights.items(), key=lambda item: (-item[1], item[0]))
+    matched = [
+        (term, round(weight, 2), resume_terms[term])
+        for term, weight in ranked
+        if resume_terms[term]
+    ]
+    missing = [
+        (term, round(weight, 2)) for term, weight in ranked if not resume_terms[term]
+    ]
+    matched_weight = sum(weights[term] for term, _, _ in matched)
+
+    return {
+        "relevance_score": (
+            round(matched_weight / total_weight * 100, 1) if total_weight else 0.0
+        ),
+        "bm25_score": round(bm25_score, 2),
+        "matched_terms": matched[:top_n],
+        "missing_terms": missing[:top_n],
+        "corpus_documents": stats["documents"],
+    }
@@ -0,0 +1,125 @@
+"""Persistent cache of AI provider analyses, shared between sessions and workers"""
+
+import functools
+import hashlib
+import json
+import os
+from typing import Any, Callable, Dict, Optional
+
+from .disk_cache import DEFAULT_CACHE_DIR, DiskCache
+
+# Hours a cached analysis is reused; 0 turns the cache off
+RESPONSE_CACHE_TTL_HOURS = float(os.getenv("LLM_CACHE_TTL_HOURS", "168"))
+RESPONSE_CACHE_MB = int(os.getenv("LLM_CACHE_MB", "16"))
+
+_response_cache: Optional[DiskCache] = None
+
+
+def get_response_cache() -> Optional[DiskCache]:
+    """
+    Get the process-wide AI response cache, creating it on first use.
+
+    Location, size and lifetime come from CACHE_DIR, LLM_CACHE_MB and
+    LLM_CACHE_TTL_HOURS.
+
+    Returns:
+        DiskCache, or None if caching is off or the cache directory is unusable
+    """
+    global _response_cache
+    if _response_cache is None and RESPONSE_CACHE_TTL_HOURS > 0:
+        try:
+            _response_cache = DiskCache(
+                os.path.join(DEFAULT_CACHE_DIR, "llm_responses.sqlite3"),
+                max_bytes=RESPONSE_CACHE_MB * 1024 * 1024,
+                ttl=RESPONSE_CACHE_TTL_HOURS * 3600,
+            )
+        except Exception as e:
+            print(f"AI response cache disabled: {e}")
+            return None
+    return _response_cache
+
+
+def response_cache_key(
+    provider: str,
+    model_id: str,
+    prompt_version: int,
+    resume_text: str,
+    job_description: str,
+    token_budget: int = 0,
+) -> str:
+    """
+    Key of one analysis: provider, model, prompt version, input token budget
+    and input hashes.
+
+    Changing the model or the budget, or bumping the prompt version, makes
+    every older entry unreachable; they age out through the TTL and size
+    limit.
+    """
+    resume_digest = hashlib.sha256(resume_text.encode("utf-8")).hexdigest()
+    jd_digest = hashlib.sha256(job_description.encode("utf-8")).hexdigest()
+    return (
+        f"llm:{provider}:{model_id}:p{prompt_version}:t{token_budget}:"
+        f"{resume_digest}:{jd_digest}"
+    )
+
+
+def cached_response(
+    provider: str,
+    model_id: str,
+    prompt_version: int,
+    restore: Optional[Callable[[Dict[str, Any]], None]] = None,
+    token_budget: int = 0,
+):
+    """
+    Decorate an analyze_resume_with_* function to reuse earlier responses.
+
+    The decorated function is called as analyze(resume_text, job_description,
+    api_key, ...). Successful results are stored as JSON; failed calls (None)
+    are not cached, so they are retried next time.
+
+    Args:
+        provider: Provider name, e.g. "groq"
+        model_id: Model the function calls
+        prompt_version: Version of the prompt template; bump it when the
+            prompt or the result format changes
+        restore: Called on a result loaded from the cache to rebuild values
+            JSON doesn't preserve (e.g. tuples)
+        token_budget: Input token budget the prompt's resume and job
+            description are compacted to (0 for none), since it changes the
+            prompt as much as its version does
+    """
+
+    def decorator(analyze):
+        @functools.wraps(analyze)
+        def wrapper(resume_text: str, job_description: str, *args, **kwargs):
+            cache = get_response_cache()
+            if cache is None:
+                return analyze(resume_text, job_description, *args, **kwargs)
+
+            key = response_cache_key(
+                provider,
+                model_id,
+                prompt_version,
+                resume_text,
+                job_description,
+                token_budget,
+            )
+            cached = cache.get(key)
+            if cached is not None:
+                try:
+                    result = json.loads(cached.decode("utf-8"))
+                except ValueError:
+                    result = None
+                if isinstance(result, dict):
+                    if restore:
+                        restore(result)
+                    return result
+
+            result = analyze(resume_text, job_description, *args, **kwargs)
+            if result is not None:
+                cache.set(key, json.dumps(result).encode("utf-8"))
+            return result
+
+        return wrapper
+
+    return decorator
@@ -1,29 +1,226 @@
 """Additional resume analysis features"""
 
+import os
 import re
-from typing import Dict, List, Tuple
+import time
+from typing import Callable, Dict, List, Optional, Tuple, Union
 from collections import Counter
 import matplotlib.pyplot as plt
 from wordcloud import WordCloud
 import io
 
+from .pdf_extractor import (
+    X_BUCKET_WIDTH,
+    PageProfile,
+    ParsedPage,
+    ParsedPDF,
+    open_pdf,
+    parse_page,
+    parse_pdf,
+    reraise_in_sandbox,
+)
+from .lexicon import LexiconMatcher, term_counts
+from .near_duplicates import NearDuplicateIndex, repeated_phrases
+from .pattern_engine import PatternEngine
+from .resume_document import ResumeDocument, as_document
+from .section_segmenter import HEADER_SECTION, SECTION_HEADINGS, segment_sections
+
+# Fast ATS mode: default per-document time budget (seconds), and the number of
+# critical issues after which the score can't reach "Good" any more
+ATS_FAST_TIME_BUDGET = 2.0
+ATS_CRITICAL_ISSUE_LIMIT = 3
+
+# Strong action verbs
+STRONG_ACTION_VERBS = frozenset(
+    {
+        "achieved",
+        "improved",
+        "developed",
+        "led",
+        "managed",
+        "created",
+        "designed",
+        "implemented",
+        "increased",
+        "reduced",
+        "optimized",
+        "streamlined",
+        "launched",
+        "spearheaded",
+        "orchestrated",
+        "pioneered",
+        "transformed",
+        "delivered",
+        "executed",
+        "built",
+        "established",
+        "generated",
+        "accelerated",
+        "enhanced",
+        "drove",
+        "initiated",
+        "innovated",
+        "architected",
+        "engineered",
+        "automated",
+        "coordinated",
+        "directed",
+        "exceeded",
+        "maximized",
+        "modernized",
+        "produced",
+        "revamped",
+        "scaled",
+        "secured",
+    }
+)
 
-def analyze_resume_length(text: str) -> Dict[str, any]:
+# Weak/passive verbs to avoid
+WEAK_VERBS = frozenset(
+    {
+        "responsible",
+        "worked",
+        "helped",
+        "assisted",
+        "did",
+        "made",
+        "got",
+        "was",
+        "were",
+        "had",
+        "involved",
+        "participated",
+        "contributed",
+        "handled",
+    }
+)
+
+# Common stop words left out of word clouds and keyword counts
+STOPWORDS = frozenset(
+    {
+        "the",
+        "a",
+        "an",
+        "and",
+        "or",
+        "but",
+        "in",
+        "on",
+        "at",
+        "to",
+        "for",
+        "of",
+        "with",
+        "by",
+        "from",
+        "as",
+        "is",
+        "was",
+        "are",
+        "were",
+        "been",
+        "be",
+        "have",
+        "has",
+        "had",
+        "do",
+        "does",
+        "did",
+        "will",
+        "would",
+        "should",
+        "could",
+        "may",
+        "might",
+        "must",
+        "can",
+        "this",
+        "that",
+        "these",
+        "those",
+    }
+)
+
+# Verb lists share one automaton with any custom lexicons; see load_custom_lexicons
+RESUME_LEXICONS = LexiconMatcher()
+RESUME_LEXICONS.add_lexicon("strong_verbs", STRONG_ACTION_VERBS)
+RESUME_LEXICONS.add_lexicon("weak_verbs", WEAK_VERBS)
+
+# Estimated Jaccard similarity (of 3-word shingles) above which two sentences
+# count as near-duplicates, within one resume and across a batch
+NEAR_DUPLICATE_THRESHOLD = 0.6
+CROSS_RESUME_DUPLICATE_THRESHOLD = 0.8
+
+# Optional directory of custom lexicons: <name>.txt, one term per line
+LEXICON_DIR = os.getenv("LEXICON_DIR")
+
+# Every regex the pattern-based analyzers need; a document is scanned once
+# with all of them and each analyzer reads its own matches
+RESUME_PATTERNS = PatternEngine()
+
+
+def load_custom_lexicons(directory: Optional[str] = None) -> List[str]:
+    """
+    Load every <name>.txt in a directory into RESUME_LEXICONS.
+
+    Args:
+        directory: Lexicon directory; None for LEXICON_DIR
+
+    Returns:
+        Names of the lexicons loaded
+    """
+    directory = directory or LEXICON_DIR
+    if not directory or not os.path.isdir(directory):
+        return []
+
+    names = []
+    for filename in sorted(os.listdir(directory)):
+        name, extension = os.path.splitext(filename)
+        if extension == ".txt":
+            RESUME_LEXICONS.load_lexicon(name, os.path.join(directory, filename))
+            names.append(name)
+    return names
+
+
+load_custom_lexicons()
+
+
+def find_lexicon_terms(
+    text: Union[str, ResumeDocument], lexicon: str
+) -> List[Tuple[str, int]]:
+    """
+    Count the terms of one lexicon found in a resume.
+
+    Args:
+        text: Resume text or ResumeDocument
+        lexicon: Lexicon name in RESUME_LEXICONS (e.g. a custom skill list)
+
+    Returns:
+        List of (term, count), most frequent first
+    """
+    hits = as_document(text).matches(RESUME_LEXICONS)
+    if lexicon not in hits:
+        raise ValueError(f"Unknown lexicon '{lexicon}'")
+    return term_counts(hits[lexicon]).most_common()
+
+
+def analyze_resume_length(text: Union[str, ResumeDocument]) -> Dict[str, any]:
     """
     Analyze resume length metrics
 
     Args:
-        text: Resume text
+        text: Resume text or ResumeDocument
 
     Returns:
         Dictionary with length metrics and recommendations
     """
+    doc = as_document(text)
+
     # Count words (excluding whitespace)
-    words = text.split()
-    word_count = len(words)
+    word_count = len(doc.words)
 
     # Count characters
-    char_count = len(text)
+    char_count = len(doc.text)
 
     # Estimate pages (assuming ~500 words per page)
     estimated_pages = word_count / 500
@@ -55,12 +252,32 @@ def analyze_resume_length(text: str) -> Dict[str, any]:
     }
 
 
-def validate_contact_information(text: str) -> Dict[str, any]:
+RESUME_PATTERNS.add("email", r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b")
+# Phone (various formats)
+RESUME_PATTERNS.add(
+    "phone",
+    r"(?:\+?\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}",
+    trigger=r"[\d(+]",
+)
+RESUME_PATTERNS.add(
+    "linkedin",
+    r"linkedin\.com/in/[\w-]+|LinkedIn:?\s*[\w-]+|linkedin",
+    re.IGNORECASE,
+    first_only=True,
+)
+# GitHub (bonus): a profile URL is preferred over a "GitHub: name" label
+RESUME_PATTERNS.add("github_url", r"github\.com/[\w-]+", re.IGNORECASE, first_only=True)
+RESUME_PATTERNS.add(
+    "github_label", r"GitHub:?\s*[\w-]+", re.IGNORECASE, first_only=True
+)
+
+
+def validate_contact_information(text: Union[str, ResumeDocument]) -> Dict[str, any]:
     """
     Validate presence and format of contact information
 
     Args:
-        text: Resume text
+        text: Resume text or ResumeDocument
 
     Returns:
         Dictionary with contact validation results
@@ -73,88 +290,66 @@ def validate_contact_information(text: str) -> Dict[str, any]:
         "score": 0,
         "missing": [],
     }
+    matches = as_document(text).matches(RESUME_PATTERNS)
 
-    # Email regex
-    email_pattern = r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b"
-    emails = re.findall(email_pattern, text)
-    if emails:
+    if matches["email"]:
         results["email"]["present"] = True
         results["email"]["valid"] = True
-        results["email"]["value"] = emails[0]
+        results["email"]["value"] = matches["email"][0].text
         results["score"] += 25
     else:
         results["missing"].append("Email")
 
-    # Phone regex (various formats)
-    phone_pattern = r"(\+?\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}"
-    phones = re.findall(phone_pattern, text)
-    if phones:
+    if matches["phone"]:
         results["phone"]["present"] = True
         results["phone"]["valid"] = True
-        results["phone"]["value"] = (
-            phones[0] if isinstance(phones[0], str) else "".join(phones[0])
-        )
+        results["phone"]["value"] = matches["phone"][0].text
         results["score"] += 25
     else:
         results["missing"].append("Phone")
 
-    # LinkedIn
-    linkedin_patterns = [
-        r"linkedin\.com/in/[\w-]+",
-        r"LinkedIn:?\s*[\w-]+",
-        r"linkedin",
-    ]
-    for pattern in linkedin_patterns:
-        if re.search(pattern, text, re.IGNORECASE):
-            results["linkedin"]["present"] = True
-            results["score"] += 25
-            break
-    if not results["linkedin"]["present"]:
+    if matches["linkedin"]:
+        results["linkedin"]["present"] = True
+        results["score"] += 25
+    else:
         results["missing"].append("LinkedIn")
 
-    # GitHub (bonus)
-    github_patterns = [
-        r"github\.com/[\w-]+",
-        r"GitHub:?\s*[\w-]+",
-    ]
-    for pattern in github_patterns:
-        match = re.search(pattern, text, re.IGNORECASE)
-        if match:
-            results["github"]["present"] = True
-            results["github"]["value"] = match.group()
-            results["score"] += 25
-            break
+    github = matches["github_url"] or matches["github_label"]
+    if github:
+        results["github"]["present"] = True
+        results["github"]["value"] = github[0].text
+        results["score"] += 25
 
     return results
 
 
-def count_bullet_points(text: str) -> Dict[str, any]:
+# Lines starting with a bullet symbol, asterisk or ">"; [^\S\n] keeps the
+# whitespace on the bullet's own line
+RESUME_PATTERNS.add(
+    "bullet_line", r"^[^\S\n]*(?:[•●○■□▪▫–-]|\*|>)[^\S\n]+", re.MULTILINE
+)
+
+
+def count_bullet_points(text: Union[str, ResumeDocument]) -> Dict[str, any]:
     """
     Count bullet points in resume
 
     Args:
-        text: Resume text
+        text: Resume text or ResumeDocument
 
     Returns:
         Dictionary with bullet point analysis
     """
-    # Common bullet point indicators
-    bullet_patterns = [
-        r"^\s*[•●○■□▪▫–-]\s+",  # Actual bullet symbols
-        r"^\s*\*\s+",  # Asterisk
-        r"^\s*>\s+",  # Greater than
-    ]
+    doc = as_document(text)
+    bullet_matches = doc.matches(RESUME_PATTERNS)["bullet_line"]
+    bullet_count = len(bullet_matches)
 
-    lines = text.split("\n")
-    bullet_count = 0
     bullet_lines = []
-
-    for line in lines:
-        for pattern in bullet_patterns:
-            if re.match(pattern, line):
-                bullet_count += 1
-                bullet_lines.append(line.strip())
-                break
+    for match in bullet_matches[:5]:
+        line_end = doc.text.find("\n", match.start)
+        bullet_lines.append(
+            doc.text[match.start : None if line_end == -1 else line_end].strip()
+        )
 
     # Recommendations
     if bullet_count < 5:
@@ -174,90 +369,29 @@ def count_bullet_points(text: str) -> Dict[str, any]:
         "total_count": bullet_count,
         "recommendation": recommendation,
         "status": status,
-        "sample_bullets": bullet_lines[:5],  # First 5 bullets
+        "sample_bullets": bullet_lines,  # First 5 bullets
     }
 
 
-def analyze_action_verbs(text: str) -> Dict[str, any]:
+def analyze_action_verbs(text: Union[str, ResumeDocument]) -> Dict[str, any]:
     """
     Analyze action verbs in bullet points
 
     Args:
-        text: Resume text
+        text: Resume text or ResumeDocument
 
     Returns:
         Dictionary with action verb analysis
     """
-    # Strong action verbs
-    strong_verbs = {
-        "achieved",
-        "improved",
-        "developed",
-        "led",
-        "managed",
-        "created",
-        "designed",
-        "implemented",
-        "increased",
-        "reduced",
-        "optimized",
-        "streamlined",
-        "launched",
-        "spearheaded",
-        "orchestrated",
-        "pioneered",
-        "transformed",
-        "delivered",
-        "executed",
-        "built",
-        "established",
-        "generated",
-        "accelerated",
-        "enhanced",
-        "drove",
-        "initiated",
-        "innovated",
-        "architected",
-        "engineered",
-        "automated",
-        "coordinated",
-        "directed",
-        "exceeded",
-        "maximized",
-        "modernized",
-        "produced",
-        "revamped",
-        "scaled",
-        "secured",
-    }
-
-    # Weak/passive verbs to avoid
-    weak_verbs = {
-        "responsible",
-        "worked",
-        "helped",
-        "assisted",
-        "did",
-        "made",
-        "got",
-        "was",
-        "were",
-        "had",
-        "involved",
-        "participated",
-        "contributed",
-        "handled",
-    }
+    hits = as_document(text).matches(RESUME_LEXICONS)
 
-    text_lower = text.lower()
-    words = re.findall(r"\b\w+\b", text_lower)
-
-    # Find strong verbs used
-    strong_used = [verb for verb in strong_verbs if verb in words]
+    # Distinct verbs used, most frequent first
+    strong_frequencies = term_counts(hits["strong_verbs"]).most_common()
+    strong_used = [verb for verb, _ in strong_frequencies]
     strong_count = len(strong_used)
 
-    # Find weak verbs used
-    weak_used = [verb for verb in weak_verbs if verb in words]
+    weak_frequencies = term_counts(hits["weak_verbs"]).most_common()
+    weak_used = [verb for verb, _ in weak_frequencies]
     weak_count = len(weak_used)
 
     # Calculate score
@@ -279,78 +413,39 @@ def analyze_action_verbs(text: str) -> Dict[str, any]:
         "weak_verbs_count": weak_count,
         "strong_verbs_used": strong_used[:10],  # Top 10
         "weak_verbs_found": weak_used[:10],
+        "strong_verb_frequencies": dict(strong_frequencies),
+        "weak_verb_frequencies": dict(weak_frequencies),
         "score": round(score, 1),
         "recommendation": recommendation,
         "status": status,
     }
 
 
-def generate_wordcloud(text: str, max_words: int = 50) -> io.BytesIO:
+def generate_wordcloud(
+    text: Union[str, ResumeDocument], max_words: int = 50
+) -> io.BytesIO:
     """
     Generate word cloud from text
 
     Args:
-        text: Text to generate word cloud from
+        text: Text or ResumeDocument to generate word cloud from
         max_words: Maximum words to include
 
     Returns:
         BytesIO object containing word cloud image
     """
-    # Remove common stop words
-    stopwords = {
-        "the",
-        "a",
-        "an",
-        "and",
-        "or",
-        "but",
-        "in",
-        "on",
-        "at",
-        "to",
-        "for",
-        "of",
-        "with",
-        "by",
-        "from",
-        "as",
-        "is",
-        "was",
-        "are",
-        "were",
-        "been",
-        "be",
-        "have",
-        "has",
-        "had",
-        "do",
-        "does",
-        "did",
-        "will",
-        "would",
-        "should",
-        "could",
-        "may",
-        "might",
-        "must",
-        "can",
-        "this",
-        "that",
-        "these",
-        "those",
-    }
 
     # Create word cloud
     wordcloud = WordCloud(
         width=800,
         height=400,
         background_color="white",
-        stopwords=stopwords,
+        stopwords=STOPWORDS,
         max_words=max_words,
         colormap="viridis",
         relative_scaling=0.5,
         min_font_size=10,
-    ).generate(text)
+    ).generate(as_document(text).text)
 
     # Create image
     fig, ax = plt.subplots(figsize=(10, 5))
@@ -367,34 +462,48 @@ def generate_wordcloud(text: str, max_words: int = 50) -> io.BytesIO:
     return img_buffer
 
 
-def check_quantification(text: str) -> Dict[str, any]:
+# Numbers and metrics, in the order their matches are reported, with the
+# trigger each match starts with. \d[\d,]* matches the same text as the
+# original \d+[\d,]* without the ambiguous backtracking between the two.
+QUANTIFICATION_PATTERNS = {
+    "metric_percent": (r"\d+%", None),
+    "metric_money": (r"\$\d+[\d,]*[KMB]?", None),
+    "metric_count": (
+        r"\d[\d,]*\+?\s*(?:users|customers|clients|projects|people|team|members)",
+        None,
+    ),
+    "metric_time": (r"\d[\d,]*\s*(?:hours|days|weeks|months|years)", None),
+    "metric_impact": (
+        r"(?:increased|decreased|improved|reduced|grew|saved)\s+(?:by\s+)?\d+",
+        r"[idrgs]",
+    ),
+}
+for _name, (_pattern, _trigger) in QUANTIFICATION_PATTERNS.items():
+    RESUME_PATTERNS.add(_name, _pattern, re.IGNORECASE, trigger=_trigger)
+# Bullet symbols anywhere in the text (approximate bullet count)
+RESUME_PATTERNS.add("bullet_symbol", r"[•●○■□▪▫–-]\s+")
+
+
+def check_quantification(text: Union[str, ResumeDocument]) -> Dict[str, any]:
     """
     Check for quantified achievements (numbers, percentages, metrics)
 
     Args:
-        text: Resume text
+        text: Resume text or ResumeDocument
 
     Returns:
         Dictionary with quantification analysis
     """
-    # Patterns for numbers and metrics
-    patterns = [
-        r"\d+%",  # Percentages
-        r"\$\d+[\d,]*[KMB]?",  # Money
-        r"\d+[\d,]*\+?\s*(?:users|customers|clients|projects|people|team|members)",  # Counts
-        r"\d+[\d,]*\s*(?:hours|days|weeks|months|years)",  # Time
-        r"(?:increased|decreased|improved|reduced|grew|saved)\s+(?:by\s+)?\d+",  # Impact metrics
-    ]
+    matches = as_document(text).matches(RESUME_PATTERNS)
 
     all_metrics = []
-    for pattern in patterns:
-        matches = re.findall(pattern, text, re.IGNORECASE)
-        all_metrics.extend(matches)
+    for name in QUANTIFICATION_PATTERNS:
+        all_metrics.extend(match.text for match in matches[name])
 
     metrics_count = len(all_metrics)
 
     # Count total bullet points (approximate)
-    bullet_count = len(re.findall(r"[•●○■□▪▫–-]\s+", text))
+    bullet_count = len(matches["bullet_symbol"])
 
     # Calculate percentage of quantified bullets
     if bullet_count > 0:
@@ -421,18 +530,20 @@ def check_quantification(text: str) -> Dict[str, any]:
     }
 
 
-def calculate_readability_score(text: str) -> Dict[str, any]:
+def calculate_readability_score(text: Union[str, ResumeDocument]) -> Dict[str, any]:
     """
     Calculate readability metrics
 
     Args:
-        text: Resume text
+        text: Resume text or ResumeDocument
 
     Returns:
         Dictionary with readability scores
     """
     import textstat
 
+    text = as_document(text).text
+
     # Calculate Flesch Reading Ease score
     flesch_score = textstat.flesch_reading_ease(text)
 
@@ -473,65 +584,23 @@ def calculate_readability_score(text: str) -> Dict[str, any]:
 
 
 def create_keyword_density_map(
-    text: str, job_description: str = None
+    text: Union[str, ResumeDocument],
+    job_description: Union[str, ResumeDocument] = None,
 ) -> Dict[str, any]:
     """
     Analyze keyword frequency and density
 
     Args:
-        text: Resume text
-        job_description: Optional job description for comparison
+        text: Resume text or ResumeDocument
+        job_description: Optional job description (text or ResumeDocument)
 
     Returns:
         Dictionary with keyword frequency data
     """
-    # Remove common stop words
-    stop_words = {
-        "the",
-        "a",
-        "an",
-        "and",
-        "or",
-        "but",
-        "in",
-        "on",
-        "at",
-        "to",
-        "for",
-        "of",
-        "with",
-        "by",
-        "from",
-        "as",
-        "is",
-        "was",
-        "are",
-        "were",
-        "been",
-        "be",
-        "have",
-        "has",
-        "had",
-        "do",
-        "does",
-        "did",
-        "will",
-        "would",
-        "should",
-        "could",
-        "may",
-        "might",
-        "must",
-        "can",
-        "this",
-        "that",
-        "these",
-        "those",
-    }
 
     # Extract words
-    words = re.findall(r"\b[a-zA-Z]{3,}\b", text.lower())
-    filtered_words = [word for word in words if word not in stop_words]
+    words = as_document(text).keyword_tokens
+    filtered_words = [word for word in words if word not in STOPWORDS]
 
     # Count frequency
     word_counts = Counter(filtered_words)
@@ -540,8 +609,8 @@ def create_keyword_density_map(
     # If job description provided, find matching keywords
     matching_keywords = []
     if job_description:
-        jd_words = set(re.findall(r"\b[a-zA-Z]{3,}\b", job_description.lower()))
-        jd_words = jd_words - stop_words
+        jd_words = set(as_document(job_description).keyword_tokens)
+        jd_words = jd_words - STOPWORDS
         matching_keywords = [
             (word, count) for word, count in top_keywords if word in jd_words
         ]
@@ -619,44 +688,24 @@ def export_analysis_to_dict(analysis_result: dict, additional_data: dict) -> dic
     return export_data
 
 
-def detect_resume_sections(text: str) -> Dict[str, any]:
+def detect_resume_sections(text: Union[str, ResumeDocument]) -> Dict[str, any]:
     """
     Detect and validate resume sections
 
+    Sections are found by their heading lines (see section_segmenter), so a
+    word like "experience" in a bullet no longer counts as a section.
+
     Args:
-        text: Resume text
+        text: Resume text or ResumeDocument
 
     Returns:
-        Dictionary with section detection results
-    """
-    sections_found = {
-        "experience": False,
-        "education": False,
-        "skills": False,
-        "summary": False,
-        "projects": False,
-        "certifications": False,
-    }
-
-    section_patterns = {
-        "experience": [
-            r"\b(work\s+experience|professional\s+experience|employment|experience)\b",
-            r"\b(work\s+history|career\s+history)\b",
-        ],
-        "education": [r"\b(education|academic\s+background|qualifications)\b"],
-        "skills": [r"\b(skills|technical\s+skills|core\s+competencies|expertise)\b"],
-        "summary": [r"\b(summary|profile|objective|about\s+me)\b"],
-        "projects": [r"\b(projects|portfolio|work\s+samples)\b"],
-        "certifications": [r"\b(certifications|certificates|licenses)\b"],
-    }
-
-    text_lower = text.lower()
-
-    for section, patterns in section_patterns.items():
-        for pattern in patterns:
-            if re.search(pattern, text_lower):
-                sections_found[section] = True
-                break
+        Dictionary with section detection results, including the section
+        spans (offsets, heading, confidence) in document order
+    """
+    spans = [span for span in segment_sections(text) if span.name != HEADER_SECTION]
+    sections_found = {section: False for section in SECTION_HEADINGS}
+    for span in spans:
+        sections_found[span.name] = True
 
     # Check for required sections
     required = ["experience", "education", "skills"]
@@ -671,157 +720,298 @@ def detect_resume_sections(text: str) -> Dict[str, any]:
 
     return {
         "sections_found": sections_found,
+        "sections": spans,
         "missing_required": missing_required,
         "status": status,
         "recommendation": recommendation,
     }
 
 
-def validate_ats_format(pdf_path: str) -> Dict[str, any]:
+def _has_column_gutter(profile: PageProfile, page_width: float) -> bool:
     """
-    Validate resume for ATS-friendly formatting
+    Detect a multi-column layout from a page's x-position histogram.
+
+    Looks for a run of at least two near-empty buckets in the middle half of
+    the page, with at least 15% of the page's characters on each side of it.
+    """
+    if profile.char_count < 100:
+        return False
+
+    # A heading or a stray character may cross the gutter
+    sparse = max(1, profile.char_count * 0.002)
+    first = int(page_width * 0.25 // X_BUCKET_WIDTH)
+    last = int(page_width * 0.75 // X_BUCKET_WIDTH)
+
+    run_start = None
+    for bucket in range(first, last + 1):
+        if profile.x_histogram.get(bucket, 0) <= sparse:
+            if run_start is None:
+                run_start = bucket
+            continue
+
+        if run_start is not None and bucket - run_start >= 2:
+            left = sum(c for b, c in profile.x_histogram.items() if b < run_start)
+            right = sum(c for b, c in profile.x_histogram.items() if b >= bucket)
+            if min(left, right) >= profile.char_count * 0.15:
+                return True
+        run_start = None
+
+    return False
+
+
+def _format_page_ranges(page_numbers: List[int]) -> str:
+    """Compact page label: [3, 4, 5, 9] -> 'Pages 3-5, 9', [7] -> 'Page 7'"""
+    ranges = []
+    for page_num in sorted(page_numbers):
+        if ranges and page_num == ranges[-1][1] + 1:
+            ranges[-1][1] = page_num
+        else:
+            ranges.append([page_num, page_num])
+    label = "Page" if len(page_numbers) == 1 else "Pages"
+    return f"{label} " + ", ".join(
+        str(start) if start == end else f"{start}-{end}" for start, end in ranges
+    )
+
+
+def _ats_sample_pages(page_count: int) -> List[int]:
+    """Pages checked in fast mode: the first two and the last"""
+    return sorted({p for p in (1, 2, page_count) if 1 <= p <= page_count})
+
+
+def _check_ats_pages(
+    raw_metadata: dict,
+    page_count: int,
+    get_page: Callable[[int, bool], ParsedPage],
+    mode: str,
+    deadline: Optional[float],
+) -> Dict[str, any]:
+    """
+    Run the ATS checks over a document's pages.
 
     Args:
-        pdf_path: Path to PDF file
+        raw_metadata: PDF metadata dictionary
+        page_count: Number of pages in the document
+        get_page: Returns the ParsedPage for a 1-based page number; the second
+            argument says whether table detection may still run
+        mode: "full" checks every page, "fast" samples pages and stops once
+            the score is determined
+        deadline: time.perf_counter() value after which remaining work is skipped
 
     Returns:
         Dictionary with ATS validation results
     """
-    import pdfplumber
-
+    fast = mode == "fast"
     issues = []
     warnings = []
     metadata = {}
+    skipped_checks = []
+
+    def out_of_time() -> bool:
+        return deadline is not None and time.perf_counter() > deadline
+
+    # Extract metadata
+    if raw_metadata:
+        metadata = {
+            "title": raw_metadata.get("Title", "Not set"),
+            "author": raw_metadata.get("Author", "Not set"),
+            "creator": raw_metadata.get("Creator", "Not set"),
+            "producer": raw_metadata.get("Producer", "Not set"),
+        }
 
-    try:
-        with pdfplumber.open(pdf_path) as pdf:
-            # Extract metadata
-            if pdf.metadata:
-                metadata = {
-                    "title": pdf.metadata.get("Title", "Not set"),
-                    "author": pdf.metadata.get("Author", "Not set"),
-                    "creator": pdf.metadata.get("Creator", "Not set"),
-                    "producer": pdf.metadata.get("Producer", "Not set"),
-                }
+    page_numbers = list(range(1, page_count + 1))
+    if fast:
+        page_numbers = _ats_sample_pages(page_count)
+        unsampled = sorted(set(range(1, page_count + 1)) - set(page_numbers))
+        if unsampled:
+            skipped_checks.append(
+                f"{_format_page_ranges(unsampled)}: not sampled in fast mode"
+            )
 
-            # Check each page
-            has_tables = False
-            has_images = False
-            has_headers_footers = False
-            font_issues = []
-            unique_fonts = set()
-
-            for page_num, page in enumerate(pdf.pages, 1):
-                # Check for tables
-                tables = page.find_tables()
-                if tables:
-                    has_tables = True
-                    issues.append(
-                        f"Page {page_num}: Contains tables (ATS may not parse correctly)"
-                    )
-
-                # Check for images
-                if page.images:
-                    has_images = True
-                    warnings.append(
-                        f"Page {page_num}: Contains {len(page.images)} image(s)"
-                    )
-
-                # Check for headers/footers (text in top/bottom 1 inch)
-                page_height = page.height
-                text_objects = page.extract_words()
-
-                for obj in text_objects:
-                    # Check if in header (top 72 points / 1 inch)
-                    if obj["top"] < 72:
-                        has_headers_footers = True
-                    # Check if in footer (bottom 72 points / 1 inch)
-                    elif obj["bottom"] > (page_height - 72):
-                        has_headers_footers = True
-
-                    # Collect fonts
-                    if "fontname" in obj:
-                        unique_fonts.add(obj["fontname"])
-
-            # Check fonts
-            unusual_fonts = [
-                f
-                for f in unique_fonts
-                if not any(
-                    standard in f.lower()
-                    for standard in [
-                        "arial",
-                        "calibri",
-                        "times",
-                        "helvetica",
-                        "georgia",
-                        "verdana",
-                    ]
-                )
+    # Check each page
+    has_tables = False
+    has_images = False
+    has_headers_footers = False
+    multi_column = False
+    font_issues = []
+    font_chars = Counter()
+    size_chars = Counter()
+    pages_checked = []
+
+    for index, page_num in enumerate(page_numbers):
+        remaining = page_numbers[index:]
+        critical_count = len(issues) + has_headers_footers + multi_column
+        if fast and critical_count >= ATS_CRITICAL_ISSUE_LIMIT:
+            skipped_checks.append(
+                f"{_format_page_ranges(remaining)}: skipped, score already "
+                f"determined by {critical_count} critical issues"
+            )
+            break
+        if out_of_time():
+            skipped_checks.append(
+                f"{_format_page_ranges(remaining)}: skipped, time budget exhausted"
+            )
+            break
+
+        page = get_page(page_num, not out_of_time())
+        pages_checked.append(page_num)
+
+        # Check for tables
+        if page.tables is None:
+            skipped_checks.append(
+                f"Page {page_num}: table detection skipped, time budget exhausted"
+            )
+        elif page.tables:
+            has_tables = True
+            issues.append(
+                f"Page {page_num}: Contains tables (ATS may not parse correctly)"
+            )
+
+        # Check for images
+        if page.images:
+            has_images = True
+            warnings.append(f"Page {page_num}: Contains {len(page.images)} image(s)")
+
+        # Check for headers/footers (text in top/bottom 1 inch)
+        if page.profile.header_chars or page.profile.footer_chars:
+            has_headers_footers = True
+
+        # Multi-column detection: a near-empty vertical gutter in the middle of
+        # the first page with substantial text on both sides
+        if page_num == 1:
+            multi_column = _has_column_gutter(page.profile, page.width)
+
+        # Collect fonts
+        font_chars.update(page.profile.fonts)
+        size_chars.update(page.profile.font_sizes)
+
+    # Characters without a font name say nothing about the fonts used
+    unique_fonts = {font for font in font_chars if font.strip()}
+
+    # Check fonts
+    unusual_fonts = [
+        f
+        for f in unique_fonts
+        if not any(
+            standard in f.lower()
+            for standard in [
+                "arial",
+                "calibri",
+                "times",
+                "helvetica",
+                "georgia",
+                "verdana",
             ]
+        )
+    ]
 
-            if unusual_fonts:
-                font_issues.extend(unusual_fonts)
-                warnings.append(
-                    f"Unusual fonts detected: {', '.join(unusual_fonts[:3])}"
-                )
-
-            if len(unique_fonts) > 3:
-                warnings.append(
-                    f"Multiple fonts used ({len(unique_fonts)}). Recommend 1-2 fonts max"
-                )
-
-            if has_headers_footers:
-                issues.append("Headers/footers detected - ATS may ignore this content")
-
-            # Multi-column detection (approximate)
-            if len(pdf.pages) > 0:
-                first_page = pdf.pages[0]
-                words = first_page.extract_words()
-                if words:
-                    # Check if text is spread across width (potential columns)
-                    x_positions = [w["x0"] for w in words]
-                    if len(set(x_positions)) > 50:  # Many different x positions
-                        left_side = [w for w in words if w["x0"] < first_page.width / 2]
-                        right_side = [
-                            w for w in words if w["x0"] >= first_page.width / 2
-                        ]
-                        if len(left_side) > 10 and len(right_side) > 10:
-                            issues.append(
-                                "Multi-column layout detected - ATS may read out of order"
-                            )
-
-        # Calculate ATS score
-        ats_score = 100
-        ats_score -= len(issues) * 15  # Major issues
-        ats_score -= len(warnings) * 5  # Minor warnings
-        ats_score = max(0, min(100, ats_score))
-
-        if ats_score >= 80:
-            status = "success"
-            overall = "Excellent ATS compatibility"
-        elif ats_score >= 60:
-            status = "warning"
-            overall = "Good ATS compatibility with minor issues"
-        else:
-            status = "error"
-            overall = "Poor ATS compatibility - significant issues found"
+    if unusual_fonts:
+        font_issues.extend(unusual_fonts)
+        warnings.append(f"Unusual fonts detected: {', '.join(unusual_fonts[:3])}")
 
-        return {
-            "ats_score": ats_score,
-            "status": status,
-            "overall": overall,
-            "issues": issues,
-            "warnings": warnings,
-            "metadata": metadata,
-            "has_tables": has_tables,
-            "has_images": has_images,
-            "has_headers_footers": has_headers_footers,
-            "font_count": len(unique_fonts),
-            "unusual_fonts": font_issues,
-        }
+    if len(unique_fonts) > 3:
+        warnings.append(
+            f"Multiple fonts used ({len(unique_fonts)}). Recommend 1-2 fonts max"
+        )
+
+    if has_headers_footers:
+        issues.append("Headers/footers detected - ATS may ignore this content")
+
+    if multi_column:
+        issues.append("Multi-column layout detected - ATS may read out of order")
+
+    # Calculate ATS score
+    ats_score = 100
+    ats_score -= len(issues) * 15  # Major issues
+    ats_score -= len(warnings) * 5  # Minor warnings
+    ats_score = max(0, min(100, ats_score))
+
+    if ats_score >= 80:
+        status = "success"
+        overall = "Excellent ATS compatibility"
+    elif ats_score >= 60:
+        status = "warning"
+        overall = "Good ATS compatibility with minor issues"
+    else:
+        status = "error"
+        overall = "Poor ATS compatibility - significant issues found"
+
+    return {
+        "ats_score": ats_score,
+        "status": status,
+        "overall": overall,
+        "issues": issues,
+        "warnings": warnings,
+        "metadata": metadata,
+        "has_tables": has_tables,
+        "has_images": has_images,
+        "has_headers_footers": has_headers_footers,
+        "font_count": len(unique_fonts),
+        "unusual_fonts": font_issues,
+        "body_font_size": size_chars.most_common(1)[0][0] if size_chars else 0,
+        "mode": mode,
+        "pages_checked": pages_checked,
+        "skipped_checks": skipped_checks,
+    }
+
+
+def validate_ats_format(
+    pdf_source, mode: str = "full", time_budget: Optional[float] = None
+) -> Dict[str, any]:
+    """
+    Validate resume for ATS-friendly formatting
+
+    Args:
+        pdf_source: ParsedPDF from parse_pdf, a path to a PDF file, or the PDF
+            in memory (bytes, bytearray, memoryview or BytesIO)
+        mode: "full" checks every page. "fast" checks only the first two and
+            last pages and stops once ATS_CRITICAL_ISSUE_LIMIT critical issues
+            are found, for bulk screening.
+        time_budget: Seconds to spend on the document; pages and table checks
+            past the budget are skipped. Defaults to ATS_FAST_TIME_BUDGET in
+            fast mode and no limit in full mode.
+
+    Returns:
+        Dictionary with ATS validation results. skipped_checks lists any
+        pages or checks left out by sampling, early exit or the time budget.
+    """
+    if mode not in ("full", "fast"):
+        raise ValueError(f"Unknown ATS validation mode '{mode}'")
+    if mode == "fast" and time_budget is None:
+        time_budget = ATS_FAST_TIME_BUDGET
+    deadline = time.perf_counter() + time_budget if time_budget is not None else None
+
+    try:
+        if isinstance(pdf_source, ParsedPDF) or (mode == "full" and deadline is None):
+            pdf = pdf_source
+            if not isinstance(pdf, ParsedPDF):
+                pdf = parse_pdf(pdf_source)
+                if pdf is None:
+                    raise ValueError("PDF could not be parsed")
+
+            return _check_ats_pages(
+                pdf.metadata,
+                pdf.page_count,
+                lambda page_num, detect_tables: pdf.pages[page_num - 1],
+                mode,
+                deadline,
+            )
+
+        # Parse pages one at a time so sampling and the budget avoid the work
+        with open_pdf(pdf_source) as pdf:
+            return _check_ats_pages(
+                pdf.metadata,
+                len(pdf.pages),
+                lambda page_num, detect_tables: parse_page(
+                    pdf.pages[page_num - 1],
+                    detect_tables=detect_tables,
+                    include_text=False,
+                ),
+                mode,
+                deadline,
+            )
 
     except Exception as e:
+        reraise_in_sandbox(e)
         return {
             "ats_score": 0,
             "status": "error",
@@ -834,32 +1024,46 @@ def validate_ats_format(pdf_path: str) -> Dict[str, any]:
             "has_headers_footers": False,
             "font_count": 0,
             "unusual_fonts": [],
+            "body_font_size": 0,
+            "mode": mode,
+            "pages_checked": [],
+            "skipped_checks": [],
         }
 
 
-def check_date_formats(text: str) -> Dict[str, any]:
+# Date format name -> (pattern, trigger)
+DATE_PATTERNS = {
+    "MM/YYYY": (r"\b\d{2}/\d{4}\b", r"\d"),
+    "Month YYYY": (
+        r"\b(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]* \d{4}\b",
+        r"[jfmasond]",
+    ),
+    "YYYY-MM": (r"\b\d{4}-\d{2}\b", r"\d"),
+    "Month, YYYY": (
+        r"\b(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*, \d{4}\b",
+        r"[jfmasond]",
+    ),
+}
+for _index, (_pattern, _trigger) in enumerate(DATE_PATTERNS.values()):
+    RESUME_PATTERNS.add(f"date_{_index}", _pattern, re.IGNORECASE, trigger=_trigger)
+
+
+def check_date_formats(text: Union[str, ResumeDocument]) -> Dict[str, any]:
     """
     Check for inconsistent date formats
 
     Args:
-        text: Resume text
+        text: Resume text or ResumeDocument
 
     Returns:
         Dictionary with date format analysis
     """
-    # Various date patterns
-    date_patterns = {
-        "MM/YYYY": r"\b\d{2}/\d{4}\b",
-        "Month YYYY": r"\b(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]* \d{4}\b",
-        "YYYY-MM": r"\b\d{4}-\d{2}\b",
-        "Month, YYYY": r"\b(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*, \d{4}\b",
-    }
+    matches = as_document(text).matches(RESUME_PATTERNS)
 
     formats_found = {}
-    for format_name, pattern in date_patterns.items():
-        matches = re.findall(pattern, text, re.IGNORECASE)
-        if matches:
-            formats_found[format_name] = len(matches)
+    for index, format_name in enumerate(DATE_PATTERNS):
+        if matches[f"date_{index}"]:
+            formats_found[format_name] = len(matches[f"date_{index}"])
 
     if len(formats_found) == 0:
         status = "warning"
@@ -881,42 +1085,47 @@ def check_date_formats(text: str) -> Dict[str, any]:
     }
 
 
-def find_duplicate_content(text: str) -> Dict[str, any]:
+def find_duplicate_content(text: Union[str, ResumeDocument]) -> Dict[str, any]:
     """
     Find repeated phrases and duplicate content
 
     Args:
-        text: Resume text
+        text: Resume text or ResumeDocument
 
     Returns:
         Dictionary with duplicate content analysis
     """
-    # Split into sentences
-    sentences = re.split(r"[.!?]+", text)
-    sentences = [s.strip() for s in sentences if len(s.strip()) > 20]
+    doc = as_document(text)
+
+    # Sentences long enough to be meaningful duplicates
+    units = [
+        index for index, sentence in enumerate(doc.sentences) if len(sentence) > 20
+    ]
+    sentences = [doc.sentences[index] for index in units]
 
     # Find exact duplicates
     sentence_counts = Counter(sentences)
     duplicates = [(sent, count) for sent, count in sentence_counts.items() if count > 1]
 
     # Find similar phrases (5+ words)
-    phrases = []
-    for sentence in sentences:
-        words = sentence.split()
-        for i in range(len(words) - 4):
-            phrase = " ".join(words[i : i + 5])
-            if len(phrase) > 20:
-                phrases.append(phrase.lower())
-
-    phrase_counts = Counter(phrases)
-    repeated_phrases = [
-        (phrase, count) for phrase, count in phrase_counts.items() if count > 1
+    phrases = repeated_phrases(sentences, size=5)
+
+    # Find reworded sentences; exact repeats are already reported above
+    index = NearDuplicateIndex(threshold=NEAR_DUPLICATE_THRESHOLD)
+    indexed = set()
+    for unit in units:
+        if doc.sentences[unit] not in indexed:
+            indexed.add(doc.sentences[unit])
+            index.add(unit, doc.tokens_between(*doc.sentence_spans[unit]))
+    near_duplicates = [
+        (doc.sentences[min(pair[:2])], doc.sentences[max(pair[:2])], pair.similarity)
+        for pair in index.near_duplicates()
     ]
 
-    if len(duplicates) == 0 and len(repeated_phrases) == 0:
+    if not duplicates and not phrases and not near_duplicates:
         status = "success"
         recommendation = "No duplicate content found - good variety"
-    elif len(duplicates) > 2 or len(repeated_phrases) > 5:
+    elif len(duplicates) > 2 or len(phrases) > 5 or len(near_duplicates) > 2:
         status = "warning"
         recommendation = "Significant duplicate content found - vary your descriptions"
     else:
@@ -925,9 +1134,52 @@ def find_duplicate_content(text: str) -> Dict[str, any]:
 
     return {
         "duplicate_sentences": len(duplicates),
-        "repeated_phrases": len(repeated_phrases),
+        "repeated_phrases": len(phrases),
+        "near_duplicate_sentences": len(near_duplicates),
         "duplicates": duplicates[:5],  # Top 5
-        "phrases": repeated_phrases[:5],  # Top 5
+        "phrases": phrases[:5],  # Top 5
+        "near_duplicates": near_duplicates[:5],  # Most similar 5
         "status": status,
         "recommendation": recommendation,
     }
+
+
+def find_cross_resume_duplicates(
+    resumes: Dict[str, Union[str, ResumeDocument]],
+    threshold: float = CROSS_RESUME_DUPLICATE_THRESHOLD,
+) -> List[Dict[str, any]]:
+    """
+    Find near-identical sentences shared by different resumes in a batch
+
+    Catches template-generated applications: the same bullets lightly
+    reworded across several resumes.
+
+    Args:
+        resumes: Resume name -> text or ResumeDocument
+        threshold: Minimum estimated Jaccard similarity of two sentences
+
+    Returns:
+        List of dictionaries with resume_a, resume_b, sentence_a, sentence_b
+        and similarity, most similar first
+    """
+    documents = {name: as_document(text) for name, text in resumes.items()}
+    index = NearDuplicateIndex(threshold=threshold)
+    for name, doc in documents.items():
+        for unit, sentence in enumerate(doc.sentences):
+            if len(sentence) > 20:
+                index.add((name, unit), doc.tokens_between(*doc.sentence_spans[unit]))
+
+    shared = []
+    for pair in index.near_duplicates():
+        (name_a, unit_a), (name_b, unit_b) = sorted(pair[:2])
+        if name_a != name_b:
+            shared.append(
+                {
+                    "resume_a": name_a,
+                    "resume_b": name_b,
+                    "sentence_a": documents[name_a].sentences[unit_a],
+                    "sentence_b": documents[name_b].sentences[unit_b],
+                    "similarity": pair.similarity,
+                }
+            )
+    return shared
@@ -0,0 +1,160 @@
+"""Tokenized resume text shared by every analyzer"""
+
+import re
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from functools import cached_property, lru_cache
+from typing import Any, Dict, FrozenSet, List, Tuple, Union
+
+_TOKEN_RE = re.compile(r"\w+")
+_SENTENCE_SPLIT_RE = re.compile(r"[.!?]+")
+
+# Resume texts whose documents are kept around, so analyzers called one after
+# another with the same string only tokenize it once
+DOCUMENT_CACHE_SIZE = 16
+
+
+@dataclass
+class ResumeDocument:
+    """
+    Resume text split and tokenized once.
+
+    Analyzers read the views they need (lines, sentences, tokens) from this
+    object instead of re-tokenizing the raw string.
+    """
+
+    # Text with line endings normalized to "\n"
+    text: str
+    lines: List[str] = field(default_factory=list)
+    # Non-empty, stripped sentences split on . ! ?, and their offsets in text
+    sentences: List[str] = field(default_factory=list)
+    sentence_spans: List[Tuple[int, int]] = field(default_factory=list)
+    # Whitespace-delimited words, as text.split()
+    words: List[str] = field(default_factory=list)
+    # Lowercase \w+ tokens and their (start, end) offsets in text
+    tokens: List[str] = field(default_factory=list)
+    token_spans: List[Tuple[int, int]] = field(default_factory=list)
+    # Engine version and scan results per engine (PatternEngine,
+    # LexiconMatcher), filled by matches()
+    _matches: Dict[Any, Tuple[int, Dict[str, list]]] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+
+    @classmethod
+    def from_text(cls, text: str) -> "ResumeDocument":
+        """
+        Build a document from raw resume text.
+
+        Args:
+            text: Resume text
+
+        Returns:
+            ResumeDocument
+        """
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+
+        tokens = []
+        token_spans = []
+        for match in _TOKEN_RE.finditer(text):
+            tokens.append(match.group().lower())
+            token_spans.append(match.span())
+
+        sentences = []
+        sentence_spans = []
+        start = 0
+        for end, next_start in [
+            *((m.start(), m.end()) for m in _SENTENCE_SPLIT_RE.finditer(text)),
+            (len(text), len(text)),
+        ]:
+            sentence = text[start:end].strip()
+            if sentence:
+                offset = text.index(sentence, start)
+                sentences.append(sentence)
+                sentence_spans.append((offset, offset + len(sentence)))
+            start = next_start
+
+        return cls(
+            text=text,
+            lines=text.split("\n"),
+            sentences=sentences,
+            sentence_spans=sentence_spans,
+            words=text.split(),
+            tokens=tokens,
+            token_spans=token_spans,
+        )
+
+    @cached_property
+    def text_lower(self) -> str:
+        return self.text.lower()
+
+    @cached_property
+    def vocabulary(self) -> FrozenSet[str]:
+        """Distinct lowercase tokens, for O(1) membership tests"""
+        return frozenset(self.tokens)
+
+    @cached_property
+    def keyword_tokens(self) -> List[str]:
+        """Lowercase tokens made of 3+ ASCII letters, in document order"""
+        return [
+            token
+            for token in self.tokens
+            if len(token) >= 3 and token.isascii() and token.isalpha()
+        ]
+
+    @cached_property
+    def _token_starts(self) -> List[int]:
+        return [start for start, _ in self.token_spans]
+
+    def tokens_between(self, start: int, end: int) -> List[str]:
+        """
+        Lowercase tokens that lie within a character range.
+
+        Args:
+            start: Start offset in text
+            end: End offset in text
+
+        Returns:
+            Slice of tokens, without re-tokenizing
+        """
+        first = bisect_left(self._token_starts, start)
+        last = bisect_left(self._token_starts, end, lo=first)
+        return self.tokens[first:last]
+
+    def matches(self, engine) -> Dict[str, list]:
+        """
+        Scan the document with an engine, once per engine and engine version.
+
+        Args:
+            engine: PatternEngine, LexiconMatcher or anything else with a
+                scan_document(doc) method. An engine whose results can change
+                (e.g. when a lexicon is added) has a version attribute that
+                goes up on every change.
+
+        Returns:
+            Dictionary mapping pattern or lexicon names to their matches
+        """
+        version = getattr(engine, "version", 0)
+        cached = self._matches.get(engine)
+        if cached is None or cached[0] != version:
+            cached = self._matches[engine] = (version, engine.scan_document(self))
+        return cached[1]
+
+
+@lru_cache(maxsize=DOCUMENT_CACHE_SIZE)
+def _document_from_text(text: str) -> ResumeDocument:
+    return ResumeDocument.from_text(text)
+
+
+def as_document(source: Union[str, ResumeDocument]) -> ResumeDocument:
+    """
+    Accept either raw text or an already-built document.
+
+    Args:
+        source: Resume text or ResumeDocument
+
+    Returns:
+        ResumeDocument for the source
+    """
+    if isinstance(source, ResumeDocument):
+        return source
+    return _document_from_text(source)
@@ -0,0 +1,224 @@
+"""
+Run PDF extraction and ATS validation in a resource-limited subprocess
+
+A malicious or pathological PDF (deep object trees, huge content streams) can
+keep pdfplumber busy indefinitely. Running the work in a child process with
+a wall-clock timeout and RLIMIT_CPU / RLIMIT_AS limits bounds how long and how
+much memory one document can take, without tying up the Streamlit worker.
+"""
+
+import gc
+import os
+import signal
+import time
+from typing import Any, Callable, Dict, Optional
+
+try:
+    import resource
+except ImportError:  # Windows: only the wall-clock timeout applies
+    resource = None
+
+from . import pdf_extractor
+from .pdf_extractor import ParsedPDF, read_pdf_bytes
+
+# Opt-in switch for the app: parse uploads in the sandbox
+SANDBOX_ENABLED = os.getenv("PDF_SANDBOX", "false").lower() in ("1", "true", "yes")
+SANDBOX_TIMEOUT_SECONDS = float(os.getenv("SANDBOX_TIMEOUT_SECONDS", "30"))
+SANDBOX_CPU_SECONDS = int(os.getenv("SANDBOX_CPU_SECONDS", "20"))
+SANDBOX_MEMORY_MB = int(os.getenv("SANDBOX_MEMORY_MB", "1024"))
+
+
+def _apply_limits(cpu_seconds: Optional[int], memory_mb: Optional[int]) -> None:
+    if resource is None:
+        return
+    if cpu_seconds:
+        # SIGXCPU at the soft limit, SIGKILL one second later
+        resource.setrlimit(resource.RLIMIT_CPU, (cpu_seconds, cpu_seconds + 1))
+    if memory_mb:
+        limit = memory_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+
+def _sandbox_entry(conn, func, args, kwargs, cpu_seconds, memory_mb) -> None:
+    """Child process entry point: apply limits, run func, send back the outcome"""
+    too_expensive = ("too_expensive", f"memory limit of {memory_mb} MB exceeded")
+    try:
+        _apply_limits(cpu_seconds, memory_mb)
+        # Keep all the work inside this limited process, and let memory
+        # errors through to be reported as too expensive
+        pdf_extractor.MAX_PAGE_WORKERS = 1
+        pdf_extractor.RAISE_MEMORY_ERRORS = True
+        outcome = ("ok", func(*args, **kwargs))
+    except MemoryError:
+        outcome = too_expensive
+    except Exception as e:
+        outcome = ("error", str(e))
+
+    # Outside the except blocks, so the traceback and the objects its frames
+    # held are released before the reply is pickled
+    gc.collect()
+    try:
+        conn.send(outcome)
+    except MemoryError:
+        conn.send(too_expensive)
+    finally:
+        conn.close()
+
+
+def run_isolated(
+    func: Callable,
+    *args,
+    timeout: Optional[float] = None,
+    cpu_seconds: Optional[int] = None,
+    memory_mb: Optional[int] = None,
+    **kwargs,
+) -> Dict[str, Any]:
+    """
+    Run func(*args, **kwargs) in a resource-limited child process.
+
+    func, its arguments and its return value must be picklable.
+
+    Args:
+        func: Module-level function to run
+        timeout: Wall-clock limit in seconds (default SANDBOX_TIMEOUT_SECONDS)
+        cpu_seconds: RLIMIT_CPU for the child (default SANDBOX_CPU_SECONDS)
+        memory_mb: RLIMIT_AS for the child (default SANDBOX_MEMORY_MB)
+
+    Returns:
+        Dictionary with status ("ok", "too_expensive" or "error"), result,
+        reason and elapsed_seconds
+    """
+    timeout = SANDBOX_TIMEOUT_SECONDS if timeout is None else timeout
+    cpu_seconds = SANDBOX_CPU_SECONDS if cpu_seconds is None else cpu_seconds
+    memory_mb = SANDBOX_MEMORY_MB if memory_mb is None else memory_mb
+
+    ctx = pdf_extractor.process_context()
+    parent_conn, child_conn = ctx.Pipe(duplex=False)
+    process = ctx.Process(
+        target=_sandbox_entry,
+        args=(child_conn, func, args, kwargs, cpu_seconds, memory_mb),
+        daemon=True,
+    )
+
+    start = time.perf_counter()
+    process.start()
+    child_conn.close()
+
+    outcome = None
+    try:
+        if parent_conn.poll(timeout):
+            outcome = parent_conn.recv()
+    except EOFError:
+        # Child died without reporting (e.g. killed by RLIMIT_CPU)
+        pass
+    finally:
+        if process.is_alive():
+            process.kill()
+        process.join()
+        parent_conn.close()
+
+    elapsed = round(time.perf_counter() - start, 3)
+
+    if outcome is None:
+        cpu_signals = {-signal.SIGKILL, -getattr(signal, "SIGXCPU", signal.SIGKILL)}
+        if elapsed >= timeout:
+            status, reason = "too_expensive", f"timed out after {timeout}s"
+        elif process.exitcode in cpu_signals:
+            status, reason = "too_expensive", f"CPU limit of {cpu_seconds}s exceeded"
+        elif memory_mb and process.exitcode == -signal.SIGABRT:
+            # Python aborts when it runs out of memory while raising MemoryError
+            status, reason = "too_expensive", f"memory limit of {memory_mb} MB exceeded"
+        else:
+            status, reason = "error", f"worker exited with code {process.exitcode}"
+        outcome = (status, reason)
+
+    status, value = outcome
+    return {
+        "status": status,
+        "result": value if status == "ok" else None,
+        "reason": "" if status == "ok" else value,
+        "elapsed_seconds": elapsed,
+    }
+
+
+def extract_text_isolated(pdf_file, engine: Optional[str] = None, **limits) -> dict:
+    """
+    extract_text_from_pdf in a sandboxed subprocess.
+
+    Args:
+        pdf_file: Any PDF source accepted by extract_text_from_pdf
+        engine: Text engine name; None for the default
+        **limits: timeout, cpu_seconds and memory_mb overrides for run_isolated
+
+    Returns:
+        run_isolated result; result is the extracted text (or None)
+    """
+    return run_isolated(
+        pdf_extractor.extract_text_from_pdf,
+        bytes(read_pdf_bytes(pdf_file)),
+        engine=engine,
+        **limits,
+    )
+
+
+def parse_pdf_isolated(pdf_file, **limits) -> dict:
+    """
+    parse_pdf in a sandboxed subprocess.
+
+    Args:
+        pdf_file: Any PDF source accepted by parse_pdf
+        **limits: timeout, cpu_seconds and memory_mb overrides for run_isolated
+
+    Returns:
+        run_isolated result; result is the ParsedPDF (or None)
+    """
+    return run_isolated(
+        pdf_extractor.parse_pdf, bytes(read_pdf_bytes(pdf_file)), **limits
+    )
+
+
+def validate_ats_isolated(
+    pdf_source, mode: str = "full", time_budget: Optional[float] = None, **limits
+) -> dict:
+    """
+    validate_ats_format in a sandboxed subprocess.
+
+    Args:
+        pdf_source: ParsedPDF or any PDF source accepted by validate_ats_format
+        mode: "full" or "fast", as for validate_ats_format
+        time_budget: Cooperative budget passed through to validate_ats_format
+        **limits: timeout, cpu_seconds and memory_mb overrides for run_isolated
+
+    Returns:
+        ATS validation results in the usual shape. If the document exceeds
+        the limits, the result is an error with too_expensive set to True.
+    """
+    from .resume_analyzer import validate_ats_format
+
+    if not isinstance(pdf_source, ParsedPDF):
+        pdf_source = bytes(read_pdf_bytes(pdf_source))
+
+    outcome = run_isolated(validate_ats_format, pdf_source, mode, time_budget, **limits)
+    if outcome["status"] == "ok":
+        return dict(outcome["result"], too_expensive=False)
+
+    too_expensive = outcome["status"] == "too_expensive"
+    summary = "PDF too expensive to analyze" if too_expensive else "Error analyzing PDF"
+    return {
+        "ats_score": 0,
+        "status": "error",
+        "overall": f"{summary}: {outcome['reason']}",
+        "issues": [f"Could not analyze PDF: {outcome['reason']}"],
+        "warnings": [],
+        "metadata": {},
+        "has_tables": False,
+        "has_images": False,
+        "has_headers_footers": False,
+        "font_count": 0,
+        "unusual_fonts": [],
+        "body_font_size": 0,
+        "mode": mode,
+        "pages_checked": [],
+        "skipped_checks": [],
+        "too_expensive": too_expensive,
+    }
@@ -0,0 +1,253 @@
+"""Resume section segmentation by a single pass over the lines"""
+
+import re
+from typing import Dict, List, NamedTuple, Optional, Tuple, Union
+
+from .resume_document import ResumeDocument, as_document
+
+# Heading phrases per section, in normalized form (lowercase letters and
+# single spaces, "&" spelled "and")
+SECTION_HEADINGS = {
+    "experience": [
+        "experience",
+        "work experience",
+        "professional experience",
+        "relevant experience",
+        "employment",
+        "employment history",
+        "work history",
+        "career history",
+    ],
+    "education": [
+        "education",
+        "academic background",
+        "qualifications",
+        "education and training",
+    ],
+    "skills": [
+        "skills",
+        "technical skills",
+        "core competencies",
+        "competencies",
+        "expertise",
+        "technologies",
+    ],
+    "summary": [
+        "summary",
+        "professional summary",
+        "profile",
+        "objective",
+        "career objective",
+        "about me",
+    ],
+    "projects": ["projects", "portfolio", "work samples"],
+    "certifications": [
+        "certifications",
+        "certificates",
+        "licenses",
+        "licenses and certifications",
+    ],
+}
+
+# Name of the span before the first heading (usually name and contact details)
+HEADER_SECTION = "header"
+
+# Lines with more words than this are never headings
+MAX_HEADING_WORDS = 6
+
+_NON_LETTERS_RE = re.compile(r"[^a-z]+")
+# Bullets, list markers and sentence punctuation: such lines are body text
+_BODY_LINE_RE = re.compile(r"^\s*(?:[•●○■□▪▫–*>-]|\d+[.)])|[.,;](?!$)")
+# Words that stay lowercase in a title-cased heading
+_MINOR_WORDS = frozenset({"and", "of", "the", "in", "for", "to", "a", "an", "&"})
+
+
+class SectionSpan(NamedTuple):
+    # Key of SECTION_HEADINGS, or HEADER_SECTION
+    name: str
+    # Heading as written, without a trailing colon (empty for the header span)
+    heading: str
+    # Offsets in the document text: the span runs from the heading line to
+    # the next heading; the body starts after the heading (on the next line,
+    # or on the same line for "Skills: Python, Go")
+    start: int
+    body_start: int
+    end: int
+    # How heading-like the line is, 0-1
+    confidence: float
+
+
+def _normalize_line(line: str) -> str:
+    return _NON_LETTERS_RE.sub(" ", line.lower().replace("&", " and ")).strip()
+
+
+class SectionSegmenter:
+    """
+    Splits a resume into sections by classifying each line once.
+
+    A line is a heading if, after dropping punctuation and case, it is a
+    known heading phrase (high confidence), starts with one followed by a
+    colon ("Skills: Python, Go", the body continuing on the same line), or is
+    a short title-cased line containing one, e.g. "Relevant Work Experience &
+    Leadership" (lower confidence). Every
+    line is checked with dictionary lookups, so segmenting is linear in the
+    text size however many headings are known.
+    """
+
+    def __init__(self, headings: Optional[Dict[str, List[str]]] = None):
+        """
+        Args:
+            headings: Section name -> heading phrases; None for SECTION_HEADINGS
+        """
+        self.headings = headings or SECTION_HEADINGS
+        self._phrases: Dict[str, str] = {}
+        for name, phrases in self.headings.items():
+            for phrase in phrases:
+                self._phrases[_normalize_line(phrase)] = name
+
+    def classify_line(self, line: str) -> Optional[Tuple[str, float, int]]:
+        """
+        Decide whether a line is a section heading.
+
+        Args:
+            line: One line of text
+
+        Returns:
+            (section name, confidence, heading length in characters; shorter
+            than the line for inline headings), or None for ordinary lines
+        """
+        normalized = _normalize_line(line)
+        if not normalized:
+            return None
+        words = normalized.split()
+        stripped = line.strip()
+
+        if len(words) > MAX_HEADING_WORDS:
+            # Only an inline "Heading: body" line can be this long
+            label, colon, rest = line.partition(":")
+            name = self._phrases.get(_normalize_line(label)) if colon else None
+            if name and rest.strip():
+                return name, 0.8, len(label) + 1
+            return None
+
+        # Typographic heading cues: ALL CAPS or a trailing colon
+        styled = stripped.rstrip(":").isupper() or stripped.endswith(":")
+
+        name = self._phrases.get(normalized)
+        if name:
+            return name, 1.0 if styled else 0.9, len(line)
+
+        label, colon, rest = line.partition(":")
+        name = self._phrases.get(_normalize_line(label)) if colon else None
+        if name and rest.strip():
+            return name, 0.8, len(label) + 1
+
+        # A short, title-cased line containing a heading phrase, e.g.
+        # "Relevant Work Experience & Leadership"; the longest phrase wins
+        if _BODY_LINE_RE.search(stripped.rstrip(":")):
+            return None
+        title_case = all(
+            word[0].isupper() or not word[0].isalpha() or word.lower() in _MINOR_WORDS
+            for word in stripped.split()
+        )
+        if not (styled or title_case):
+            return None
+        for size in range(len(words) - 1, 0, -1):
+            for first in range(len(words) - size + 1):
+                name = self._phrases.get(" ".join(words[first : first + size]))
+                if name:
+                    return name, 0.7 if styled else 0.6, len(line)
+        return None
+
+    def segment(self, text: Union[str, ResumeDocument]) -> List[SectionSpan]:
+        """
+        Split a resume into section spans.
+
+        Args:
+            text: Resume text or ResumeDocument
+
+        Returns:
+            SectionSpans in document order, starting with a HEADER_SECTION
+            span if there is text before the first heading. A section that
+            appears under several headings has several spans.
+        """
+        doc = as_document(text)
+        headings = []
+        offset = 0
+        for line in doc.lines:
+            classified = self.classify_line(line)
+            if classified:
+                name, confidence, heading_length = classified
+                heading = line[:heading_length].strip().rstrip(":")
+                body_start = offset + heading_length
+                if heading_length == len(line):
+                    body_start += 1
+                headings.append((name, heading, offset, body_start, confidence))
+            offset += len(line) + 1
+
+        spans = []
+        text_length = len(doc.text)
+        first_heading = headings[0][2] if headings else text_length
+        if doc.text[:first_heading].strip():
+            spans.append(SectionSpan(HEADER_SECTION, "", 0, 0, first_heading, 1.0))
+        for index, (name, heading, start, body_start, confidence) in enumerate(
+            headings
+        ):
+            end = headings[index + 1][2] if index + 1 < len(headings) else text_length
+            spans.append(
+                SectionSpan(name, heading, start, min(body_start, end), end, confidence)
+            )
+        return spans
+
+    def scan_document(self, doc: ResumeDocument) -> Dict[str, List[SectionSpan]]:
+        """Spans per section name, for ResumeDocument.matches"""
+        results: Dict[str, List[SectionSpan]] = {}
+        for span in self.segment(doc):
+            results.setdefault(span.name, []).append(span)
+        return results
+
+
+SECTION_SEGMENTER = SectionSegmenter()
+
+
+def segment_sections(text: Union[str, ResumeDocument]) -> List[SectionSpan]:
+    """
+    Split a resume into sections with the default segmenter.
+
+    Args:
+        text: Resume text or ResumeDocument
+
+    Returns:
+        SectionSpans in document order (see SectionSegmenter.segment)
+    """
+    doc = as_document(text)
+    spans = doc.matches(SECTION_SEGMENTER)
+    return sorted(
+        (span for section in spans.values() for span in section),
+        key=lambda span: span.start,
+    )
+
+
+def section_document(text: Union[str, ResumeDocument], *names: str) -> ResumeDocument:
+    """
+    Get the body text of some sections as a document of its own.
+
+    Any analyzer can then run on just those sections, e.g.
+    check_quantification(section_document(doc, "experience")).
+
+    Args:
+        text: Resume text or ResumeDocument
+        names: Section names; bodies of every matching span are joined in
+            document order
+
+    Returns:
+        ResumeDocument of the section bodies (empty if none were found)
+    """
+    doc = as_document(text)
+    wanted = set(names)
+    bodies = [
+        doc.text[span.body_start : span.end].strip()
+        for span in segment_sections(doc)
+        if span.name in wanted
+    ]
+    return as_document("\n".join(bodies))
@@ -0,0 +1,426 @@
+"""
+Bundled skill taxonomy: alias normalization through a prebuilt hash index
+
+The taxonomy is edited as text (data/skill_taxonomy.txt) and compiled into a
+compact binary index (data/skill_taxonomy.idx) that is memory-mapped at
+startup, so nothing is parsed on import and every lookup hashes the term once
+and compares it against the stored key, O(length of term).
+
+Index layout (little-endian):
+    header   magic, version, source checksum, slot_count, skill_count,
+             slots_offset, skills_offset, strings_offset
+    slots    open-addressing table (linear probing, crc32 of the normalized
+             alias): key offset, key length, flags, skill id + 1 (0 = empty)
+    skills   name offset, name length, category index
+    strings  UTF-8 alias keys and canonical names
+
+Rebuild the index after editing the taxonomy:
+    python -m utils.skill_taxonomy
+"""
+
+import mmap
+import os
+import re
+import struct
+import threading
+import zlib
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple, Union
+
+from .lexicon import normalize_term
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+TAXONOMY_SOURCE = os.path.join(DATA_DIR, "skill_taxonomy.txt")
+TAXONOMY_INDEX = os.path.join(DATA_DIR, "skill_taxonomy.idx")
+
+CATEGORIES = ("technical", "soft", "tool", "certification")
+
+_MAGIC = b"SKIX"
+_VERSION = 1
+_HEADER = struct.Struct("<4sHxxIIIIII")
+_SLOT = struct.Struct("<IHHI")
+_SKILL = struct.Struct("<IHBx")
+
+# Slot flag: the alias may be matched in free text
+_FLAG_SCAN = 1
+
+_SEPARATOR_RE = re.compile(r"[\s_-]+")
+# Characters the text tokenizer drops
+_SYMBOL_RE = re.compile(r"[^\w\s-]")
+
+_taxonomy = None
+_taxonomy_lock = threading.Lock()
+
+
+class Skill(NamedTuple):
+    name: str
+    # One of CATEGORIES
+    category: str
+
+
+def normalize_skill(term: str) -> str:
+    """
+    Normalize a skill name or alias for lookup.
+
+    Case is ignored and runs of spaces, hyphens and underscores become one
+    space; other punctuation is kept, so "C++", "C#" and "C" stay distinct.
+    """
+    return _SEPARATOR_RE.sub(" ", term.lower()).strip(" .,;:()[]")
+
+
+def _scannable(alias: str) -> bool:
+    """Whether an alias can be matched in tokenized text without ambiguity"""
+    tokens = normalize_term(alias)
+    if not tokens:
+        return False
+    # "C++", "C#", ".NET" tokenize to a bare "c" / "net"
+    return len(tokens) > 1 or (len(tokens[0]) > 1 and not _SYMBOL_RE.search(alias))
+
+
+def parse_taxonomy(path: str = TAXONOMY_SOURCE) -> Dict[str, Tuple[Skill, bool]]:
+    """
+    Read a taxonomy source file.
+
+    Args:
+        path: Text file of "canonical | category | alias, ~alias" lines
+
+    Returns:
+        Dictionary of normalized alias -> (Skill, matchable in free text)
+
+    Raises:
+        ValueError: On a malformed line, unknown category or an alias claimed
+            by two skills
+    """
+    aliases: Dict[str, Tuple[Skill, bool]] = {}
+    with open(path, encoding="utf-8") as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            parts = [part.strip() for part in line.split("|")]
+            if len(parts) != 3 or not parts[0]:
+                raise ValueError(
+                    f"{path}:{line_number}: expected 'name | category | aliases'"
+                )
+            name, category, alias_list = parts
+            if category not in CATEGORIES:
+                raise ValueError(f"{path}:{line_number}: unknown category '{category}'")
+
+            skill = Skill(name, category)
+            surface_forms = [(name, True)] + [
+                (alias.lstrip("~").strip(), not alias.startswith("~"))
+                for alias in (a.strip() for a in alias_list.split(","))
+                if alias.lstrip("~").strip()
+            ]
+            for surface, scan in surface_forms:
+                key = normalize_skill(surface)
+                existing = aliases.get(key)
+                if existing and existing[0] != skill:
+                    raise ValueError(
+                        f"{path}:{line_number}: alias '{surface}' already belongs "
+                        f"to '{existing[0].name}'"
+                    )
+                scan = scan and _scannable(surface)
+                if existing:
+                    # A ~alias switches free-text matching off for the same form
+                    scan = scan and existing[1]
+                aliases[key] = (skill, scan)
+    return aliases
+
+
+def source_checksum(path: str = TAXONOMY_SOURCE) -> int:
+    """crc32 of a taxonomy source file, recorded in the index built from it"""
+    with open(path, "rb") as f:
+        return zlib.crc32(f.read())
+
+
+def build_index(aliases: Dict[str, Tuple[Skill, bool]], checksum: int = 0) -> bytes:
+    """
+    Compile parsed aliases into the binary index format.
+
+    Args:
+        aliases: As returned by parse_taxonomy
+        checksum: source_checksum of the file the aliases came from
+
+    Returns:
+        Index bytes, readable by SkillTaxonomy
+    """
+    skills = list(dict.fromkeys(skill for skill, _ in aliases.values()))
+    skill_ids = {skill: index for index, skill in enumerate(skills)}
+
+    strings = bytearray()
+
+    def intern(text: str) -> Tuple[int, int]:
+        encoded = text.encode("utf-8")
+        offset = len(strings)
+        strings.extend(encoded)
+        return offset, len(encoded)
+
+    skill_records = bytearray()
+    for skill in skills:
+        offset, length = intern(skill.name)
+        skill_records += _SKILL.pack(offset, length, CATEGORIES.index(skill.category))
+
+    # Power-of-two table at most half full keeps probe sequences short
+    slot_count = 1
+    while slot_count < 2 * len(aliases):
+        slot_count *= 2
+    mask = slot_count - 1
+    slots = [None] * slot_count
+    for key, (skill, scan) in aliases.items():
+        encoded = key.encode("utf-8")
+        slot = zlib.crc32(encoded) & mask
+        while slots[slot] is not None:
+            slot = (slot + 1) & mask
+        offset, length = intern(key)
+        slots[slot] = (offset, length, _FLAG_SCAN if scan else 0, skill_ids[skill] + 1)
+
+    slot_records = b"".join(
+        _SLOT.pack(*slot) if slot else _SLOT.pack(0, 0, 0, 0) for slot in slots
+    )
+    slots_offset = _HEADER.size
+    skills_offset = slots_offset + len(slot_records)
+    strings_offset = skills_offset + len(skill_records)
+    header = _HEADER.pack(
+        _MAGIC,
+        _VERSION,
+        checksum,
+        slot_count,
+        len(skills),
+        slots_offset,
+        skills_offset,
+        strings_offset,
+    )
+    return header + slot_records + bytes(skill_records) + bytes(strings)
+
+
+def compile_taxonomy(
+    source: str = TAXONOMY_SOURCE, output: str = TAXONOMY_INDEX
+) -> int:
+    """
+    Build the index file from a taxonomy source file.
+
+    Args:
+        source: Taxonomy text file
+        output: Index file to (over)write
+
+    Returns:
+        Number of aliases indexed
+    """
+    aliases = parse_taxonomy(source)
+    data = build_index(aliases, source_checksum(source))
+    temp_path = f"{output}.{os.getpid()}.tmp"
+    with open(temp_path, "wb") as f:
+        f.write(data)
+    os.replace(temp_path, output)
+    return len(aliases)
+
+
+class SkillTaxonomy:
+    """
+    Read-only view of a compiled skill index.
+
+    The index is memory-mapped, so opening it costs one header read and its
+    pages are shared by every process on the host.
+    """
+
+    def __init__(self, data: Union[bytes, mmap.mmap]):
+        """
+        Args:
+            data: Index bytes (build_index) or a memory map of an index file
+        """
+        (
+            magic,
+            version,
+            self.source_checksum,
+            slot_count,
+            skill_count,
+            slots,
+            skills,
+            strings,
+        ) = _HEADER.unpack_from(data, 0)
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError("Not a skill taxonomy index (or an outdated version)")
+        self._data = data
+        self._mask = slot_count - 1
+        self._slot_count = slot_count
+        self._skill_count = skill_count
+        self._slots = slots
+        self._skills = skills
+        self._strings = strings
+
+    @classmethod
+    def open(cls, path: str = TAXONOMY_INDEX) -> "SkillTaxonomy":
+        """Memory-map an index file"""
+        with open(path, "rb") as f:
+            return cls(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+    def __len__(self) -> int:
+        return self._skill_count
+
+    def _string(self, offset: int, length: int) -> bytes:
+        start = self._strings + offset
+        return self._data[start : start + length]
+
+    def _skill(self, skill_id: int) -> Skill:
+        offset, length, category = _SKILL.unpack_from(
+            self._data, self._skills + skill_id * _SKILL.size
+        )
+        return Skill(self._string(offset, length).decode("utf-8"), CATEGORIES[category])
+
+    def lookup(self, term: str) -> Optional[Skill]:
+        """
+        Find the canonical skill for a name or alias.
+
+        Args:
+            term: Any surface form, e.g. "JS", "k8s", "Machine-Learning"
+
+        Returns:
+            Skill, or None if the term is not in the taxonomy
+        """
+        key = normalize_skill(term).encode("utf-8")
+        if not key:
+            return None
+        slot = zlib.crc32(key) & self._mask
+        while True:
+            offset, length, _, skill_ref = _SLOT.unpack_from(
+                self._data, self._slots + slot * _SLOT.size
+            )
+            if not skill_ref:
+                return None
+            if length == len(key) and self._string(offset, length) == key:
+                return self._skill(skill_ref - 1)
+            slot = (slot + 1) & self._mask
+
+    def canonicalize(self, term: str) -> str:
+        """Canonical name for a term, or the term itself if unknown"""
+        skill = self.lookup(term)
+        return skill.name if skill else term.strip()
+
+    def aliases(self, scannable_only: bool = False) -> Iterator[Tuple[str, Skill]]:
+        """
+        Iterate over every (normalized alias, Skill) pair.
+
+        Args:
+            scannable_only: Skip aliases too ambiguous to match in free text
+        """
+        for slot in range(self._slot_count):
+            offset, length, flags, skill_ref = _SLOT.unpack_from(
+                self._data, self._slots + slot * _SLOT.size
+            )
+            if skill_ref and (flags & _FLAG_SCAN or not scannable_only):
+                yield (
+                    self._string(offset, length).decode("utf-8"),
+                    self._skill(skill_ref - 1),
+                )
+
+
+def load_taxonomy(
+    source: str = TAXONOMY_SOURCE, index: str = TAXONOMY_INDEX
+) -> SkillTaxonomy:
+    """
+    Open a compiled taxonomy, rebuilding it first if it is stale.
+
+    The index is rebuilt when it is missing, unreadable or was built from a
+    different version of the source file; if it can't be written (e.g. a
+    read-only data directory), it is built in memory instead.
+
+    Args:
+        source: Taxonomy text file
+        index: Index file built from it
+
+    Returns:
+        SkillTaxonomy matching the source file
+    """
+    checksum = source_checksum(source)
+    try:
+        taxonomy = SkillTaxonomy.open(index)
+        if taxonomy.source_checksum == checksum:
+            return taxonomy
+    except (OSError, ValueError, struct.error):
+        pass
+
+    try:
+        compile_taxonomy(source, index)
+        return SkillTaxonomy.open(index)
+    except OSError:
+        return SkillTaxonomy(build_index(parse_taxonomy(source), checksum))
+
+
+def get_skill_taxonomy() -> SkillTaxonomy:
+    """Get the bundled taxonomy, loading it (see load_taxonomy) on first use"""
+    global _taxonomy
+    with _taxonomy_lock:
+        if _taxonomy is None:
+            _taxonomy = load_taxonomy()
+    return _taxonomy
+
+
+def dedupe_keywords(
+    keywords: List[str], taxonomy: Optional[SkillTaxonomy] = None
+) -> List[str]:
+    """
+    Canonicalize keywords and drop duplicates, keeping first-seen order.
+
+    Args:
+        keywords: Keyword strings, e.g. an AI analysis's found_keywords list
+        taxonomy: SkillTaxonomy; None for the bundled one
+
+    Returns:
+        Canonical names for known skills and the original (stripped) text for
+        unknown keywords, each once; unknown keywords are compared ignoring case
+    """
+    taxonomy = taxonomy or get_skill_taxonomy()
+    seen = set()
+    result = []
+    for keyword in keywords:
+        if not isinstance(keyword, str) or not keyword.strip():
+            continue
+        name = taxonomy.canonicalize(keyword)
+        key = normalize_skill(name)
+        if key not in seen:
+            seen.add(key)
+            result.append(name)
+    return result
+
+
+def normalize_analysis_keywords(
+    analysis: dict, taxonomy: Optional[SkillTaxonomy] = None
+) -> dict:
+    """
+    Canonicalize and deduplicate the keyword lists of an analysis result.
+
+    Every found_keywords and missing_keywords list is deduplicated, and a
+    keyword reported as both found and missing is kept as found only.
+
+    Args:
+        analysis: Analysis result (AI or local); modified in place
+        taxonomy: SkillTaxonomy; None for the bundled one
+
+    Returns:
+        The same analysis dictionary
+    """
+    taxonomy = taxonomy or get_skill_taxonomy()
+    found_keys = set()
+    for section in ("found_keywords", "missing_keywords"):
+        lists = analysis.get(section)
+        if not isinstance(lists, dict):
+            continue
+        for category, keywords in lists.items():
+            if not isinstance(keywords, list):
+                continue
+            keywords = dedupe_keywords(keywords, taxonomy)
+            if section == "found_keywords":
+                found_keys.update(normalize_skill(keyword) for keyword in keywords)
+            else:
+                keywords = [
+                    keyword
+                    for keyword in keywords
+                    if normalize_skill(keyword) not in found_keys
+                ]
+            lists[category] = keywords
+    return analysis
+
+
+if __name__ == "__main__":
+    count = compile_taxonomy()
+    print(f"Wrote {TAXONOMY_INDEX} ({count} aliases)")
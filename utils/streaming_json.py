@@ -0,0 +1,121 @@
+"""Incremental parsing of a JSON object that arrives in chunks"""
+
+import json
+from typing import Any, List, Optional, Tuple
+
+
+class StreamingJSONParser:
+    """
+    Emits the top-level fields of a streamed JSON object as they complete.
+
+    feed() takes each chunk of the response as it arrives and returns the
+    (key, value) pairs whose values were completed by that chunk, so a
+    caller can show "match_score" long before "suggestions" has arrived.
+    Text before the opening brace (such as a ```json fence) and after the
+    closing brace is ignored. Each character is scanned once, however the
+    response is split into chunks.
+    """
+
+    def __init__(self):
+        self._text = ""
+        self._position = 0
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._done = False
+        # Offsets of the current key string, and of the value after ":"
+        self._key_start: Optional[int] = None
+        self._key: Optional[str] = None
+        self._value_start: Optional[int] = None
+
+    @property
+    def done(self) -> bool:
+        """Whether the object's closing brace has been seen"""
+        return self._done
+
+    def feed(self, chunk: str) -> List[Tuple[str, Any]]:
+        """
+        Add the next chunk of the response.
+
+        Args:
+            chunk: Response text
+
+        Returns:
+            (key, value) for each top-level field completed by this chunk, in
+            order. Fields whose value is null or not valid JSON are skipped.
+        """
+        fields: List[Tuple[str, Any]] = []
+        if self._done:
+            return fields
+        self._text += chunk
+        text = self._text
+
+        for position in range(self._position, len(text)):
+            char = text[position]
+
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+                    if self._depth == 1 and self._value_start is None:
+                        self._key = self._decode(text[self._key_start : position + 1])
+                continue
+
+            if self._depth == 0:
+                if char == "{":
+                    self._depth = 1
+                continue
+
+            if char == '"':
+                self._in_string = True
+                if self._depth == 1 and self._value_start is None:
+                    self._key_start = position
+            elif char in "{[":
+                self._depth += 1
+            elif char in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    self._emit(fields, position)
+                    self._done = True
+                    break
+            elif self._depth == 1:
+                if char == ":" and self._value_start is None:
+                    self._value_start = position + 1
+                elif char == ",":
+                    self._emit(fields, position)
+
+        self._position = len(text)
+        self._discard_parsed_text()
+        return fields
+
+    def _discard_parsed_text(self) -> None:
+        """Keep only the text of the field in progress, so buffering stays cheap"""
+        keep_from = self._position
+        if self._value_start is not None:
+            keep_from = self._value_start
+        elif self._key is None and self._key_start is not None:
+            keep_from = self._key_start
+        self._text = self._text[keep_from:]
+        self._position -= keep_from
+        if self._value_start is not None:
+            self._value_start -= keep_from
+        if self._key_start is not None:
+            self._key_start -= keep_from
+
+    def _emit(self, fields: List[Tuple[str, Any]], end: int) -> None:
+        """Parse the value that ends at end and reset for the next field"""
+        if self._key is not None and self._value_start is not None:
+            value = self._decode(self._text[self._value_start : end])
+            if value is not None:
+                fields.append((self._key, value))
+        self._key_start = self._key = self._value_start = None
+
+    @staticmethod
+    def _decode(fragment: str) -> Any:
+        try:
+            return json.loads(fragment)
+        except ValueError:
+            return None